@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+
+class TTLCache:
+    """Cache em memória com validade por entrada e agrupamento de requisições.
+
+    Quando duas threads pedem a mesma chave ao mesmo tempo, apenas a primeira
+    executa a busca; as demais aguardam o mesmo resultado. Opcionalmente as
+    entradas são persistidas em um arquivo JSON para que uma nova execução já
+    comece com o cache preenchido.
+    """
+
+    def __init__(self, ttl=None, path=None):
+        """
+        Args:
+            ttl (int, optional): Validade das entradas em segundos. None para não expirar.
+            path (str, optional): Arquivo JSON usado para persistir o cache.
+        """
+        self.ttl = ttl
+        self.path = path
+        self._data = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        if self.path:
+            self.load()
+
+    def _is_fresh(self, stored_at, now):
+        return self.ttl is None or now - stored_at < self.ttl
+
+    def get(self, key, default=None):
+        """Retorna o valor armazenado se ainda for válido."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._is_fresh(entry[0], time.time()):
+                return entry[1]
+        return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.time(), value)
+
+    def get_or_fetch(self, key, fetch):
+        """Retorna o valor da chave, executando ``fetch(key)`` apenas se necessário.
+
+        Args:
+            key (str): Chave da entrada.
+            fetch (callable): Função que obtém o valor quando ele não está no cache.
+
+        Returns:
+            Valor armazenado ou obtido. Erros de ``fetch`` não são armazenados.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._is_fresh(entry[0], time.time()):
+                self.hits += 1
+                return entry[1]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch(key)
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def load(self):
+        """Carrega as entradas válidas do arquivo de persistência."""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            stored = json.load(file)
+
+        now = time.time()
+        with self._lock:
+            for key, (stored_at, value) in stored.items():
+                if self._is_fresh(stored_at, now):
+                    self._data[key] = (stored_at, value)
+
+    def save(self):
+        """Grava o cache no arquivo de persistência de forma atômica."""
+        if not self.path:
+            return
+
+        with self._lock:
+            stored = {key: list(entry) for key, entry in self._data.items()}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(stored, file, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def stats(self):
+        """Retorna os contadores de uso do cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "saved_calls": self.hits + self.coalesced,
+            "size": len(self._data),
+        }
@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from settings import DRAFT_CACHE_FILE, DRAFT_CACHE_SIZE, DRAFT_CACHE_SYMMETRIC
+
+ROLE_ORDER = ("TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY")
+MISSING_VALUE = "-1.0"
+
+
+def side_signature(champions, roles=None):
+    """Ids de um time na ordem das roles (TOP, JUNGLE, MIDDLE, BOTTOM, UTILITY).
+
+    Sem roles, a ordem recebida é considerada a ordem das roles.
+    """
+    champions = [str(champion) for champion in champions]
+    if roles:
+        position = {role: i for i, role in enumerate(ROLE_ORDER)}
+        champions = [
+            champion
+            for _, champion in sorted(
+                zip(roles, champions), key=lambda item: position.get(item[0], 99)
+            )
+        ]
+    return tuple(champions)
+
+
+def draft_signature(champions, roles=None, symmetric=False):
+    """Assinatura canônica de uma composição com 10 campeões (5 por time).
+
+    Args:
+        champions (list): Ids (ou nomes) dos campeões; os 5 primeiros formam o time
+            avaliado e os 5 últimos o adversário.
+        roles (list, optional): Role de cada campeão, na mesma ordem.
+        symmetric (bool, optional): Trata a troca de lados como a mesma composição.
+
+    Returns:
+        tuple: (sides, swapped), com ``sides`` = (time, adversário) canônicos e
+        ``swapped`` indicando se os lados foram invertidos.
+    """
+    roles = roles or [None] * len(champions)
+    ally = side_signature(champions[:5], roles[:5] if all(roles[:5]) else None)
+    enemy = side_signature(champions[5:], roles[5:] if all(roles[5:]) else None)
+    if symmetric and enemy < ally:
+        return (enemy, ally), True
+    return (ally, enemy), False
+
+
+def flip_win_rate(value):
+    """Converte o win rate de um time no do adversário (ex.: "52.5%" -> "47.5%")."""
+    text = str(value).strip()
+    if text == MISSING_VALUE:
+        return text
+
+    percent = text.endswith("%")
+    number = float(text.rstrip("%"))
+    flipped = (100 if percent or number > 1 else 1) - number
+    return f"{round(flipped, 2)}{'%' if percent else ''}"
+
+
+class DraftCache:
+    """Cache dos resultados do analisador de composições por assinatura canônica.
+
+    A memória guarda as composições mais recentes (LRU com ``max_size`` entradas)
+    na frente de um banco SQLite persistente. Com ``symmetric``, a composição com
+    os lados trocados reaproveita o resultado, invertendo o win rate; o Risk Value
+    é considerado igual para os dois lados. Resultados com erro ("-1.0") não são
+    guardados.
+    """
+
+    def __init__(
+        self,
+        path=DRAFT_CACHE_FILE,
+        max_size=DRAFT_CACHE_SIZE,
+        symmetric=DRAFT_CACHE_SYMMETRIC,
+    ):
+        """
+        Args:
+            path (str, optional): Arquivo SQLite. Sem arquivo o cache fica só em memória.
+            max_size (int, optional): Composições mantidas em memória.
+            symmetric (bool, optional): Trata a troca de lados como a mesma composição.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.symmetric = symmetric
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS drafts ("
+                "signature TEXT PRIMARY KEY, risk TEXT, win_rate TEXT, stored_at REAL)"
+            )
+            self._connection.commit()
+
+    @staticmethod
+    def _key(sides):
+        return "|".join(",".join(side) for side in sides)
+
+    def _remember(self, key, value):
+        # Chamado com o lock adquirido
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+
+            if self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT risk, win_rate FROM drafts WHERE signature = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value = {"Risk Value:": row[0], "Win Rate:": row[1]}
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    @staticmethod
+    def _orient(value, swapped):
+        if not swapped:
+            return dict(value)
+        return {
+            "Risk Value:": value["Risk Value:"],
+            "Win Rate:": flip_win_rate(value["Win Rate:"]),
+        }
+
+    def get(self, champions, roles=None):
+        """Retorna o resultado guardado da composição, do ponto de vista recebido, ou None."""
+        sides, swapped = draft_signature(champions, roles, self.symmetric)
+        value = self._lookup(self._key(sides))
+        return self._orient(value, swapped) if value is not None else None
+
+    def put(self, champions, stats, roles=None):
+        """Guarda o resultado da composição, informado do ponto de vista recebido."""
+        if MISSING_VALUE in (stats["Risk Value:"], stats["Win Rate:"]):
+            return
+
+        sides, swapped = draft_signature(champions, roles, self.symmetric)
+        self._store({self._key(sides): self._orient(stats, swapped)})
+
+    def _store(self, values):
+        with self._lock:
+            for key, value in values.items():
+                self._remember(key, value)
+            if self._connection is not None:
+                now = time.time()
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO drafts VALUES (?, ?, ?, ?)",
+                    [
+                        (key, value["Risk Value:"], value["Win Rate:"], now)
+                        for key, value in values.items()
+                    ],
+                )
+                self._connection.commit()
+
+    def get_or_evaluate(self, comps, evaluate, roles=None):
+        """Retorna os resultados das composições, avaliando apenas as desconhecidas.
+
+        Composições repetidas (ou espelhadas, com ``symmetric``) são avaliadas uma
+        única vez, já na ordem canônica das roles.
+
+        Args:
+            comps (list): Composições com 10 campeões cada.
+            evaluate (callable): Recebe uma lista de composições e retorna a lista de
+                resultados {"Risk Value:": ..., "Win Rate:": ...} na mesma ordem.
+            roles (list, optional): Roles de cada composição, na mesma ordem.
+
+        Returns:
+            list: Um resultado por composição, do ponto de vista recebido.
+        """
+        roles = roles or [None] * len(comps)
+        signatures = [
+            draft_signature(champions, comp_roles, self.symmetric)
+            for champions, comp_roles in zip(comps, roles)
+        ]
+
+        known = {}
+        pending = {}
+        for sides, _ in signatures:
+            key = self._key(sides)
+            if key in known or key in pending:
+                continue
+            value = self._lookup(key)
+            if value is not None:
+                known[key] = value
+            else:
+                pending[key] = list(sides[0]) + list(sides[1])
+
+        if pending:
+            evaluated = dict(zip(pending, evaluate(list(pending.values()))))
+            self._store(
+                {
+                    key: value
+                    for key, value in evaluated.items()
+                    if MISSING_VALUE not in (value["Risk Value:"], value["Win Rate:"])
+                }
+            )
+            known.update(evaluated)
+
+        return [
+            self._orient(known[self._key(sides)], swapped)
+            for sides, swapped in signatures
+        ]
+
+    def close(self):
+        """Fecha o banco SQLite."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self):
+        """Retorna os contadores de uso do cache."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "size": len(self._memory),
+        }
@@ -0,0 +1,95 @@
+import heapq
+import itertools
+import threading
+
+TIERS = [
+    "IRON",
+    "BRONZE",
+    "SILVER",
+    "GOLD",
+    "PLATINUM",
+    "EMERALD",
+    "DIAMOND",
+    "MASTER",
+    "GRANDMASTER",
+    "CHALLENGER",
+]
+DIVISIONS = {"IV": 0, "III": 1, "II": 2, "I": 3}
+
+
+def tier_score(tier_rank):
+    """Converte um tierRank (ex.: "DIAMOND II") num número crescente com o elo.
+
+    Jogadores sem rank ("Missing") recebem -1 e ficam no fim da fila.
+    """
+    if not isinstance(tier_rank, str) or not tier_rank:
+        return -1
+
+    tier, _, division = tier_rank.partition(" ")
+    if tier not in TIERS:
+        return -1
+    return TIERS.index(tier) * len(DIVISIONS) + DIVISIONS.get(division, 0)
+
+
+class Frontier:
+    """Fila de prioridade dos jogadores a visitar na coleta por descoberta.
+
+    Os participantes de cada partida coletada entram na fila; os de maior elo
+    e com partidas mais recentes saem primeiro. Cada jogador é visitado uma
+    única vez; se ele reaparecer com prioridade melhor antes da visita, a
+    entrada antiga é ignorada ao sair da fila.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._best = {}
+        self._visited = set()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.pushed = 0
+
+    def push(self, puuid, tier_rank=None, last_played=0):
+        """Adiciona um jogador à fila.
+
+        Args:
+            puuid (str): Id do jogador.
+            tier_rank (str, optional): Elo do jogador (ex.: "DIAMOND II").
+            last_played (float, optional): Início da partida mais recente em que
+                ele foi visto, em segundos desde a época.
+        """
+        priority = (-tier_score(tier_rank), -(last_played or 0))
+        with self._lock:
+            if puuid in self._visited:
+                return
+            best = self._best.get(puuid)
+            if best is not None and best <= priority:
+                return
+
+            self._best[puuid] = priority
+            heapq.heappush(self._heap, (priority, next(self._counter), puuid))
+            self.pushed += 1
+
+    def pop(self, amount=1):
+        """Retira até ``amount`` jogadores ainda não visitados, por prioridade."""
+        puuids = []
+        with self._lock:
+            while self._heap and len(puuids) < amount:
+                priority, _, puuid = heapq.heappop(self._heap)
+                if puuid in self._visited or self._best.get(puuid) != priority:
+                    continue
+
+                del self._best[puuid]
+                self._visited.add(puuid)
+                puuids.append(puuid)
+        return puuids
+
+    def __len__(self):
+        return len(self._best)
+
+    def stats(self):
+        """Retorna os contadores da fila."""
+        return {
+            "queued": len(self._best),
+            "visited": len(self._visited),
+            "pushed": self.pushed,
+        }
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import threading
+
+from settings import CRAWL_JOURNAL_FILE
+
+
+def fingerprint(*parts):
+    """Resume as entradas de uma etapa (ex.: versão e lista de jogadores) num hash."""
+    content = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class CrawlJournal:
+    """Diário da coleta, gravado em JSON para retomar execuções interrompidas.
+
+    Cada etapa (ex.: "matches") guarda a posição na lista de jogadores
+    e as partidas listadas ainda não gravadas. O diário é regravado de forma atômica
+    a cada avanço e logo após cada lote gravado no banco, de modo que uma nova
+    execução recomeça do último bloco em vez de percorrer todos os jogadores.
+    As partidas concluídas ficam no índice de partidas (``SeenMatchIndex``).
+
+    Quando as entradas de uma etapa mudam (outra versão do jogo ou outra lista de
+    jogadores), o ``fingerprint`` não confere e a etapa recomeça do zero.
+    """
+
+    def __init__(self, path=CRAWL_JOURNAL_FILE):
+        """
+        Args:
+            path (str, optional): Arquivo do diário. Sem arquivo nada é persistido.
+        """
+        self.path = path
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Carrega o diário do arquivo, se existir."""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            stored = json.load(file)
+
+        with self._lock:
+            self._tasks = stored
+
+    def save(self):
+        """Grava o diário no arquivo de forma atômica."""
+        if not self.path:
+            return
+
+        with self._lock:
+            content = json.dumps(self._tasks, ensure_ascii=False)
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                file.write(content)
+            os.replace(tmp_path, self.path)
+
+    def task(self, name, task_fingerprint):
+        """Retorna o estado salvo da etapa ou um estado novo.
+
+        Args:
+            name (str): Nome da etapa.
+            task_fingerprint (str): Hash das entradas da etapa (ver ``fingerprint``).
+
+        Returns:
+            dict: Estado com "cursor" (jogadores concluídos) e "pending" (partidas
+            do bloco em andamento).
+        """
+        with self._lock:
+            state = self._tasks.get(name)
+            if state is None or state["fingerprint"] != task_fingerprint:
+                state = {"fingerprint": task_fingerprint, "cursor": 0, "pending": []}
+                self._tasks[name] = state
+            return {"cursor": state["cursor"], "pending": list(state["pending"])}
+
+    def advance(self, name, cursor, pending=None):
+        """Registra o início de um novo bloco da etapa e grava o diário.
+
+        As partidas do bloco são somadas às pendências anteriores, pois as de
+        blocos passados podem ainda estar na fila de gravação.
+
+        Args:
+            name (str): Nome da etapa.
+            cursor (int): Quantidade de jogadores da lista já percorridos.
+            pending (list, optional): Partidas do bloco ainda não gravadas.
+        """
+        with self._lock:
+            state = self._tasks[name]
+            state["cursor"] = cursor
+            known = set(state["pending"])
+            state["pending"] = state["pending"] + [
+                match_id
+                for match_id in dict.fromkeys(pending or [])
+                if match_id not in known
+            ]
+        self.save()
+
+    def complete(self, name, match_ids):
+        """Remove as partidas gravadas das pendências da etapa e grava o diário."""
+        with self._lock:
+            state = self._tasks.get(name)
+            if state is None:
+                return
+            done = set(match_ids)
+            state["pending"] = [
+                match_id for match_id in state["pending"] if match_id not in done
+            ]
+        self.save()
+
+    def discard(self, name, match_ids):
+        """Remove das pendências partidas que não serão gravadas (fora do patch ou com erro)."""
+        self.complete(name, match_ids)
+
+    def finish(self, name):
+        """Encerra a etapa; a próxima execução começa do zero."""
+        with self._lock:
+            self._tasks.pop(name, None)
+        self.save()
@@ -0,0 +1,101 @@
+import os
+import threading
+
+from settings import SEEN_INDEX_FILE
+
+
+class SeenMatchIndex:
+    """Índice dos Ids de partidas já gravadas, compartilhado entre threads.
+
+    Os Ids ficam num conjunto em memória (consulta O(1)) e num arquivo texto com
+    um Id por linha, ao qual só são acrescentadas as partidas novas. Assim uma
+    nova execução carrega o índice do arquivo sem consultar a tabela inteira.
+
+    Cada partida passa por três estados: ``claim`` a reserva para uma thread
+    (outras threads e jogadores passam a ignorá-la), ``commit`` a marca como
+    gravada e ``release`` desfaz a reserva quando a busca falha.
+    """
+
+    def __init__(self, path=SEEN_INDEX_FILE):
+        """
+        Args:
+            path (str, optional): Arquivo do índice. Sem arquivo o índice fica só em memória.
+        """
+        self.path = path
+        self._seen = set()
+        self._claimed = set()
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.skipped = 0
+
+    def load(self, fetch_chunks=None):
+        """Carrega o índice do arquivo ou, na falta dele, da fonte informada.
+
+        Args:
+            fetch_chunks (callable, optional): Função sem argumentos que retorna um
+                iterador de listas de Ids (ex.: leitura em blocos da tabela de
+                partidas). Só é chamada quando o arquivo ainda não existe.
+        """
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as file:
+                ids = {line.strip() for line in file if line.strip()}
+            with self._lock:
+                self._seen |= ids
+        elif fetch_chunks is not None:
+            for match_ids in fetch_chunks():
+                self.commit(match_ids)
+
+        self.loaded = True
+        return self
+
+    def __contains__(self, match_id):
+        with self._lock:
+            return match_id in self._seen or match_id in self._claimed
+
+    def __len__(self):
+        return len(self._seen)
+
+    def claim(self, match_id) -> bool:
+        """Reserva a partida se ela ainda não foi gravada nem reservada.
+
+        Returns:
+            bool: True se a partida foi reservada por esta chamada.
+        """
+        with self._lock:
+            if match_id in self._seen or match_id in self._claimed:
+                self.skipped += 1
+                return False
+            self._claimed.add(match_id)
+            return True
+
+    def release(self, match_id):
+        """Desfaz a reserva de uma partida que não foi gravada."""
+        with self._lock:
+            self._claimed.discard(match_id)
+
+    def commit(self, match_ids):
+        """Marca as partidas como gravadas e acrescenta as novas ao arquivo."""
+        match_ids = list(match_ids)
+        with self._lock:
+            new_ids = [
+                match_id
+                for match_id in dict.fromkeys(match_ids)
+                if match_id not in self._seen
+            ]
+            self._seen.update(new_ids)
+            self._claimed.difference_update(match_ids)
+
+            if self.path and new_ids:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.write("".join(f"{match_id}\n" for match_id in new_ids))
+
+    def stats(self):
+        """Retorna os contadores do índice."""
+        return {
+            "seen": len(self._seen),
+            "claimed": len(self._claimed),
+            "skipped": self.skipped,
+        }
@@ -1,50 +1,199 @@
+import asyncio
+import atexit
 import json
 import os
-import sys
+import threading
 
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+from tqdm import tqdm
 
-from settings import docs_path
+from libs.cache_lib.draft import DraftCache
+from settings import COMP_ANALYZER_PAGES, COMP_ANALYZER_TIMEOUT, docs_path
+
+MISSING_STATS = {"Risk Value:": "-1.0", "Win Rate:": "-1.0"}
+
+# Recursos que a análise não usa e só atrasam o carregamento da página
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+)
+
+
+# Slots vazios (para adicionar um campeão) e botões de remover dos slots preenchidos
+SLOT_COUNT = 10
+EMPTY_SLOT_SELECTOR = "svg.add-champ.add-fav-icon"
+REMOVE_CHAMP_SELECTOR = "svg.remove-champ"
 
 
 class LolTheoryScraper:
-    def __init__(self):
+    """Avalia composições no analisador do LoL Theory com um navegador persistente.
+
+    O Chromium é aberto uma única vez, com um conjunto de páginas reaproveitadas
+    entre as avaliações. Tudo roda num loop asyncio próprio, numa thread separada,
+    de modo que a interface continua síncrona. Imagens, fontes, mídia e scripts de
+    análise são bloqueados.
+
+    Uso:
+        with LolTheoryScraper() as scraper:
+            resultados = scraper.get_stats_batch(composicoes)
+    """
+
+    def __init__(
+        self, pages=COMP_ANALYZER_PAGES, timeout=COMP_ANALYZER_TIMEOUT, cache=None
+    ):
+        """
+        Args:
+            pages (int, optional): Páginas abertas ao mesmo tempo (avaliações simultâneas).
+            timeout (float, optional): Tempo máximo em segundos de cada espera na página.
+            cache (DraftCache, optional): Cache dos resultados por composição. Por
+                padrão, um ``DraftCache`` com as configurações do settings.
+        """
         self.url = "https://loltheory.gg/lol/team-comp-analyzer/solo-queue?user-role=middle&rank-range=diamond_plus&recommendation-method=classic"
+        self.pages = pages
+        self.timeout = timeout
+        self.cache = cache if cache is not None else DraftCache()
+        self._champion_names = self.__load_champion_names()
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.cleared_pages = 0
+        self.reloaded_pages = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def __start_browser(self):
-        self.playwright = sync_playwright().start()
-        # Alterar para headless=False para exibir o navegador
-        self.browser = self.playwright.chromium.launch(headless=True)
-        self.page = self.browser.new_page()
+        with self._lock:
+            if self._loop is not None:
+                return
 
-    def __close_browser(self):
-        self.browser.close()
-        self.playwright.stop()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._thread.start()
+            try:
+                self._run(self._open())
+            except Exception:
+                self._stop_loop()
+                raise
+            # Garante o encerramento do navegador mesmo sem chamar close()
+            atexit.register(self.close)
 
-    def get_stats(self, champions, Id=True):
-        self.__start_browser()
-        self.page.goto(self.url)
+    def close(self):
+        """Fecha as páginas, o navegador e o loop. Pode ser chamado mais de uma vez."""
+        with self._lock:
+            if self._loop is None:
+                return
+            try:
+                self._run(self._close())
+            except Exception as e:
+                print(f"Erro ao fechar o navegador: {e}")
+            finally:
+                self._stop_loop()
+                atexit.unregister(self.close)
 
-        # Obter os nomes dos campeões
-        if Id:
-            with open(
-                os.path.join(docs_path, "champion.json"), "r", encoding="utf-8"
-            ) as file:
-                champions_json = json.load(file)
-            champion_names = []
-            for champion_id in champions:
-                for champion in champions_json["data"].values():
-                    if int(champion["key"]) == champion_id:
-                        champion_names.append(champion["name"])
+    def _stop_loop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _open(self):
+        self._playwright = await async_playwright().start()
+        try:
+            # Alterar para headless=False para exibir o navegador
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._context = await self._browser.new_context()
+            self._context.set_default_timeout(self.timeout * 1000)
+            await self._context.route("**/*", self._block_resources)
+
+            self._free_pages = asyncio.Queue()
+            for page in await asyncio.gather(
+                *(self._new_page() for _ in range(self.pages))
+            ):
+                self._free_pages.put_nowait(page)
+        except Exception:
+            # Encerrar o Playwright também encerra o navegador já aberto
+            await self._playwright.stop()
+            raise
+
+    async def _close(self):
+        # O contexto fecha todas as suas páginas
+        try:
+            await self._context.close()
+            await self._browser.close()
+        finally:
+            await self._playwright.stop()
+
+    async def _block_resources(self, route):
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+            host in request.url for host in BLOCKED_HOSTS
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _new_page(self):
+        page = await self._context.new_page()
+        await page.goto(self.url)
+        return page
+
+    async def _clear_slots(self, page):
+        """Remove os campeões escolhidos sem recarregar a página.
+
+        Returns:
+            bool: True se os 10 slots voltaram a ficar vazios.
+        """
+        for _ in range(SLOT_COUNT):
+            buttons = await page.query_selector_all(REMOVE_CHAMP_SELECTOR)
+            if not buttons:
+                break
+            await buttons[0].click()
+        return len(await page.query_selector_all(EMPTY_SLOT_SELECTOR)) >= SLOT_COUNT
+
+    async def _reset_page(self, page):
+        """Deixa a página pronta para a próxima composição.
 
-            champions = champion_names
+        Os slots são limpos na própria página. Se a limpeza falhar (algum slot
+        continua preenchido), a página é recarregada na mesma aba; se a aba tiver
+        travado, ela é substituída.
+        """
+        try:
+            if await self._clear_slots(page):
+                self.cleared_pages += 1
+                return page
+        except Exception:
+            pass
 
-        if len(champions) < 10:
-            return {"Risk Value:": "-1.0", "Win Rate:": "-1.0"}
+        try:
+            await page.goto(self.url)
+            self.reloaded_pages += 1
+            return page
+        except Exception:
+            try:
+                await page.close()
+            except Exception:
+                pass
+            return await self._new_page()
 
+    async def _evaluate(self, champions, progress=None):
+        page = await self._free_pages.get()
         try:
             # Encontra todos os SVGs que representam os slots de campeões
-            svg_elements = self.page.query_selector_all("svg.add-champ.add-fav-icon")
+            svg_elements = await page.query_selector_all(EMPTY_SLOT_SELECTOR)
 
             # Itera sobre cada SVG e seleciona um campeão da lista
             for i, svg_element in enumerate(svg_elements):
@@ -52,30 +201,111 @@ class LolTheoryScraper:
                     break
 
                 # Clica no SVG atual
-                svg_element.click()
+                await svg_element.click()
 
                 # Aguarda a lista de campeões aparecer e clica no campeão especificado
-                self.page.wait_for_selector(f'span.name:text("{champions[i]}")')
-                self.page.click(f'span.name:text("{champions[i]}")')
+                await page.wait_for_selector(f'span.name:text("{champions[i]}")')
+                await page.click(f'span.name:text("{champions[i]}")')
 
             # Obtém as informações desejadas
-            risk_value = self.page.text_content("span.risk.font-weight-600.font-number")
-            win_rate_value = self.page.text_content(
+            risk_value = await page.text_content(
+                "span.risk.font-weight-600.font-number"
+            )
+            win_rate_value = await page.text_content(
                 "span.champion-column.win-rate.font-number"
             )
 
-            self.__close_browser()
-
             return {
                 "Risk Value:": risk_value.strip(),
                 "Win Rate:": win_rate_value.strip(),
             }
-        except:
-            return {"Risk Value:": "-1.0", "Win Rate:": "-1.0"}
+        except Exception:
+            return dict(MISSING_STATS)
+        finally:
+            try:
+                page = await self._reset_page(page)
+            except Exception as e:
+                # A página volta ao conjunto e é recarregada após a próxima avaliação
+                print(f"Erro ao recarregar a página do analisador: {e}")
+            self._free_pages.put_nowait(page)
+            if progress is not None:
+                progress.update(1)
+
+    async def _evaluate_batch(self, comps, progress):
+        return await asyncio.gather(
+            *(self._evaluate(champions, progress) for champions in comps)
+        )
+
+    @staticmethod
+    def __load_champion_names():
+        # Índice id -> nome montado uma única vez por instância
+        with open(
+            os.path.join(docs_path, "champion.json"), "r", encoding="utf-8"
+        ) as file:
+            champions_json = json.load(file)
+        return {
+            int(champion["key"]): champion["name"]
+            for champion in champions_json["data"].values()
+        }
 
+    def _get_champion_names(self, champion_ids):
+        return [
+            self._champion_names[int(champion_id)]
+            for champion_id in champion_ids
+            if int(champion_id) in self._champion_names
+        ]
 
-# Uso da classe:
+    def get_stats_batch(self, comps, Id=True, roles=None):
+        """Avalia várias composições, consultando o cache antes do navegador.
+
+        Composições já avaliadas (inclusive em execuções anteriores) saem do
+        ``DraftCache``; as demais são avaliadas em paralelo nas páginas do navegador.
+
+        Args:
+            comps (list): Composições com 10 campeões cada (ids ou nomes).
+            Id (bool, optional): Se as composições usam os ids dos campeões.
+            roles (list, optional): Roles dos campeões de cada composição, usadas
+                para ordenar cada time na assinatura do cache.
+
+        Returns:
+            list: Um dict {"Risk Value:": ..., "Win Rate:": ...} por composição, na
+            mesma ordem. Composições incompletas ou com erro recebem "-1.0".
+        """
+        return self.cache.get_or_evaluate(
+            comps, lambda pending: self._evaluate_comps(pending, Id), roles
+        )
+
+    def _evaluate_comps(self, comps, Id=True):
+        # Obter os nomes dos campeões
+        if Id:
+            comps = [self._get_champion_names(champions) for champions in comps]
+
+        valid = [i for i, champions in enumerate(comps) if len(champions) >= 10]
+        results = [dict(MISSING_STATS) for _ in comps]
+        if not valid:
+            return results
+
+        self.__start_browser()
+        with tqdm(total=len(valid), desc="Avaliando composições") as progress:
+            stats = self._run(self._evaluate_batch([comps[i] for i in valid], progress))
+
+        for i, comp_stats in zip(valid, stats):
+            results[i] = comp_stats
+        return results
+
+    def get_stats(self, champions, Id=True, roles=None):
+        return self.get_stats_batch(
+            [champions], Id=Id, roles=[roles] if roles else None
+        )[0]
+
+
+# Uso da classe e verificação contra o analisador real: uma composição e um lote
+# com uma composição a mais que as páginas, para que ao menos uma página seja
+# recarregada (_reset_page) e reaproveitada. O cache fica só em memória.
 if __name__ == "__main__":
+    import time
+    from itertools import islice, permutations
+
     # Lista de campeões para serem selecionados
     champions_to_select = [
         "Aatrox",
@@ -90,8 +320,28 @@ if __name__ == "__main__":
         "Alistar",
     ]
 
-    scraper = LolTheoryScraper()
-    risk_value, win_rate = scraper.get_stats(champions_to_select, Id=False).values()
+    with LolTheoryScraper(cache=DraftCache(path=None)) as scraper:
+        risk_value, win_rate = scraper.get_stats(champions_to_select, Id=False).values()
+
+        print(f"Risk Value: {risk_value}")
+        print(f"Win Rate: {win_rate}")
+
+        # Composições distintas (permutações do time inimigo, sem a já avaliada)
+        comps = [
+            champions_to_select[:5] + list(enemy)
+            for enemy in islice(
+                permutations(champions_to_select[5:]), 1, scraper.pages + 2
+            )
+        ]
+        start = time.perf_counter()
+        results = scraper.get_stats_batch(comps, Id=False)
+        elapsed = time.perf_counter() - start
 
-    print(f"Risk Value: {risk_value}")
-    print(f"Win Rate: {win_rate}")
+        for comp, stats in zip(comps, results):
+            print(comp[5:], stats)
+        failed = sum(stats["Win Rate:"] == "-1.0" for stats in results)
+        print(
+            f"{len(comps)} composições em {elapsed:.1f}s com {scraper.pages} páginas; "
+            f"{failed} com erro; páginas limpas: {scraper.cleared_pages}, "
+            f"recarregadas: {scraper.reloaded_pages}."
+        )
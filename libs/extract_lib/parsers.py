@@ -0,0 +1,498 @@
+import os
+import random
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from settings import HTML_PARSER, docs_path
+
+try:
+    import lxml.html
+except ImportError:  # pragma: no cover - dependência opcional
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # pragma: no cover - dependência opcional
+    HTMLParser = None
+
+RUNES_CONTAINER_CLASS = "flex w-full space-x-2 overflow-x-auto pb-2"
+RATE_CONTAINER_CLASS = "rate-container"
+
+RUNES_CONTAINER_XPATH = f'//div[@class="{RUNES_CONTAINER_CLASS}"]'
+RATE_CONTAINER_XPATH = (
+    "//div[contains(concat(' ', normalize-space(@class), ' '), "
+    f"' {RATE_CONTAINER_CLASS} ')]"
+)
+
+
+def _rune_stats(paragraphs):
+    # Extraindo as estatísticas de winRate e pickRate
+    return {
+        "winRate": paragraphs[1].strip(),
+        "pickRate": paragraphs[3].strip(),
+    }
+
+
+def _rune_container(links):
+    """Monta {rune_id: stats} a partir de pares (href, textos dos <p>)."""
+    rune_stats = {}
+    for href, paragraphs in links:
+        if not href.startswith("/runes/"):
+            continue
+
+        rune_id = href.rsplit("/", 1)[-1]
+        if rune_id.isdigit() and int(rune_id) not in rune_stats:
+            try:
+                rune_stats[int(rune_id)] = _rune_stats(paragraphs)
+            except IndexError:
+                continue
+    return rune_stats
+
+
+def _rune_page(containers):
+    if not containers:
+        raise Exception("Couldn't find the runes container div.")
+
+    return {
+        "primary": _rune_container(containers[0]),
+        "secondary": _rune_container(containers[1]) if len(containers) >= 2 else {},
+    }
+
+
+def _champion_page(rates):
+    # Win rate no primeiro contêiner e pick rate no segundo
+    return {"winRate": rates[0], "pickRate": rates[1]}
+
+
+def _column(headers, word):
+    for index, header in enumerate(headers):
+        if word in header.lower():
+            return index
+    return None
+
+
+def _tier_list(headers, rows):
+    """Monta {campeão: stats} a partir do cabeçalho e de pares (href, células).
+
+    As colunas de win rate e pick rate são localizadas pelo cabeçalho; se ele não
+    bater com as células, usam-se os dois primeiros percentuais da linha.
+    """
+    win_column = _column(headers, "win")
+    pick_column = _column(headers, "pick")
+
+    tier_list = {}
+    for href, cells in rows:
+        if not href or "/champions/" not in href:
+            continue
+        champion = href.split("/champions/", 1)[1].split("/")[0].split("?")[0]
+
+        cells = [cell.strip() for cell in cells]
+        if (
+            win_column is not None
+            and pick_column is not None
+            and max(win_column, pick_column) < len(cells)
+            and cells[win_column].endswith("%")
+            and cells[pick_column].endswith("%")
+        ):
+            win_rate, pick_rate = cells[win_column], cells[pick_column]
+        else:
+            percents = [cell for cell in cells if cell.endswith("%")]
+            if len(percents) < 2:
+                continue
+            win_rate, pick_rate = percents[:2]
+
+        tier_list.setdefault(champion, {"winRate": win_rate, "pickRate": pick_rate})
+
+    if not tier_list:
+        raise Exception("Couldn't find the tier list table.")
+    return tier_list
+
+
+class Bs4Parser:
+    """Árvore completa do BeautifulSoup com o ``html.parser`` (implementação original)."""
+
+    name = "bs4"
+
+    def __init__(self, features="html.parser"):
+        self.features = features
+
+    def _soup(self, page):
+        if isinstance(page, BeautifulSoup):
+            return page
+        return BeautifulSoup(page, self.features)
+
+    def rune_page(self, page):
+        containers = [
+            [
+                (link["href"], [p.text for p in link.find_all("p")])
+                for link in div.find_all("a", href=True)
+            ]
+            for div in self._soup(page).find_all("div", class_=RUNES_CONTAINER_CLASS)
+        ]
+        return _rune_page(containers)
+
+    def champion_page(self, page):
+        rates = [
+            div.find("strong").text
+            for div in self._soup(page).find_all("div", class_=RATE_CONTAINER_CLASS)[:2]
+        ]
+        return _champion_page(rates)
+
+    def tier_list_page(self, page):
+        soup = self._soup(page)
+        headers = [th.get_text(" ", strip=True) for th in soup.select("table thead th")]
+        rows = []
+        for row in soup.select("table tbody tr"):
+            link = row.find("a", href=lambda href: href and "/champions/" in href)
+            rows.append(
+                (
+                    link["href"] if link else None,
+                    [td.get_text(" ", strip=True) for td in row.find_all("td")],
+                )
+            )
+        return _tier_list(headers, rows)
+
+
+class LxmlParser:
+    """Árvore do libxml2 (C) consultada com XPath apenas nos nós necessários."""
+
+    name = "lxml"
+
+    def rune_page(self, page):
+        containers = [
+            [
+                (link.get("href"), [p.text_content() for p in link.iter("p")])
+                for link in div.xpath(".//a[@href]")
+            ]
+            for div in lxml.html.fromstring(page).xpath(RUNES_CONTAINER_XPATH)
+        ]
+        return _rune_page(containers)
+
+    def champion_page(self, page):
+        rates = [
+            div.xpath(".//strong")[0].text_content()
+            for div in lxml.html.fromstring(page).xpath(RATE_CONTAINER_XPATH)[:2]
+        ]
+        return _champion_page(rates)
+
+    def tier_list_page(self, page):
+        tree = lxml.html.fromstring(page)
+        headers = [th.text_content() for th in tree.xpath("//table//thead//th")]
+        rows = []
+        for row in tree.xpath("//table//tbody/tr"):
+            links = row.xpath(".//a[contains(@href, '/champions/')]/@href")
+            rows.append(
+                (
+                    links[0] if links else None,
+                    [" ".join(td.text_content().split()) for td in row.xpath("./td")],
+                )
+            )
+        return _tier_list(headers, rows)
+
+
+class SelectolaxParser:
+    """Parser Lexbor (C) do selectolax consultado com seletores CSS."""
+
+    name = "selectolax"
+
+    def rune_page(self, page):
+        containers = [
+            [
+                (link.attributes.get("href") or "", [p.text() for p in link.css("p")])
+                for link in div.css("a[href]")
+            ]
+            for div in HTMLParser(page).css(f'div[class="{RUNES_CONTAINER_CLASS}"]')
+        ]
+        return _rune_page(containers)
+
+    def champion_page(self, page):
+        rates = [
+            div.css_first("strong").text()
+            for div in HTMLParser(page).css(f"div.{RATE_CONTAINER_CLASS}")[:2]
+        ]
+        return _champion_page(rates)
+
+    def tier_list_page(self, page):
+        tree = HTMLParser(page)
+        headers = [th.text(separator=" ") for th in tree.css("table thead th")]
+        rows = []
+        for row in tree.css("table tbody tr"):
+            link = row.css_first('a[href*="/champions/"]')
+            rows.append(
+                (
+                    link.attributes.get("href") if link else None,
+                    [" ".join(td.text(separator=" ").split()) for td in row.css("td")],
+                )
+            )
+        return _tier_list(headers, rows)
+
+
+PARSERS = {
+    "bs4": (Bs4Parser, lambda: True),
+    "lxml": (LxmlParser, lambda: lxml is not None),
+    "selectolax": (SelectolaxParser, lambda: HTMLParser is not None),
+}
+
+
+def available_parsers():
+    """Retorna os nomes dos parsers cujas dependências estão instaladas."""
+    return [name for name, (_, available) in PARSERS.items() if available()]
+
+
+def get_parser(name=HTML_PARSER):
+    """Retorna o parser escolhido ou o ``bs4`` se a dependência não estiver instalada.
+
+    Args:
+        name (str, optional): "bs4", "lxml" ou "selectolax".
+    """
+    if name not in PARSERS:
+        raise ValueError(f"Parser desconhecido: {name}. Use {list(PARSERS)}.")
+
+    parser_class, available = PARSERS[name]
+    if not available():
+        print(f"Parser {name} não instalado, usando bs4.")
+        parser_class = Bs4Parser
+    return parser_class()
+
+
+def benchmark(fixtures, parsers=None, repeat=5):
+    """Compara o tempo e a memória de cada parser nas páginas salvas.
+
+    A memória é o pico medido pelo ``tracemalloc`` durante a leitura de uma página;
+    ele enxerga apenas as alocações feitas pelo Python, então os parsers em C
+    aparecem menores do que de fato são (a árvore do libxml2/Lexbor fica de fora).
+
+    Args:
+        fixtures (dict): {tipo: [html, ...]}, com tipo "rune", "champion" ou
+            "tier_list".
+        parsers (list, optional): Nomes dos parsers. Por padrão, os instalados.
+        repeat (int, optional): Repetições de cada página para medir o tempo.
+
+    Returns:
+        list: Um dict por parser e tipo com "ms_per_page" e "peak_kb_per_page".
+    """
+    results = []
+    for name in parsers or available_parsers():
+        parser = get_parser(name)
+        for kind, pages in fixtures.items():
+            if not pages:
+                continue
+            parse = getattr(parser, f"{kind}_page")
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for page in pages:
+                    parse(page)
+            elapsed = time.perf_counter() - start
+
+            peaks = []
+            for page in pages:
+                tracemalloc.start()
+                parse(page)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+            results.append(
+                {
+                    "parser": name,
+                    "page": kind,
+                    "pages": len(pages),
+                    "ms_per_page": round(elapsed * 1000 / (repeat * len(pages)), 2),
+                    "peak_kb_per_page": round(sum(peaks) / len(peaks) / 1024, 1),
+                }
+            )
+    return results
+
+
+def check_parity(fixtures, parsers=None):
+    """Confere se todos os parsers extraem o mesmo resultado de cada página.
+
+    Args:
+        fixtures (dict): {tipo: [html, ...]}, como em ``benchmark``.
+        parsers (list, optional): Nomes dos parsers. Por padrão, os instalados.
+
+    Returns:
+        list: Divergências (parser, tipo, índice da página); vazia se todos batem.
+    """
+    names = parsers or available_parsers()
+    reference, others = get_parser(names[0]), names[1:]
+
+    mismatches = []
+    for kind, pages in fixtures.items():
+        for index, page in enumerate(pages):
+            expected = getattr(reference, f"{kind}_page")(page)
+            for name in others:
+                if getattr(get_parser(name), f"{kind}_page")(page) != expected:
+                    mismatches.append((name, kind, index))
+    return mismatches
+
+
+def synthetic_fixtures(pages=3, noise=400, seed=0):
+    """Gera páginas com a mesma estrutura das do League of Items e do op.gg.
+
+    Cada página traz os elementos lidos pelos parsers no meio de ``noise`` blocos
+    de marcação irrelevante (menus, cartões e scripts), de modo que o benchmark
+    pode ser reproduzido sem rede e com o mesmo conteúdo em toda execução.
+
+    Args:
+        pages (int, optional): Páginas de cada tipo.
+        noise (int, optional): Blocos de marcação irrelevante por página.
+        seed (int, optional): Semente dos números gerados.
+
+    Returns:
+        dict: {tipo: [html, ...]}, como em ``benchmark``.
+    """
+    rng = random.Random(seed)
+
+    def percent():
+        return f"{rng.uniform(0, 100):.2f}%"
+
+    def filler(count):
+        blocks = []
+        for i in range(count):
+            blocks.append(
+                f'<div class="card card-{i % 7}"><nav><ul>'
+                + "".join(
+                    f'<li><a href="/items/{rng.randint(1000, 9999)}">Item {j}</a></li>'
+                    for j in range(3)
+                )
+                + f"</ul></nav><p>{percent()}</p><span>{rng.random():.6f}</span></div>"
+            )
+            if i % 50 == 0:
+                blocks.append(f"<script>window.__data = [{rng.random()}];</script>")
+        return "".join(blocks)
+
+    def document(body):
+        return (
+            "<!DOCTYPE html><html><head><title>Fixture</title></head><body>"
+            f"{filler(noise // 2)}{body}{filler(noise - noise // 2)}</body></html>"
+        )
+
+    def rune_links(count):
+        return "".join(
+            f'<a href="/runes/{rng.randint(8000, 8499)}"><img alt="rune">'
+            f"<p>Win rate</p><p>{percent()}</p><p>Pick rate</p><p>{percent()}</p></a>"
+            for _ in range(count)
+        )
+
+    fixtures = {"rune": [], "champion": [], "tier_list": []}
+    for _ in range(pages):
+        fixtures["rune"].append(
+            document(
+                f'<div class="{RUNES_CONTAINER_CLASS}">{rune_links(12)}</div>'
+                f'<div class="{RUNES_CONTAINER_CLASS}">{rune_links(9)}</div>'
+            )
+        )
+        fixtures["champion"].append(
+            document(
+                "".join(
+                    f'<div class="{RATE_CONTAINER_CLASS} rate-{i}">'
+                    f"<span>Rate</span><strong>{percent()}</strong></div>"
+                    for i in range(3)
+                )
+            )
+        )
+        rows = "".join(
+            f"<tr><td>{rank}</td><td>"
+            f'<a href="/champions/champion{rank}/build?region=br">Champion {rank}</a>'
+            f"</td><td>{rng.randint(1, 5)}</td><td>{percent()}</td><td>{percent()}</td>"
+            f"<td>{percent()}</td></tr>"
+            for rank in range(1, 171)
+        )
+        fixtures["tier_list"].append(
+            document(
+                "<table><thead><tr><th>#</th><th>Champion</th><th>Tier</th>"
+                "<th>Win rate</th><th>Pick rate</th><th>Ban rate</th></tr></thead>"
+                f"<tbody>{rows}</tbody></table>"
+            )
+        )
+    return fixtures
+
+
+def fixture_urls(champion_ids=(266, 103, 84), lanes=("top", "mid")):
+    """Retorna {arquivo: (tipo, url)} das páginas reais usadas como fixtures."""
+    # Importação local para evitar import circular com stats.py
+    from libs.extract_lib.stats import (
+        StatsFetcher,
+        champion_page_url,
+        rune_page_url,
+        tier_list_url,
+    )
+
+    wanted = {}
+    for champion_id in champion_ids:
+        wanted[f"rune_{champion_id}.html"] = ("rune", rune_page_url(champion_id))
+        name = StatsFetcher(champion_id).champion_name
+        for lane in lanes:
+            wanted[f"champion_{champion_id}_{lane}.html"] = (
+                "champion",
+                champion_page_url(name, lane),
+            )
+    for lane in lanes:
+        wanted[f"tier_list_{lane}.html"] = ("tier_list", tier_list_url(lane))
+    return wanted
+
+
+def save_fixtures(path, **kwargs):
+    """Baixa as páginas reais (ver ``fixture_urls``) e as salva em ``path``.
+
+    Use apenas para atualizar as fixtures; o benchmark não acessa a rede.
+    """
+    from libs.extract_lib.scraper import Scraper
+
+    wanted = fixture_urls(**kwargs)
+    urls = {url: file_name for file_name, (_, url) in wanted.items()}
+
+    os.makedirs(path, exist_ok=True)
+    with Scraper(parse_workers=0) as scraper:
+        for url, html in scraper.fetch_many(urls, desc="Salvando páginas").items():
+            if isinstance(html, Exception):
+                print(f"Erro ao baixar {url}: {html}")
+                continue
+            with open(os.path.join(path, urls[url]), "w", encoding="utf-8") as file:
+                file.write(html)
+
+
+def load_fixtures(path):
+    """Lê as páginas salvas em ``path`` (``rune_*``, ``champion_*`` e ``tier_list_*``).
+
+    Returns:
+        dict: {tipo: [html, ...]}, vazio para os tipos sem páginas salvas.
+    """
+    fixtures = {"rune": [], "champion": [], "tier_list": []}
+    if not os.path.isdir(path):
+        return fixtures
+
+    for file_name in sorted(os.listdir(path)):
+        kind = next(
+            (
+                kind
+                for kind in fixtures
+                if file_name.startswith(f"{kind}_") and file_name.endswith(".html")
+            ),
+            None,
+        )
+        if kind is None:
+            continue
+        with open(os.path.join(path, file_name), "r", encoding="utf-8") as file:
+            fixtures[kind].append(file.read())
+    return fixtures
+
+
+# Paridade e benchmark dos parsers com páginas sintéticas e, se houver, com as
+# páginas salvas em docs/fixtures (atualizadas com save_fixtures)
+if __name__ == "__main__":
+    import pandas as pd
+
+    for label, fixtures in (
+        ("sintéticas", synthetic_fixtures()),
+        ("salvas", load_fixtures(os.path.join(docs_path, "fixtures"))),
+    ):
+        if not any(fixtures.values()):
+            continue
+
+        mismatches = check_parity(fixtures)
+        print(f"Páginas {label}: divergências entre parsers: {mismatches or 'nenhuma'}")
+        print(pd.DataFrame(benchmark(fixtures)).to_string(index=False))
@@ -0,0 +1,253 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+
+from settings import (
+    SCRAPER_BACKOFF,
+    SCRAPER_HOST_LIMITS,
+    SCRAPER_MAX_WORKERS,
+    SCRAPER_PARSE_WORKERS,
+    SCRAPER_RETRIES,
+    SCRAPER_TIMEOUT,
+)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+def parse_host_limits(value):
+    """Converte "host:simultâneas:por_segundo,..." em {host: (simultâneas, por_segundo)}."""
+    limits = {}
+    for item in (value or "").split(","):
+        if item.strip():
+            host, concurrency, rate = item.strip().split(":")
+            limits[host] = (int(concurrency), float(rate))
+    return limits
+
+
+class HostLimiter:
+    """Limita as requisições simultâneas e o intervalo entre requisições de um site."""
+
+    def __init__(self, concurrency, rate):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.interval = 1 / rate if rate else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Reserva o próximo horário livre e aguarda até ele."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class Scraper:
+    """Executor de downloads para as páginas de estatísticas dos campeões.
+
+    - Cada thread reutiliza a própria ``requests.Session`` (conexões keep-alive).
+    - Cada site tem um limite de requisições simultâneas e por segundo
+      (SCRAPER_HOST_LIMITS); sites não configurados usam apenas o limite global.
+    - Erros de rede e respostas 429/5xx são repetidos com espera exponencial,
+      respeitando ``Retry-After``.
+    - A interpretação do HTML roda num conjunto de processos, em paralelo aos
+      downloads; as funções de interpretação precisam estar no nível do módulo.
+
+    Uso:
+        with Scraper() as scraper:
+            resultados = scraper.fetch_many(urls, parse_rune_page)
+    """
+
+    def __init__(
+        self,
+        max_workers=SCRAPER_MAX_WORKERS,
+        parse_workers=SCRAPER_PARSE_WORKERS,
+        host_limits=SCRAPER_HOST_LIMITS,
+        retries=SCRAPER_RETRIES,
+        backoff=SCRAPER_BACKOFF,
+        timeout=SCRAPER_TIMEOUT,
+    ):
+        """
+        Args:
+            max_workers (int, optional): Downloads simultâneos no total.
+            parse_workers (int, optional): Processos de interpretação. 0 interpreta
+                na própria thread do download.
+            host_limits (str, optional): Limites por site no formato
+                "host:simultâneas:por_segundo" separados por vírgula.
+            retries (int, optional): Novas tentativas após a primeira.
+            backoff (float, optional): Espera base em segundos entre tentativas.
+            timeout (float, optional): Tempo máximo de cada requisição.
+        """
+        self.max_workers = max_workers
+        self.parse_workers = parse_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.host_limiters = {
+            host: HostLimiter(concurrency, rate)
+            for host, (concurrency, rate) in parse_host_limits(host_limits).items()
+        }
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._download_pool = None
+        self._parse_pool = None
+        self.requests = 0
+        self.retried = 0
+        self.failed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Encerra os conjuntos de threads e processos e as sessões."""
+        if self._download_pool is not None:
+            self._download_pool.shutdown()
+            self._download_pool = None
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
+
+    def session(self):
+        """Retorna a sessão HTTP da thread atual."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=len(self.host_limiters) or 1,
+                pool_maxsize=self.max_workers,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _host_limiter(self, url):
+        hostname = urlparse(url).hostname or ""
+        for host, limiter in self.host_limiters.items():
+            if hostname == host or hostname.endswith(f".{host}"):
+                return limiter
+        return None
+
+    def get(self, url):
+        """Baixa a página respeitando os limites do site e repetindo falhas temporárias.
+
+        Returns:
+            str: HTML da página.
+        """
+        limiter = self._host_limiter(url)
+
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                if limiter is not None:
+                    with limiter.semaphore:
+                        limiter.wait()
+                        response = self.session().get(url, timeout=self.timeout)
+                else:
+                    response = self.session().get(url, timeout=self.timeout)
+
+                with self._lock:
+                    self.requests += 1
+
+                if response.status_code == 200:
+                    return response.text
+
+                error = Exception(
+                    f"Failed to load page with status code: {response.status_code}"
+                )
+                if response.status_code not in RETRY_STATUS:
+                    break
+                retry_after = response.headers.get("Retry-After")
+            except requests.RequestException as e:
+                error = e
+
+            if attempt < self.retries:
+                with self._lock:
+                    self.retried += 1
+                wait = self.backoff * 2**attempt
+                if retry_after and retry_after.isdigit():
+                    wait = max(wait, float(retry_after))
+                time.sleep(wait)
+
+        with self._lock:
+            self.failed += 1
+        raise error
+
+    def fetch_many(self, urls, parse=None, desc="Baixando páginas"):
+        """Baixa as páginas em paralelo e interpreta cada uma assim que chega.
+
+        Args:
+            urls (Iterable[str]): Endereços das páginas.
+            parse (callable, optional): Função de módulo que recebe o HTML e retorna
+                um resultado serializável.
+            desc (str, optional): Descrição da barra de progresso.
+
+        Returns:
+            dict: {url: resultado}. Em caso de erro, o valor é a exceção.
+        """
+        urls = list(dict.fromkeys(urls))
+        if self._download_pool is None:
+            self._download_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        if parse is not None and self.parse_workers and self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+
+        results = {}
+        parse_futures = {}
+        download_futures = {
+            self._download_pool.submit(self.get, url): url for url in urls
+        }
+
+        for future in tqdm(as_completed(download_futures), total=len(urls), desc=desc):
+            url = download_futures[future]
+            try:
+                html = future.result()
+            except Exception as e:
+                results[url] = e
+                continue
+
+            if parse is None:
+                results[url] = html
+            elif self._parse_pool is not None:
+                parse_futures[self._parse_pool.submit(parse, html)] = url
+            else:
+                try:
+                    results[url] = parse(html)
+                except Exception as e:
+                    results[url] = e
+
+        for future, url in parse_futures.items():
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                results[url] = e
+
+        return results
+
+    def stats(self):
+        """Retorna os contadores de requisições."""
+        return {
+            "requests": self.requests,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
@@ -0,0 +1,126 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+from settings import SNAPSHOT_KEEP_PAGES, SNAPSHOT_PATH, SNAPSHOT_TTL
+
+
+def parse_with_page(parse, page):
+    """Interpreta a página e devolve também o HTML, para ser guardado no snapshot.
+
+    Usada com ``functools.partial`` no ``Scraper.fetch_many``; por ser uma função
+    de módulo, pode ser executada num processo separado.
+    """
+    return {"stats": parse(page), "page": page}
+
+
+class SnapshotStore:
+    """Snapshots locais das estatísticas coletadas no op.gg e no League of Items.
+
+    Cada snapshot guarda as estatísticas interpretadas (e, opcionalmente, a página
+    baixada) num arquivo gzip em ``<path>/<fonte>/<patch>/<campeão>_<lane>.json.gz``.
+    Um snapshot vale por ``ttl`` segundos dentro do mesmo patch; os de patches
+    anteriores permanecem na pasta como histórico. Assim uma nova execução baixa
+    apenas os campeões ausentes ou vencidos.
+    """
+
+    def __init__(
+        self, path=SNAPSHOT_PATH, ttl=SNAPSHOT_TTL, keep_pages=SNAPSHOT_KEEP_PAGES
+    ):
+        """
+        Args:
+            path (str, optional): Pasta dos snapshots. Sem pasta nada é persistido.
+            ttl (int, optional): Validade em segundos. None para não expirar no patch.
+            keep_pages (bool, optional): Guarda o HTML junto das estatísticas.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.keep_pages = keep_pages
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.written = 0
+
+    def _file_path(self, source, patch, champion_id, lane=None):
+        return os.path.join(
+            self.path, source, str(patch), f"{champion_id}_{lane or 'all'}.json.gz"
+        )
+
+    def _read(self, file_path):
+        if not os.path.exists(file_path):
+            return None
+
+        with gzip.open(file_path, "rt", encoding="utf-8") as file:
+            return json.load(file)
+
+    def is_fresh(self, entry, now=None):
+        """Verifica se o snapshot ainda está dentro da validade."""
+        now = now or time.time()
+        return self.ttl is None or now - entry["fetchedAt"] < self.ttl
+
+    def get(self, source, patch, champion_id, lane=None, fresh=True):
+        """Retorna o snapshot armazenado ou None.
+
+        Args:
+            source (str): Site de origem (ex.: "opgg", "leagueofitems").
+            patch (str): Versão do jogo a que as estatísticas se referem.
+            champion_id (int | str): Id do campeão.
+            lane (str, optional): Lane das estatísticas, se houver.
+            fresh (bool, optional): Ignora snapshots vencidos.
+
+        Returns:
+            dict: Snapshot com "stats", "url" e "fetchedAt" (e "page", se guardada).
+        """
+        if not self.path:
+            return None
+
+        entry = self._read(self._file_path(source, patch, champion_id, lane))
+        hit = entry is not None and (not fresh or self.is_fresh(entry))
+        if fresh:
+            with self._lock:
+                if hit:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        return entry if hit else None
+
+    def put(self, source, patch, champion_id, stats, url=None, lane=None, page=None):
+        """Grava o snapshot de forma atômica, substituindo o anterior do mesmo patch."""
+        if not self.path:
+            return
+
+        file_path = self._file_path(source, patch, champion_id, lane)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        entry = {
+            "source": source,
+            "patch": str(patch),
+            "championId": str(champion_id),
+            "lane": lane,
+            "url": url,
+            "fetchedAt": time.time(),
+            "stats": stats,
+        }
+        if self.keep_pages and page is not None:
+            entry["page"] = page
+
+        tmp_path = f"{file_path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as file:
+            json.dump(entry, file, ensure_ascii=False)
+        os.replace(tmp_path, file_path)
+
+        with self._lock:
+            self.written += 1
+
+    def patches(self, source):
+        """Lista os patches com snapshots de uma fonte."""
+        source_path = os.path.join(self.path or "", source)
+        if not self.path or not os.path.isdir(source_path):
+            return []
+        return sorted(os.listdir(source_path))
+
+    def stats(self):
+        """Retorna os contadores de leitura e escrita dos snapshots."""
+        return {"hits": self.hits, "misses": self.misses, "written": self.written}
@@ -2,16 +2,111 @@ import json
 import os
 
 import requests
-from bs4 import BeautifulSoup
 
-from settings import docs_path
+from libs.extract_lib.parsers import get_parser
+from settings import HTML_PARSER, docs_path
+
+_parsers = {}
+
+
+def rune_page_url(champion_id):
+    """URL da página de runas do campeão no League of Items."""
+    return f"https://leagueofitems.com/champions/{champion_id}"
+
+
+def champion_page_url(champion_name, lane):
+    """URL da página do campeão por lane no op.gg."""
+    return f"https://www.op.gg/champions/{champion_name}/build/{lane}?region=br&tier=diamond_plus&type=ranked"
+
+
+def tier_list_url(lane):
+    """URL da lista de campeões de uma lane no op.gg, com todos os campeões."""
+    return f"https://www.op.gg/champions?region=br&tier=diamond_plus&position={lane}"
+
+
+def normalize_champion_name(name):
+    """Reduz o nome a letras e números minúsculos (ex.: "Kai'Sa" -> "kaisa")."""
+    return "".join(char for char in str(name).lower() if char.isalnum())
+
+
+def load_champion_index():
+    """Retorna {nome normalizado: id} com os nomes e os ids textuais dos campeões."""
+    with open(os.path.join(docs_path, "champion.json"), "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    index = {}
+    for champion_key, details in data["data"].items():
+        index[normalize_champion_name(champion_key)] = details["key"]
+        index[normalize_champion_name(details["name"])] = details["key"]
+    return index
+
+
+def parse_rune_page(page, parser=None):
+    """Extrai as estatísticas de todas as runas da página de um campeão.
+
+    As runas principais vêm do primeiro contêiner e as secundárias do segundo.
+    Por ser uma função de módulo, pode ser executada num processo separado.
+
+    Args:
+        page (str): HTML da página.
+        parser (str, optional): Parser usado (ver ``parsers.get_parser``). Por
+            padrão, o definido em HTML_PARSER.
+
+    Returns:
+        dict: {"primary": {rune_id: stats}, "secondary": {rune_id: stats}},
+        com stats no formato {"winRate": ..., "pickRate": ...}.
+    """
+    return _parser(parser).rune_page(page)
+
+
+def parse_champion_page(page, parser=None):
+    """Extrai o win rate e o pick rate da página do campeão no op.gg.
+
+    Args:
+        page (str): HTML da página.
+        parser (str, optional): Parser usado. Por padrão, o definido em HTML_PARSER.
+
+    Returns:
+        dict: {"winRate": ..., "pickRate": ...}.
+    """
+    return _parser(parser).champion_page(page)
+
+
+def parse_tier_list_page(page, parser=None):
+    """Extrai o win rate e o pick rate de todos os campeões da lista de uma lane.
+
+    Args:
+        page (str): HTML da página.
+        parser (str, optional): Parser usado. Por padrão, o definido em HTML_PARSER.
+
+    Returns:
+        dict: {campeão no endereço do op.gg: {"winRate": ..., "pickRate": ...}}.
+    """
+    return _parser(parser).tier_list_page(page)
+
+
+def _parser(name):
+    # Um parser por nome e processo, reaproveitado entre as páginas
+    name = name or HTML_PARSER
+    if name not in _parsers:
+        _parsers[name] = get_parser(name)
+    return _parsers[name]
 
 
 class StatsFetcher:
 
-    def __init__(self, champion_id) -> None:
+    def __init__(self, champion_id, scraper=None) -> None:
+        """
+        Args:
+            champion_id (int | str): Id do campeão.
+            scraper (Scraper, optional): Executor de downloads com sessão, limites
+                por site e novas tentativas. Sem ele é usado ``requests.get``.
+        """
         self.champion_id = champion_id
         self.champion_name = self.__get_champion_name()
+        self.scraper = scraper
+        self._pages = {}
+        self._rune_stats = {}
 
     def __get_champion_name(self):
         with open(
@@ -24,113 +119,60 @@ class StatsFetcher:
                 return details["name"]
         return None
 
-    def get_rune_stats(self, rune_id):
-        # URL do campeão com base no ID
-        url = f"https://leagueofitems.com/champions/{self.champion_id}"
-
-        # Fazendo a requisição HTTP para o site
-        response = requests.get(url)
-
-        # Verificando se a requisição foi bem-sucedida
-        if response.status_code != 200:
-            raise Exception(
-                f"Failed to load page with status code: {response.status_code}"
-            )
-
-        # Parsing do conteúdo HTML da página
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Procurando a div que contém as informações das runas
-        runes_div = soup.find(
-            "div", class_="flex w-full space-x-2 overflow-x-auto pb-2"
-        )
-
-        if not runes_div:
-            raise Exception("Couldn't find the runes container div.")
+    def _get_page(self, url):
+        """Baixa a página uma única vez por instância."""
+        if url not in self._pages:
+            if self.scraper is not None:
+                self._pages[url] = self.scraper.get(url)
+            else:
+                # Fazendo a requisição HTTP para o site
+                response = requests.get(url)
+
+                # Verificando se a requisição foi bem-sucedida
+                if response.status_code != 200:
+                    raise Exception(
+                        f"Failed to load page with status code: {response.status_code}"
+                    )
+                self._pages[url] = response.text
+        return self._pages[url]
+
+    def get_all_rune_stats(self):
+        """Extrai as estatísticas de todas as runas do campeão numa única leitura.
+
+        Returns:
+            dict: Resultado de ``parse_rune_page``.
+        """
+        url = rune_page_url(self.champion_id)
+        if url not in self._rune_stats:
+            self._rune_stats[url] = parse_rune_page(self._get_page(url))
+        return self._rune_stats[url]
 
+    def get_rune_stats(self, rune_id):
         # Procurando a runa específica pelo ID
-        rune_link = runes_div.find("a", href=f"/runes/{rune_id}")
+        rune_stats = self.get_all_rune_stats()["primary"].get(int(rune_id))
 
-        if not rune_link:
+        if not rune_stats:
             raise Exception(f"Couldn't find the rune with ID {rune_id}.")
 
-        # Extraindo as estatísticas de winRate e pickRate
-        winRate = rune_link.find_all("p")[1].text.strip()
-        pickRate = rune_link.find_all("p")[3].text.strip()
-
-        return {"winRate": winRate, "pickRate": pickRate}
+        return rune_stats
 
     def get_secundary_rune_stats(self, secundary_rune_id):
-        # URL do campeão com base no ID
-        url = f"https://leagueofitems.com/champions/{self.champion_id}"
-
-        # Fazendo a requisição HTTP para o site
-        response = requests.get(url)
-
-        # Verificando se a requisição foi bem-sucedida
-        if response.status_code != 200:
-            raise Exception(
-                f"Failed to load page with status code: {response.status_code}"
-            )
-
-        # Parsing do conteúdo HTML da página
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Procurando a div que contém as informações das runas
-        runes_div = soup.find_all(
-            "div", class_="flex w-full space-x-2 overflow-x-auto pb-2"
-        )
-
-        if not runes_div:
-            raise Exception("Couldn't find the runes container div.")
-
-        if len(runes_div) >= 2:
-            secondary_rune = runes_div[1]
-        else:
-            raise Exception("Couldn't find the secondary rune div.")
+        secondary_runes = self.get_all_rune_stats()["secondary"]
 
         # Procurando a runa específica pelo ID
-        secondary_rune_link = secondary_rune.find(
-            "a", href=f"/runes/{secundary_rune_id}"
-        )
+        rune_stats = secondary_runes.get(int(secundary_rune_id))
 
-        if not secondary_rune_link:
+        if not rune_stats:
             raise Exception(
                 f"Couldn't find the secondary rune with ID {secundary_rune_id}."
             )
 
-        # Extraindo as estatísticas de winRate e pickRate
-        winRate = secondary_rune_link.find_all("p")[1].text.strip()
-        pickRate = secondary_rune_link.find_all("p")[3].text.strip()
-
-        return {"winRate": winRate, "pickRate": pickRate}
+        return rune_stats
 
     def get_champion_stats(self, lane):
         # URL do campeão com base no ID e lane
-        url = f"https://www.op.gg/champions/{self.champion_name}/build/{lane}?region=br&tier=diamond_plus&type=ranked"
-
-        # Fazendo a requisição HTTP para o site
-        response = requests.get(url)
-
-        # Verificando se a requisição foi bem-sucedida
-        if response.status_code != 200:
-            raise Exception(
-                f"Failed to load page with status code: {response.status_code}"
-            )
-
-        # Parsing do conteúdo HTML da página
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Encontrar os contêineres de win rate e pick rate
-        rate_containers = soup.find_all("div", class_="rate-container")
-
-        # Extrair o valor de win rate
-        winRate = rate_containers[0].find("strong").text
-
-        # Extrair o valor de pick rate
-        pickRate = rate_containers[1].find("strong").text
-
-        return {"winRate": winRate, "pickRate": pickRate}
+        url = champion_page_url(self.champion_name, lane)
+        return parse_champion_page(self._get_page(url))
 
 
 # Exemplo de uso
@@ -142,6 +184,9 @@ if __name__ == "__main__":
     print(winRate)
     print(pickRate)
 
+    # Todas as runas com uma única requisição
+    print(fetcher.get_all_rune_stats())
+
     winRate, pickRate = fetcher.get_champion_stats("top").values()
     print(winRate)
     print(pickRate)
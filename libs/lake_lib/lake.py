@@ -0,0 +1,211 @@
+import os
+import threading
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+from settings import LAKE_FLUSH_ROWS, LAKE_PATH
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # pragma: no cover - dependência opcional
+    pa = None
+    ds = None
+
+PARTITION_COLUMNS = ["patch", "gameDate"]
+
+
+def match_partition(df_match: pd.DataFrame):
+    """Obtém o patch (ex.: "14.20") e a data da partida usados como partição.
+
+    Args:
+        df_match (DataFrame): Dados da partida retornados por ``get_match``.
+
+    Returns:
+        tuple: (patch, gameDate) como textos.
+    """
+    patch = ".".join(str(df_match["gameVersion"].iloc[0]).split(".")[:2])
+    game_date = datetime.fromtimestamp(df_match["gameStartTimestamp"].iloc[0])
+    return patch, game_date.strftime("%Y-%m-%d")
+
+
+def build_filter(conditions: dict):
+    """Converte {coluna: valor} numa expressão de filtro do pyarrow.
+
+    None vira ``is_null`` e listas viram ``isin``, como em ``build_where_clause``.
+    """
+    expression = None
+    for column, value in conditions.items():
+        if value is None:
+            condition = ds.field(column).is_null()
+        elif isinstance(value, (list, tuple, set)):
+            condition = ds.field(column).isin(list(value))
+        else:
+            condition = ds.field(column) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+class ParquetLake:
+    """Conjunto de dados Parquet particionado por patch e data das partidas.
+
+    Cada tabela fica em ``{path}/{tabela}/patch=.../gameDate=.../*.parquet``. As
+    linhas são acumuladas em memória e gravadas em lote a cada ``flush_rows``
+    linhas (ou em ``flush``), comprimidas com zstd.
+
+    O schema Arrow de cada tabela parte dos arquivos já gravados (ou do primeiro
+    DataFrame) e é ampliado a cada lote, de modo que os arquivos tenham os mesmos
+    tipos também entre execuções. Colunas sem nenhum valor (tipo ``null``) recebem
+    o tipo já conhecido da coluna ou, se ainda não houver, ficam fora do arquivo;
+    na leitura, o schema unificado dos arquivos preenche a coluna ausente com nulos.
+    """
+
+    def __init__(self, path=LAKE_PATH, flush_rows=LAKE_FLUSH_ROWS):
+        """
+        Args:
+            path (str, optional): Pasta raiz do conjunto de dados.
+            flush_rows (int, optional): Linhas acumuladas por tabela antes da gravação.
+        """
+        if pa is None:
+            raise ImportError("O pacote pyarrow é necessário para usar o ParquetLake.")
+
+        self.path = path
+        self.flush_rows = flush_rows
+        self.partitioning = ds.partitioning(
+            pa.schema([(column, pa.string()) for column in PARTITION_COLUMNS]),
+            flavor="hive",
+        )
+        self._buffers = {}
+        self._schemas = {}
+        self._lock = threading.Lock()
+        self.rows_written = 0
+        self.flushes = 0
+
+    def append(self, df: pd.DataFrame, table_name: str, patch: str, game_date: str):
+        """Acumula as linhas de uma partida na partição informada.
+
+        Args:
+            df (DataFrame): Linhas a gravar (ex.: saída de ``get_match``).
+            table_name (str): Nome da tabela no conjunto de dados.
+            patch (str): Patch da partida.
+            game_date (str): Data da partida no formato "AAAA-MM-DD".
+        """
+        df = df.assign(patch=patch, gameDate=game_date)
+
+        with self._lock:
+            buffer = self._buffers.setdefault(table_name, [])
+            buffer.append(df)
+            buffered_rows = sum(len(frame) for frame in buffer)
+
+        if buffered_rows >= self.flush_rows:
+            self.flush(table_name)
+
+    def _stored_schema(self, table_name: str):
+        """Unifica os schemas dos arquivos já gravados da tabela (None se não houver)."""
+        if not self.exists(table_name):
+            return None
+
+        dataset = ds.dataset(
+            os.path.join(self.path, table_name),
+            format="parquet",
+            partitioning=self.partitioning,
+        )
+        schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+        if not schemas:
+            return None
+        return pa.unify_schemas(
+            schemas + [self.partitioning.schema], promote_options="permissive"
+        )
+
+    def _to_arrow(self, table_name: str, df: pd.DataFrame):
+        """Converte o DataFrame usando o schema da tabela, ampliando-o se preciso."""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if table_name not in self._schemas:
+            self._schemas[table_name] = self._stored_schema(table_name)
+        schema = self._schemas[table_name]
+        known = {} if schema is None else {field.name: field for field in schema}
+
+        # Colunas "null" recebem o tipo conhecido ou ficam fora do arquivo
+        for field in table.schema:
+            if pa.types.is_null(field.type):
+                index = table.schema.get_field_index(field.name)
+                if field.name in known and not pa.types.is_null(known[field.name].type):
+                    table = table.set_column(
+                        index,
+                        known[field.name],
+                        pa.nulls(table.num_rows, known[field.name].type),
+                    )
+                else:
+                    table = table.remove_column(index)
+
+        schema = (
+            table.schema
+            if schema is None
+            else pa.unify_schemas([schema, table.schema], promote_options="permissive")
+        )
+        self._schemas[table_name] = schema
+        return table.cast(
+            pa.schema([schema.field(name) for name in table.column_names])
+        )
+
+    def flush(self, table_name: str = None):
+        """Grava as linhas acumuladas de uma tabela (ou de todas) em Parquet."""
+        with self._lock:
+            table_names = [table_name] if table_name else list(self._buffers)
+            pending = {
+                name: self._buffers.pop(name)
+                for name in table_names
+                if self._buffers.get(name)
+            }
+
+            for name, frames in pending.items():
+                table = self._to_arrow(name, pd.concat(frames, ignore_index=True))
+                ds.write_dataset(
+                    table,
+                    os.path.join(self.path, name),
+                    format="parquet",
+                    partitioning=self.partitioning,
+                    basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                    existing_data_behavior="overwrite_or_ignore",
+                    file_options=ds.ParquetFileFormat().make_write_options(
+                        compression="zstd"
+                    ),
+                )
+                self.rows_written += table.num_rows
+                self.flushes += 1
+
+    def exists(self, table_name: str) -> bool:
+        """Verifica se a tabela já tem arquivos gravados."""
+        return os.path.isdir(os.path.join(self.path, table_name))
+
+    def read(self, table_name: str, columns=None, where: dict = None):
+        """Lê uma tabela com projeção de colunas e filtro aplicados na leitura.
+
+        Os filtros nas colunas de partição descartam pastas inteiras e os demais
+        usam as estatísticas dos arquivos Parquet, sem carregar linhas desnecessárias.
+
+        Args:
+            table_name (str): Nome da tabela no conjunto de dados.
+            columns (list, optional): Colunas a ler. None para todas.
+            where (dict, optional): Filtro {coluna: valor}; None vira nulo e listas viram IN.
+
+        Returns:
+            pd.DataFrame: Linhas e colunas selecionadas.
+        """
+        # Schema unificado de todos os arquivos, e não só do primeiro encontrado
+        dataset = ds.dataset(
+            os.path.join(self.path, table_name),
+            schema=self._stored_schema(table_name),
+            format="parquet",
+            partitioning=self.partitioning,
+        )
+        table = dataset.to_table(
+            columns=columns, filter=build_filter(where) if where else None
+        )
+        return table.to_pandas()
+
+    def stats(self):
+        """Retorna os contadores de gravação."""
+        return {"rows": self.rows_written, "flushes": self.flushes}
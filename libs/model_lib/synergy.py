@@ -0,0 +1,371 @@
+import json
+import os
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from settings import (
+    PROCESSING_CHUNK_SIZE,
+    SYNERGY_FILE,
+    SYNERGY_MIN_GAMES,
+    SYNERGY_PRIOR,
+    docs_path,
+    player_match_table,
+)
+
+POSITIONS = ("TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY")
+MISSING_STATS = {"Risk Value:": "-1.0", "Win Rate:": "-1.0"}
+
+# Pares de posições de um mesmo time (10 pares)
+PAIR_I, PAIR_J = (np.array(index) for index in zip(*combinations(range(5), 2)))
+
+
+def _logit(p):
+    p = np.clip(p, 1e-6, 1 - 1e-6)
+    return np.log(p / (1 - p))
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class SynergyModel:
+    """Estimador local do win rate de composições a partir das partidas gravadas.
+
+    Mantém contagens densas (NumPy) de jogos e vitórias por campeão, por dupla de
+    campeões no mesmo time (sinergia) e por confronto de campeões na mesma posição
+    em times opostos (counter). As taxas de duplas e confrontos são suavizadas em
+    direção ao esperado pelos campeões isolados (``prior`` jogos fictícios) e
+    ignoradas abaixo de ``min_games`` jogos.
+
+    O win rate de uma composição é ``sigmoid`` da soma, em log-odds, dos campeões,
+    das sinergias de cada time e dos confrontos por posição. O Risk Value é a
+    porcentagem de duplas e confrontos da composição sem amostra suficiente.
+
+    As composições seguem o formato do ``LolTheoryScraper``: 10 campeões, os 5 do
+    time avaliado e depois os 5 adversários, cada time na ordem TOP, JUNGLE,
+    MIDDLE, BOTTOM, UTILITY.
+    """
+
+    def __init__(self, prior=SYNERGY_PRIOR, min_games=SYNERGY_MIN_GAMES):
+        """
+        Args:
+            prior (float, optional): Jogos fictícios usados na suavização.
+            min_games (int, optional): Jogos mínimos para considerar uma dupla ou
+                confronto.
+        """
+        self.prior = prior
+        self.min_games = min_games
+        self.index = {}
+        self.names = {}
+        self.seen_matches = set()
+        self.champion_games = np.zeros(0)
+        self.champion_wins = np.zeros(0)
+        self.synergy_games = np.zeros((0, 0))
+        self.synergy_wins = np.zeros((0, 0))
+        self.counter_games = np.zeros((len(POSITIONS), 0, 0))
+        self.counter_wins = np.zeros((len(POSITIONS), 0, 0))
+        self._scores = None
+        self._load_champions()
+
+    def _load_champions(self):
+        # Índice denso id -> linha das matrizes, na ordem do champion.json
+        with open(
+            os.path.join(docs_path, "champion.json"), "r", encoding="utf-8"
+        ) as file:
+            champions = json.load(file)["data"].values()
+
+        self.names = {champion["name"]: int(champion["key"]) for champion in champions}
+        self._grow(int(champion["key"]) for champion in champions)
+
+    def _grow(self, champion_ids):
+        """Acrescenta linhas e colunas para campeões ainda sem índice."""
+        new_ids = [
+            champion_id
+            for champion_id in dict.fromkeys(champion_ids)
+            if champion_id not in self.index
+        ]
+        if not new_ids:
+            return
+
+        for champion_id in new_ids:
+            self.index[champion_id] = len(self.index)
+
+        extra = len(new_ids)
+        self.champion_games = np.pad(self.champion_games, (0, extra))
+        self.champion_wins = np.pad(self.champion_wins, (0, extra))
+        self.synergy_games = np.pad(self.synergy_games, ((0, extra), (0, extra)))
+        self.synergy_wins = np.pad(self.synergy_wins, ((0, extra), (0, extra)))
+        self.counter_games = np.pad(
+            self.counter_games, ((0, 0), (0, extra), (0, extra))
+        )
+        self.counter_wins = np.pad(self.counter_wins, ((0, 0), (0, extra), (0, extra)))
+        self._scores = None
+
+    def _team_matrix(self, df, position_column):
+        """Converte as linhas de PlayerMatch em (partidas x 2 times x 5 posições).
+
+        Partidas com posição inválida ou repetida em algum time são descartadas,
+        como na montagem da base de análise.
+        """
+        df = df[df[position_column].isin(POSITIONS)]
+        duplicated = df.duplicated(["matchId", "teamId", position_column], keep=False)
+        df = df[~df["matchId"].isin(df.loc[duplicated, "matchId"])]
+
+        champions = df.pivot(
+            index="matchId", columns=["teamId", position_column], values="championId"
+        ).reindex(columns=pd.MultiIndex.from_product([[100, 200], POSITIONS]))
+        champions = champions.dropna()
+        if champions.empty:
+            return [], np.zeros((0, 2, 5), dtype=int), np.zeros(0)
+
+        self._grow(int(champion_id) for champion_id in np.unique(champions.values))
+        to_index = np.vectorize(lambda champion_id: self.index[int(champion_id)])
+        teams = to_index(champions.values).reshape(-1, 2, 5)
+
+        blue_win = (
+            df[df["teamId"] == 100]
+            .groupby("matchId")["win"]
+            .first()
+            .reindex(champions.index)
+            .astype(int)
+            .values
+        )
+        return list(champions.index), teams, blue_win
+
+    def update(self, df_player_match, position_column="teamPosition"):
+        """Soma às matrizes as partidas ainda não contadas.
+
+        Args:
+            df_player_match (pd.DataFrame): Linhas de PlayerMatch com "matchId",
+                "teamId", "championId", "win" e a coluna de posição.
+            position_column (str, optional): Coluna com a posição do jogador.
+
+        Returns:
+            int: Quantidade de partidas novas contadas.
+        """
+        df = df_player_match[~df_player_match["matchId"].isin(self.seen_matches)]
+        match_ids, teams, blue_win = self._team_matrix(df, position_column)
+        if not match_ids:
+            return 0
+
+        blue, red = teams[:, 0], teams[:, 1]
+        red_win = 1 - blue_win
+
+        for side, win in ((blue, blue_win), (red, red_win)):
+            np.add.at(self.champion_games, side.ravel(), 1)
+            np.add.at(self.champion_wins, side.ravel(), np.repeat(win, 5))
+
+            # Sinergia: matriz simétrica com as duplas do mesmo time
+            first, second = side[:, PAIR_I].ravel(), side[:, PAIR_J].ravel()
+            pair_win = np.repeat(win, len(PAIR_I))
+            for a, b in ((first, second), (second, first)):
+                np.add.at(self.synergy_games, (a, b), 1)
+                np.add.at(self.synergy_wins, (a, b), pair_win)
+
+        # Counter: vitórias do campeão da linha contra o da coluna na mesma posição
+        positions = np.broadcast_to(np.arange(len(POSITIONS)), blue.shape).ravel()
+        for a, b, win in ((blue, red, blue_win), (red, blue, red_win)):
+            np.add.at(self.counter_games, (positions, a.ravel(), b.ravel()), 1)
+            np.add.at(
+                self.counter_wins,
+                (positions, a.ravel(), b.ravel()),
+                np.repeat(win, len(POSITIONS)),
+            )
+
+        self.seen_matches.update(match_ids)
+        self._scores = None
+        return len(match_ids)
+
+    def update_from_storage(self, sql, chunksize=PROCESSING_CHUNK_SIZE):
+        """Lê a tabela PlayerMatch em blocos e conta apenas as partidas novas.
+
+        Linhas de uma partida divididas entre dois blocos são mantidas até a
+        partida ficar completa.
+        """
+        chunks = sql.get_data(
+            player_match_table,
+            ["matchId", "teamId", "championId", "teamPosition", "win"],
+            chunksize=chunksize,
+        )
+
+        added = 0
+        pending = pd.DataFrame()
+        for chunk in chunks:
+            df = pd.concat([pending, chunk], ignore_index=True)
+            sizes = df.groupby("matchId")["matchId"].transform("size")
+            pending = df[sizes < 10]
+            added += self.update(df[sizes >= 10])
+        if not pending.empty:
+            added += self.update(pending)
+
+        print(f"Sinergias: {added} partidas novas, {len(self.seen_matches)} no total")
+        return added
+
+    def _compute_scores(self):
+        """Converte as contagens nos termos em log-odds usados na avaliação."""
+        prior = self.prior
+        champion_rate = (self.champion_wins + prior * 0.5) / (
+            self.champion_games + prior
+        )
+        champion_logit = _logit(champion_rate)
+
+        # Esperado sem interação: média das taxas da dupla
+        expected = (champion_rate[:, None] + champion_rate[None, :]) / 2
+        synergy_rate = (self.synergy_wins + prior * expected) / (
+            self.synergy_games + prior
+        )
+        synergy_ok = self.synergy_games >= self.min_games
+        synergy = np.where(synergy_ok, _logit(synergy_rate) - _logit(expected), 0.0)
+
+        # Esperado sem interação: diferença de força dos dois campeões
+        expected = _sigmoid(champion_logit[:, None] - champion_logit[None, :])
+        counter_rate = (self.counter_wins + prior * expected) / (
+            self.counter_games + prior
+        )
+        counter_ok = self.counter_games >= self.min_games
+        counter = np.where(counter_ok, _logit(counter_rate) - _logit(expected), 0.0)
+
+        self._scores = (champion_logit, synergy, synergy_ok, counter, counter_ok)
+
+    def _to_indices(self, comps, Id=True):
+        """Converte as composições em índices; as incompletas ficam com -1."""
+        indices = np.full((len(comps), 10), -1, dtype=int)
+        for row, champions in enumerate(comps):
+            if not Id:
+                champions = [self.names.get(name) for name in champions]
+            champions = [
+                self.index.get(int(c)) if c is not None else None for c in champions
+            ]
+            if len(champions) == 10 and None not in champions:
+                indices[row] = champions
+        return indices
+
+    def predict(self, comps, Id=True):
+        """Calcula o win rate e o risco de várias composições de uma vez.
+
+        Args:
+            comps (list | np.ndarray): Composições com 10 campeões cada.
+            Id (bool, optional): Se as composições usam os ids dos campeões.
+
+        Returns:
+            tuple: (win_rate, risk, valid) em arrays; ``win_rate`` entre 0 e 1,
+            ``risk`` entre 0 e 100 e ``valid`` indicando as composições completas.
+        """
+        if self._scores is None:
+            self._compute_scores()
+        champion_logit, synergy, synergy_ok, counter, counter_ok = self._scores
+
+        indices = self._to_indices(comps, Id)
+        valid = (indices >= 0).all(axis=1)
+        ally, enemy = (
+            np.where(valid[:, None], indices, 0).reshape(-1, 2, 5).transpose(1, 0, 2)
+        )
+
+        score = champion_logit[ally].sum(axis=1) - champion_logit[enemy].sum(axis=1)
+        score += synergy[ally[:, PAIR_I], ally[:, PAIR_J]].sum(axis=1)
+        score -= synergy[enemy[:, PAIR_I], enemy[:, PAIR_J]].sum(axis=1)
+        positions = np.arange(len(POSITIONS))
+        score += counter[positions, ally, enemy].sum(axis=1)
+
+        known = (
+            synergy_ok[ally[:, PAIR_I], ally[:, PAIR_J]].sum(axis=1)
+            + synergy_ok[enemy[:, PAIR_I], enemy[:, PAIR_J]].sum(axis=1)
+            + counter_ok[positions, ally, enemy].sum(axis=1)
+        )
+        total = 2 * len(PAIR_I) + len(POSITIONS)
+        risk = 100 * (1 - known / total)
+
+        return _sigmoid(score), risk, valid
+
+    def get_stats_batch(self, comps, Id=True):
+        """Mesmo formato do ``LolTheoryScraper.get_stats_batch``, sem navegador."""
+        win_rate, risk, valid = self.predict(comps, Id)
+        return [
+            (
+                {
+                    "Risk Value:": f"{comp_risk:.1f}",
+                    "Win Rate:": f"{comp_win_rate * 100:.2f}%",
+                }
+                if comp_valid
+                else dict(MISSING_STATS)
+            )
+            for comp_win_rate, comp_risk, comp_valid in zip(win_rate, risk, valid)
+        ]
+
+    def get_stats(self, champions, Id=True):
+        return self.get_stats_batch([champions], Id=Id)[0]
+
+    def save(self, path=SYNERGY_FILE):
+        """Grava as contagens e as partidas já contadas num arquivo .npz."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            champion_ids=np.array(list(self.index), dtype=np.int64),
+            seen_matches=np.array(sorted(self.seen_matches), dtype=str),
+            champion_games=self.champion_games,
+            champion_wins=self.champion_wins,
+            synergy_games=self.synergy_games,
+            synergy_wins=self.synergy_wins,
+            counter_games=self.counter_games,
+            counter_wins=self.counter_wins,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=SYNERGY_FILE, **kwargs):
+        """Carrega as contagens gravadas, ou um modelo vazio se o arquivo não existir."""
+        model = cls(**kwargs)
+        if not path or not os.path.exists(path):
+            return model
+
+        stored = np.load(path)
+        model.index = {}
+        model.champion_games = np.zeros(0)
+        model.champion_wins = np.zeros(0)
+        model.synergy_games = np.zeros((0, 0))
+        model.synergy_wins = np.zeros((0, 0))
+        model.counter_games = np.zeros((len(POSITIONS), 0, 0))
+        model.counter_wins = np.zeros((len(POSITIONS), 0, 0))
+        model._grow(int(champion_id) for champion_id in stored["champion_ids"])
+        for name in (
+            "champion_games",
+            "champion_wins",
+            "synergy_games",
+            "synergy_wins",
+            "counter_games",
+            "counter_wins",
+        ):
+            setattr(model, name, stored[name])
+        model.seen_matches = set(stored["seen_matches"].tolist())
+
+        # Campeões lançados depois da gravação
+        model._load_champions()
+        return model
+
+
+if __name__ == "__main__":
+    from libs.sql_lib.storage import get_storage
+
+    model = SynergyModel.load()
+    model.update_from_storage(get_storage())
+    model.save()
+
+    champions_to_select = [
+        "Aatrox",
+        "Elise",
+        "Ekko",
+        "Caitlyn",
+        "Blitzcrank",
+        "Darius",
+        "Amumu",
+        "Ahri",
+        "Draven",
+        "Alistar",
+    ]
+    print(model.get_stats(champions_to_select, Id=False))
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from tqdm import tqdm
+
+from settings import IDENTITY_STORE_FILE
+
+
+class IdentityStore:
+    """Mapa persistente entre summonerId, puuid e riot id dos jogadores.
+
+    O vínculo entre summonerId e puuid praticamente não muda, então é obtido uma
+    única vez e gravado num arquivo JSON. As identidades vêm das entradas de liga
+    que já trazem o puuid, dos participantes das partidas coletadas e, só para os
+    ids desconhecidos, de chamadas ``summoner.by_id`` feitas em paralelo.
+    """
+
+    def __init__(self, path=IDENTITY_STORE_FILE):
+        """
+        Args:
+            path (str, optional): Arquivo JSON do mapa. Sem arquivo nada é persistido.
+        """
+        self.path = path
+        self._by_summoner = {}
+        self._by_puuid = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.resolved = 0
+        self.load()
+
+    def add(self, summonerId=None, puuid=None, riot_id=None):
+        """Registra uma identidade. Campos ausentes mantêm o valor já conhecido."""
+        if not summonerId and not puuid:
+            return
+
+        with self._lock:
+            record = dict(
+                self._by_summoner.get(summonerId) or self._by_puuid.get(puuid) or {}
+            )
+            record.update(
+                {
+                    key: value
+                    for key, value in (
+                        ("summonerId", summonerId),
+                        ("puuid", puuid),
+                        ("riotId", riot_id),
+                    )
+                    if value
+                }
+            )
+            if record.get("summonerId"):
+                self._by_summoner[record["summonerId"]] = record
+            if record.get("puuid"):
+                self._by_puuid[record["puuid"]] = record
+
+    def lookup(self, summonerId=None, puuid=None):
+        """Retorna a identidade conhecida (dict) ou None."""
+        with self._lock:
+            return self._by_summoner.get(summonerId) or self._by_puuid.get(puuid)
+
+    def puuids(self, summoner_ids):
+        """Retorna {summonerId: puuid} dos ids já conhecidos."""
+        with self._lock:
+            return {
+                summonerId: self._by_summoner[summonerId]["puuid"]
+                for summonerId in summoner_ids
+                if summonerId in self._by_summoner
+                and self._by_summoner[summonerId].get("puuid")
+            }
+
+    def resolve(self, summoner_ids, fetch, max_workers=4):
+        """Obtém o puuid dos ids informados, consultando apenas os desconhecidos.
+
+        Args:
+            summoner_ids (Iterable[str]): Ids dos invocadores.
+            fetch (callable): Função que recebe um summonerId e retorna o puuid.
+            max_workers (int, optional): Consultas simultâneas dos ids desconhecidos.
+
+        Returns:
+            dict: {summonerId: puuid}. Ids com erro na consulta ficam de fora.
+        """
+        summoner_ids = list(dict.fromkeys(summoner_ids))
+        known = self.puuids(summoner_ids)
+        unknown = [summonerId for summonerId in summoner_ids if summonerId not in known]
+        self.hits += len(known)
+
+        def fetch_one(summonerId):
+            try:
+                return summonerId, fetch(summonerId)
+            except Exception as e:
+                print(f"Erro ao obter PUUID para summonerId {summonerId}: {e}")
+                return summonerId, None
+
+        if unknown:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for summonerId, puuid in tqdm(
+                    executor.map(fetch_one, unknown),
+                    total=len(unknown),
+                    desc="Obtendo PUUIDs",
+                ):
+                    if puuid:
+                        self.add(summonerId=summonerId, puuid=puuid)
+                        known[summonerId] = puuid
+                        self.resolved += 1
+            self.save()
+
+        return known
+
+    def load(self):
+        """Carrega as identidades do arquivo, se existir."""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            for record in json.load(file):
+                self.add(
+                    record.get("summonerId"), record.get("puuid"), record.get("riotId")
+                )
+
+    def save(self):
+        """Grava as identidades no arquivo de forma atômica."""
+        if not self.path:
+            return
+
+        with self._lock:
+            records = {id(record): record for record in self._by_summoner.values()}
+            records.update({id(record): record for record in self._by_puuid.values()})
+            content = json.dumps(list(records.values()), ensure_ascii=False)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(tmp_path, self.path)
+
+    def stats(self):
+        """Retorna os contadores do mapa."""
+        return {
+            "players": len(self._by_puuid),
+            "hits": self.hits,
+            "resolved": self.resolved,
+        }
@@ -0,0 +1,123 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from tqdm import tqdm
+
+APEX_LEAGUES = {
+    "CHALLENGER": "challenger_by_queue",
+    "GRANDMASTER": "grandmaster_by_queue",
+    "MASTER": "masters_by_queue",
+}
+DIVISIONS = ["I", "II", "III", "IV"]
+
+
+class RankSnapshot:
+    """Índice em memória do ranking de soloq montado a partir das listas paginadas.
+
+    Em vez de uma chamada ``league.by_summoner`` por participante, o ranking das
+    ligas mestre+ e dos tiers paginados (ex.: Diamante e Esmeralda) é obtido uma
+    vez por coleta e indexado por summonerId e puuid.
+    """
+
+    def __init__(self, queue="RANKED_SOLO_5x5"):
+        self.queue = queue
+        self._by_summoner = {}
+        self._by_puuid = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hits = 0
+        self.misses = 0
+
+    def add_entries(self, entries, tier=None, league_id=None):
+        """Adiciona entradas de liga ao índice.
+
+        Args:
+            entries (List[dict]): Entradas retornadas pela League API.
+            tier (str, optional): Tier das entradas, quando não vier em cada entrada.
+            league_id (str, optional): Id da liga, quando não vier em cada entrada.
+        """
+        with self._lock:
+            for entry in entries:
+                rank = {
+                    "leagueId": entry.get("leagueId", league_id),
+                    "queueType": self.queue,
+                    "tier": entry.get("tier", tier),
+                    "rank": entry["rank"],
+                    "leaguePoints": entry["leaguePoints"],
+                    "wins": entry["wins"],
+                    "losses": entry["losses"],
+                    "veteran": entry["veteran"],
+                    "inactive": entry["inactive"],
+                    "freshBlood": entry["freshBlood"],
+                    "hotStreak": entry["hotStreak"],
+                }
+                if entry.get("summonerId"):
+                    self._by_summoner[entry["summonerId"]] = rank
+                if entry.get("puuid"):
+                    self._by_puuid[entry["puuid"]] = rank
+
+    def lookup(self, summonerId=None, puuid=None):
+        """Retorna o rank do jogador ou None se ele não estiver no índice."""
+        rank = self._by_summoner.get(summonerId) or self._by_puuid.get(puuid)
+        with self._lock:
+            if rank is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return rank
+
+    def __load_apex(self, request, region, tier):
+        league = request(f"league.{APEX_LEAGUES[tier]}", region, self.queue)
+        with self._lock:
+            self.calls += 1
+        self.add_entries(league["entries"], tier=tier, league_id=league.get("leagueId"))
+
+    def __load_division(self, request, region, tier, division):
+        page = 1
+        while True:
+            entries = request(
+                "league.entries", region, self.queue, tier, division, page=page
+            )
+            with self._lock:
+                self.calls += 1
+            if not entries:
+                break
+
+            self.add_entries(entries)
+            page += 1
+
+    def build(self, request, region, tiers=("DIAMOND", "EMERALD"), max_workers=4):
+        """Obtém as ligas mestre+ e as páginas dos tiers informados.
+
+        Args:
+            request (callable): Função que executa chamadas do LolWatcher pelo
+                caminho do método (ex.: ``LeagueOfLegends.request``).
+            region (str): Região dos jogadores.
+            tiers (Iterable[str], optional): Tiers paginados a incluir no índice.
+            max_workers (int, optional): Número de divisões obtidas em paralelo.
+        """
+        tasks = [(self.__load_apex, (request, region, tier)) for tier in APEX_LEAGUES]
+        tasks += [
+            (self.__load_division, (request, region, tier, division))
+            for tier in tiers
+            for division in DIVISIONS
+        ]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(task, *args) for task, args in tasks]
+            for future in tqdm(futures, desc="Obtendo ranking dos jogadores"):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Erro ao obter página do ranking: {e}")
+
+        return self
+
+    def stats(self):
+        """Retorna os contadores do índice."""
+        return {
+            "players": len(self._by_summoner),
+            "calls": self.calls,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
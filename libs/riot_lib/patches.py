@@ -0,0 +1,94 @@
+from datetime import date, datetime, time, timedelta
+
+# Data de lançamento de cada patch (versão no formato de GAME_VERSION)
+PATCH_START_DATES = {
+    "14.1": date(2024, 1, 10),
+    "14.2": date(2024, 1, 24),
+    "14.3": date(2024, 2, 7),
+    "14.4": date(2024, 2, 21),
+    "14.5": date(2024, 3, 6),
+    "14.6": date(2024, 3, 20),
+    "14.7": date(2024, 4, 3),
+    "14.8": date(2024, 4, 17),
+    "14.9": date(2024, 5, 1),
+    "14.10": date(2024, 5, 15),
+    "14.11": date(2024, 5, 29),
+    "14.12": date(2024, 6, 12),
+    "14.13": date(2024, 6, 26),
+    "14.14": date(2024, 7, 17),
+    "14.15": date(2024, 7, 31),
+    "14.16": date(2024, 8, 14),
+    "14.17": date(2024, 8, 28),
+    "14.18": date(2024, 9, 11),
+    "14.19": date(2024, 9, 25),
+    "14.20": date(2024, 10, 9),
+    "14.21": date(2024, 10, 23),
+    "14.22": date(2024, 11, 6),
+    "14.23": date(2024, 11, 20),
+    "14.24": date(2024, 12, 10),
+    "15.1": date(2025, 1, 9),
+    "15.2": date(2025, 1, 23),
+    "15.3": date(2025, 2, 5),
+    "15.4": date(2025, 2, 19),
+    "15.5": date(2025, 3, 5),
+    "15.6": date(2025, 3, 19),
+    "15.7": date(2025, 4, 2),
+    "15.8": date(2025, 4, 16),
+    "15.9": date(2025, 4, 30),
+    "15.10": date(2025, 5, 14),
+    "15.11": date(2025, 5, 28),
+    "15.12": date(2025, 6, 11),
+    "15.13": date(2025, 6, 25),
+    "15.14": date(2025, 7, 16),
+    "15.15": date(2025, 7, 30),
+    "15.16": date(2025, 8, 13),
+    "15.17": date(2025, 8, 27),
+    "15.18": date(2025, 9, 10),
+    "15.19": date(2025, 9, 24),
+    "15.20": date(2025, 10, 8),
+    "15.21": date(2025, 10, 22),
+    "15.22": date(2025, 11, 5),
+    "15.23": date(2025, 11, 19),
+    "15.24": date(2025, 12, 10),
+}
+
+
+def patch_window(game_version, max_age_days=7, margin_days=1, now=None):
+    """Calcula o intervalo de tempo das partidas de um patch.
+
+    O intervalo começa no lançamento do patch (ou há ``max_age_days`` dias, o que
+    for mais recente) e termina no lançamento do patch seguinte. Uma margem de
+    ``margin_days`` é aplicada nas duas pontas, pois o lançamento varia entre as
+    regiões; a versão exata continua sendo conferida em cada partida.
+
+    Args:
+        game_version (str): Versão do jogo (ex.: "14.20").
+        max_age_days (int, optional): Idade máxima das partidas em dias. None para ignorar.
+        margin_days (int, optional): Margem em dias aplicada nas datas do patch.
+        now (datetime, optional): Momento de referência. Padrão é agora.
+
+    Returns:
+        tuple: (start_time, end_time) em segundos desde a época. Cada ponta pode
+        ser None quando não há limite conhecido.
+    """
+    now = now or datetime.now()
+    margin = timedelta(days=margin_days)
+    start, end = None, None
+
+    if max_age_days is not None:
+        start = now - timedelta(days=max_age_days)
+
+    release = PATCH_START_DATES.get(game_version)
+    if release is not None:
+        patch_start = datetime.combine(release, time()) - margin
+        start = max(start, patch_start) if start else patch_start
+
+        next_releases = sorted(
+            other for other in PATCH_START_DATES.values() if other > release
+        )
+        if next_releases:
+            end = datetime.combine(next_releases[0], time()) + margin
+
+    start_time = int(start.timestamp()) if start else None
+    end_time = int(end.timestamp()) if end else None
+    return start_time, end_time
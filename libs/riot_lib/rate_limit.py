@@ -0,0 +1,188 @@
+import threading
+import time
+
+from riotwatcher import RateLimiter
+
+from settings import RIOT_APP_RATE_LIMIT
+
+
+def parse_rate_limit(value):
+    """Converte um cabeçalho de limite da Riot (ex.: "20:1,100:120") em pares.
+
+    Args:
+        value (str): Limites no formato "quantidade:segundos" separados por vírgula.
+
+    Returns:
+        List[tuple]: Lista de tuplas (quantidade, segundos).
+    """
+    if not value:
+        return []
+
+    limits = []
+    for item in value.split(","):
+        count, seconds = item.strip().split(":")
+        limits.append((int(count), int(seconds)))
+    return limits
+
+
+class TokenBucket:
+    """Balde de tokens para uma janela de limite da Riot.
+
+    A Riot usa janelas fixas que começam na primeira requisição. O balde é
+    reabastecido por completo quando a janela expira, o que evita o estouro que
+    um reabastecimento contínuo causaria nas janelas longas (ex.: 100:120).
+    """
+
+    def __init__(self, limit, seconds):
+        self.limit = limit
+        self.seconds = seconds
+        self.used = 0
+        self.window_start = None
+
+    def _expired(self, now):
+        return self.window_start is None or now - self.window_start >= self.seconds
+
+    def wait_time(self, now):
+        if self._expired(now) or self.used < self.limit:
+            return 0.0
+        return self.seconds - (now - self.window_start)
+
+    def consume(self, now):
+        if self._expired(now):
+            self.window_start = now
+            self.used = 0
+        self.used += 1
+
+    def sync(self, used, now):
+        """Ajusta o consumo com o valor informado pelo servidor."""
+        if self._expired(now):
+            self.window_start = now
+            self.used = 0
+        self.used = max(self.used, used)
+
+
+class RateLimitGroup:
+    """Conjunto de baldes que precisam ser respeitados ao mesmo tempo."""
+
+    def __init__(self, limits):
+        self.buckets = {
+            seconds: TokenBucket(count, seconds) for count, seconds in limits
+        }
+        self.blocked_until = 0.0
+
+    def wait_time(self, now):
+        waits = [bucket.wait_time(now) for bucket in self.buckets.values()]
+        waits.append(self.blocked_until - now)
+        return max(waits)
+
+    def consume(self, now):
+        for bucket in self.buckets.values():
+            bucket.consume(now)
+
+    def sync(self, limit_header, count_header, now):
+        """Atualiza limites e contagens a partir dos cabeçalhos da resposta."""
+        limits = parse_rate_limit(limit_header)
+        if limits:
+            current = self.buckets
+            self.buckets = {}
+            for count, seconds in limits:
+                bucket = current.get(seconds) or TokenBucket(count, seconds)
+                bucket.limit = count
+                self.buckets[seconds] = bucket
+
+        for used, seconds in parse_rate_limit(count_header):
+            if seconds in self.buckets:
+                self.buckets[seconds].sync(used, now)
+
+
+class RiotRateLimiter(RateLimiter):
+    """Limitador de requisições compartilhado entre threads para o LolWatcher.
+
+    Implementa a interface ``RateLimiter`` do riotwatcher. ``wait_until`` bloqueia
+    a thread até que os limites da aplicação e do método tenham tokens e já
+    reserva o token, de modo que várias threads nunca disputem a mesma vaga.
+    ``record_response`` lê os cabeçalhos ``X-App-Rate-Limit`` e
+    ``X-Method-Rate-Limit`` (e suas contagens) e respeita ``Retry-After`` em 429.
+    """
+
+    def __init__(self, app_limits=RIOT_APP_RATE_LIMIT, method_limits=None, margin=0.1):
+        """
+        Args:
+            app_limits (str): Limites da chave de aplicação (ex.: "20:1,100:120").
+            method_limits (dict, optional): Limites iniciais por método, no formato
+                {"MatchApiV5.by_id": "2000:10"}. Os valores são substituídos pelos
+                cabeçalhos da primeira resposta de cada método.
+            margin (float, optional): Segundos extras de espera ao fim de cada janela.
+        """
+        self.app_limits = parse_rate_limit(app_limits)
+        self.method_limits = {
+            name: parse_rate_limit(limit)
+            for name, limit in (method_limits or {}).items()
+        }
+        self.margin = margin
+        self._condition = threading.Condition()
+        self._app_groups = {}
+        self._method_groups = {}
+        self.requests = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+    def _groups(self, region, endpoint_name, method_name):
+        if region not in self._app_groups:
+            self._app_groups[region] = RateLimitGroup(self.app_limits)
+
+        method_key = (region, endpoint_name, method_name)
+        if method_key not in self._method_groups:
+            limits = self.method_limits.get(f"{endpoint_name}.{method_name}", [])
+            self._method_groups[method_key] = RateLimitGroup(limits)
+
+        return self._app_groups[region], self._method_groups[method_key]
+
+    def wait_until(self, region, endpoint_name, method_name):
+        with self._condition:
+            groups = self._groups(region, endpoint_name, method_name)
+            while True:
+                now = time.monotonic()
+                wait = max(group.wait_time(now) for group in groups)
+                if wait <= 0:
+                    for group in groups:
+                        group.consume(now)
+                    self.requests += 1
+                    return None
+
+                self.waited_seconds += wait + self.margin
+                self._condition.wait(wait + self.margin)
+
+    def record_response(self, region, endpoint_name, method_name, status, headers):
+        with self._condition:
+            app_group, method_group = self._groups(region, endpoint_name, method_name)
+            now = time.monotonic()
+            app_group.sync(
+                headers.get("X-App-Rate-Limit"),
+                headers.get("X-App-Rate-Limit-Count"),
+                now,
+            )
+            method_group.sync(
+                headers.get("X-Method-Rate-Limit"),
+                headers.get("X-Method-Rate-Limit-Count"),
+                now,
+            )
+
+            if status == 429:
+                self.throttled += 1
+                retry_after = float(headers.get("Retry-After", 1))
+                if headers.get("X-Rate-Limit-Type") == "application":
+                    group = app_group
+                else:
+                    group = method_group
+                group.blocked_until = max(group.blocked_until, now + retry_after)
+
+            self._condition.notify_all()
+
+    def stats(self):
+        """Retorna os contadores do limitador."""
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "waited_seconds": round(self.waited_seconds, 2),
+        }
@@ -0,0 +1,133 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class ReplayMissError(LookupError):
+    """Resposta ausente no armazenamento durante o modo de reprocessamento."""
+
+
+class ResponseStore:
+    """Armazenamento local e comprimido das respostas brutas da Riot API.
+
+    Cada resposta é gravada em um arquivo gzip cujo nome é o hash do endpoint e
+    dos parâmetros da chamada. Modos disponíveis:
+
+    - ``off``: não lê nem grava respostas.
+    - ``read_through``: lê do armazenamento e, na ausência, chama a API e grava.
+    - ``replay``: lê apenas do armazenamento, sem nenhuma chamada de rede.
+    """
+
+    MODES = ("off", "read_through", "replay")
+
+    def __init__(self, path=None, mode="read_through", max_age=None):
+        """
+        Args:
+            path (str, optional): Pasta do armazenamento. Sem pasta o modo é ``off``.
+            mode (str, optional): Modo de operação. Padrão é ``read_through``.
+            max_age (int, optional): Validade em segundos das respostas mutáveis
+                (históricos, maestrias e ranks). None para não expirar.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Modo '{mode}' não suportado.")
+
+        self.path = path
+        self.mode = mode if path else "off"
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _file_path(self, endpoint, params):
+        key = json.dumps([endpoint, params], sort_keys=True, default=str)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, endpoint, digest[:2], f"{digest}.json.gz")
+
+    def _read(self, file_path):
+        if not os.path.exists(file_path):
+            return None
+
+        with gzip.open(file_path, "rt", encoding="utf-8") as file:
+            return json.load(file)
+
+    def _write(self, file_path, endpoint, params, data):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        tmp_path = f"{file_path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "endpoint": endpoint,
+                    "params": params,
+                    "fetchedAt": time.time(),
+                    "data": data,
+                },
+                file,
+                default=str,
+            )
+        os.replace(tmp_path, file_path)
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def fetch(self, endpoint, params, fetch, immutable=False):
+        """Retorna a resposta armazenada ou executa ``fetch()`` e grava o resultado.
+
+        Args:
+            endpoint (str): Nome do endpoint (ex.: "match.by_id").
+            params (dict): Parâmetros da chamada, usados na chave.
+            fetch (callable): Função sem argumentos que chama a API.
+            immutable (bool, optional): Se a resposta nunca muda (ex.: partidas
+                encerradas), ela é reutilizada independente da idade.
+
+        Returns:
+            Resposta da API desserializada.
+        """
+        if self.mode == "off":
+            return fetch()
+
+        file_path = self._file_path(endpoint, params)
+        entry = self._read(file_path)
+
+        if entry is not None:
+            age = time.time() - entry["fetchedAt"]
+            if (
+                immutable
+                or self.mode == "replay"
+                or self.max_age is None
+                or age < self.max_age
+            ):
+                self._count(hit=True)
+                return entry["data"]
+
+        self._count(hit=False)
+        if self.mode == "replay":
+            raise ReplayMissError(f"Resposta não armazenada: {endpoint} {params}")
+
+        data = fetch()
+        self._write(file_path, endpoint, params, data)
+        return data
+
+    def stored_params(self, endpoint):
+        """Lista os parâmetros de todas as respostas armazenadas de um endpoint."""
+        endpoint_path = os.path.join(self.path or "", endpoint)
+        if not self.path or not os.path.isdir(endpoint_path):
+            return []
+
+        params = []
+        for root, _, files in os.walk(endpoint_path):
+            for file_name in files:
+                if file_name.endswith(".json.gz"):
+                    params.append(self._read(os.path.join(root, file_name))["params"])
+        return params
+
+    def stats(self):
+        """Retorna os contadores de leitura do armazenamento."""
+        return {"mode": self.mode, "hits": self.hits, "misses": self.misses}
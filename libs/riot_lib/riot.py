@@ -6,40 +6,168 @@ import pandas as pd
 from riotwatcher import ApiError, LolWatcher
 from tqdm import tqdm
 
-from settings import API_KEY, docs_path
+from libs.cache_lib.cache import TTLCache
+from libs.riot_lib.identity import IdentityStore
+from libs.riot_lib.ladder import RankSnapshot
+from libs.riot_lib.rate_limit import RiotRateLimiter
+from libs.riot_lib.response_store import ReplayMissError, ResponseStore
+from settings import (
+    API_KEY,
+    MASTERY_BY_CHAMPION_MAX,
+    MAX_WORKERS,
+    RANK_CACHE_FILE,
+    RANK_CACHE_TTL,
+    RANK_SNAPSHOT_TIERS,
+    RESPONSE_STORE_MAX_AGE,
+    RESPONSE_STORE_MODE,
+    RESPONSE_STORE_PATH,
+    docs_path,
+)
+
+GRADE_MAPPING = {
+    "S+": 12,
+    "S": 11,
+    "S-": 10,
+    "A+": 9,
+    "A": 8,
+    "A-": 7,
+    "B+": 6,
+    "B": 5,
+    "B-": 4,
+    "C+": 3,
+    "C": 2,
+    "C-": 1,
+    "D": 0,
+}
+REVERSE_GRADE_MAPPING = {value: grade for grade, value in GRADE_MAPPING.items()}
+MASTERY_COLUMNS = [
+    "puuid",
+    "championId",
+    "championLevel",
+    "championPoints",
+    "lastPlayTime",
+    "averageGrade",
+]
+
+
+def build_mastery_frame(mastery_champions):
+    """Monta o DataFrame de maestria a partir das entradas da Champion Mastery API.
+
+    A nota média de cada campeão é calculada de forma vetorizada: as notas de
+    ``milestoneGrades`` são explodidas em linhas, convertidas pelo GRADE_MAPPING,
+    agregadas por campeão e convertidas de volta. Campeões sem notas válidas
+    recebem "Missing".
+
+    Args:
+        mastery_champions (List[dict]): Entradas retornadas pela API.
+
+    Returns:
+        DataFrame: Colunas de MASTERY_COLUMNS, uma linha por campeão.
+    """
+    df = pd.DataFrame(mastery_champions)
+    if df.empty:
+        return pd.DataFrame(columns=MASTERY_COLUMNS)
+
+    if "milestoneGrades" not in df:
+        df["milestoneGrades"] = None
+
+    numeric_grades = df["milestoneGrades"].explode().map(GRADE_MAPPING)
+    average = numeric_grades.groupby(level=0).mean().round()
+    df["averageGrade"] = average.map(REVERSE_GRADE_MAPPING).fillna("Missing")
+    df["lastPlayTime"] = df["lastPlayTime"] / 1000
+
+    return df[MASTERY_COLUMNS]
 
 
 class LeagueOfLegends:
 
-    def __init__(self, region="BR1", queue=420):
+    def __init__(
+        self,
+        region="BR1",
+        queue=420,
+        rate_limiter=None,
+        rank_cache=None,
+        response_store=None,
+        identity=None,
+    ):
         self.region = region
         self.queue = queue
-        self.watcher = LolWatcher(API_KEY)
+        self.rate_limiter = rate_limiter or RiotRateLimiter()
+        self.rank_cache = rank_cache or TTLCache(
+            ttl=RANK_CACHE_TTL, path=RANK_CACHE_FILE
+        )
+        self.rank_snapshot = None
+        self.response_store = response_store or ResponseStore(
+            RESPONSE_STORE_PATH, RESPONSE_STORE_MODE, RESPONSE_STORE_MAX_AGE
+        )
+        self.identity = identity or IdentityStore()
+        self.watcher = LolWatcher(API_KEY, rate_limiter=self.rate_limiter)
+
+    def request(self, method, *args, immutable=False, unkeyed=(), **kwargs):
+        """Executa uma chamada do LolWatcher passando pelo armazenamento de respostas.
+
+        Args:
+            method (str): Caminho do método no LolWatcher (ex.: "match.by_id").
+            immutable (bool, optional): Se a resposta nunca muda após ser obtida.
+            unkeyed (tuple, optional): Argumentos nomeados que ficam fora da chave
+                do armazenamento (ex.: limites calculados a partir de agora).
+
+        Returns:
+            Resposta da API, obtida da rede ou do armazenamento local.
+        """
+        endpoint, name = method.split(".")
+        watcher_method = getattr(getattr(self.watcher, endpoint), name)
+        params = {
+            "args": list(args),
+            "kwargs": {
+                key: value for key, value in kwargs.items() if key not in unkeyed
+            },
+        }
+
+        return self.response_store.fetch(
+            method,
+            params,
+            lambda: watcher_method(*args, **kwargs),
+            immutable=immutable,
+        )
+
+    def stored_match_ids(self):
+        """Lista os Ids das partidas disponíveis no armazenamento de respostas."""
+        return [
+            params["args"][1]
+            for params in self.response_store.stored_params("match.by_id")
+        ]
 
     def get_puuid(self, df):
         """Obtém o puuid a partir de um DataFrame com summonerId.
 
+        Os puuids já conhecidos vêm do mapa de identidades; apenas os summonerIds
+        desconhecidos são consultados na API, em paralelo.
+
         Args:
             df (DataFrame): DataFrame com a coluna summonerId.
 
         Returns:
             DataFrame: DataFrame com as colunas summonerId e puuid.
         """
-
         summonerIds = df["summonerId"].tolist()
-        puuids = []
-        summonerIds_list = []
-
-        for summonerId in tqdm(summonerIds, desc="Obtendo PUUIDs"):
-            try:
-                summoner = self.watcher.summoner.by_id(self.region, summonerId)
-            except Exception as e:
-                print(f"Erro ao obter PUUID para summonerId {summonerId}: {e}")
-            else:
-                puuids.append(summoner["puuid"])
-                summonerIds_list.append(summonerId)
+        puuids = self.identity.resolve(
+            summonerIds,
+            lambda summonerId: self.request(
+                "summoner.by_id", self.region, summonerId, immutable=True
+            )["puuid"],
+            max_workers=MAX_WORKERS,
+        )
 
-        return pd.DataFrame({"summonerId": summonerIds_list, "puuid": puuids})
+        summonerIds_list = [
+            summonerId for summonerId in summonerIds if summonerId in puuids
+        ]
+        return pd.DataFrame(
+            {
+                "summonerId": summonerIds_list,
+                "puuid": [puuids[summonerId] for summonerId in summonerIds_list],
+            }
+        )
 
     def get_league(self, top=300, include_tag=True):
         """Obtém os X melhores jogadores em soloq.
@@ -94,6 +222,13 @@ class LeagueOfLegends:
 
         # Incluir riot_id e riot_tag se especificado
         if include_tag:
+            # Entradas de liga que já trazem o puuid dispensam a consulta do invocador
+            if "puuid" in df:
+                for summonerId, puuid in zip(df["summonerId"], df["puuid"]):
+                    if isinstance(puuid, str):
+                        self.identity.add(summonerId=summonerId, puuid=puuid)
+                df = df.drop(columns="puuid")
+
             puuid_df = self.get_puuid(df)
             df = df.merge(puuid_df, on="summonerId", how="inner")
 
@@ -132,10 +267,22 @@ class LeagueOfLegends:
 
         return df
 
-    def get_matchlist(self, puuid=None, count=100):
+    def get_matchlist(
+        self, puuid=None, count=100, start=0, start_time=None, end_time=None
+    ):
         """
         Obtém os IDs do histórico de partidas para um determinado PUUID.
 
+        Args:
+            puuid (str): PUUID do jogador.
+            count (int, optional): Número de partidas a retornar. Acima de 100 as
+                páginas são obtidas em sequência. Padrão é 100.
+            start (int, optional): Posição inicial no histórico. Padrão é 0.
+            start_time (int, optional): Início do intervalo em segundos desde a época.
+                Fica fora da chave do armazenamento de respostas, cuja validade já
+                limita a idade do histórico reutilizado.
+            end_time (int, optional): Fim do intervalo em segundos desde a época.
+
         Returns:
             List[strings]: Lista do histórico de partidas para um determinado PUUID.
         """
@@ -144,29 +291,53 @@ class LeagueOfLegends:
             print("PUUID é necessário.")
             return False
 
+        match_ids = []
         try:
-            match_ids = self.watcher.match.matchlist_by_puuid(
-                region=self.region, puuid=puuid, queue=self.queue, count=count
-            )
+            while len(match_ids) < count:
+                page_size = min(100, count - len(match_ids))
+                page = self.request(
+                    "match.matchlist_by_puuid",
+                    region=self.region,
+                    puuid=puuid,
+                    queue=self.queue,
+                    start=start + len(match_ids),
+                    count=page_size,
+                    start_time=start_time,
+                    end_time=end_time,
+                    # O início acompanha a data atual e não identifica a resposta
+                    unkeyed=("start_time",),
+                )
+                match_ids += page
+
+                if len(page) < page_size:
+                    break
+
             return match_ids
-        except ApiError as e:
+        except (ApiError, ReplayMissError) as e:
             print(f"Erro ao obter IDs do histórico de partidas: {e}")
             return False
 
-    def get_match(self, match_id):
+    def get_match(self, match_id, retries=1):
         """
         Obtém dados de uma partida específica.
+
+        Args:
+            match_id (str): Id da partida.
+            retries (int, optional): Número de novas tentativas em caso de erro. Padrão é 1.
         """
-        index_error = 0
         try:
-            match_json = self.watcher.match.by_id(self.region, match_id)
+            match_json = self.request(
+                "match.by_id", self.region, match_id, immutable=True
+            )
+        except ReplayMissError as e:
+            print(e)
+            return False, False, False
         except:
-            time.sleep(20)
-            index_error += 1
-
-            if index_error >= 2:
+            if retries <= 0:
                 return False, False, False
-            return self.get_match(match_id)  # Tenta novamente
+
+            time.sleep(20)
+            return self.get_match(match_id, retries - 1)  # Tenta novamente
 
         metadata = match_json["metadata"]
         info = match_json["info"]
@@ -259,6 +430,15 @@ class LeagueOfLegends:
             perks = player["perks"]
             challenges = player["challenges"]
             summonerId = player["summonerId"]
+            self.identity.add(
+                summonerId=summonerId,
+                puuid=participant,
+                riot_id=(
+                    f"{player['riotIdGameName']}#{player['riotIdTagline']}"
+                    if player.get("riotIdGameName")
+                    else None
+                ),
+            )
 
             # Runes
             primaryRune = [
@@ -269,11 +449,9 @@ class LeagueOfLegends:
             ]
 
             # Extra Information
-            rank = self.get_player_rank(summonerId)
+            rank = self.resolve_player_rank(summonerId, participant)
             tierRank = (
-                rank["tier"][0] + " " + rank["rank"][0]
-                if rank is not None
-                else "Missing"
+                rank["tier"] + " " + rank["rank"] if rank is not None else "Missing"
             )
 
             if index < 5:
@@ -403,57 +581,51 @@ class LeagueOfLegends:
 
         return df_match, df_team, df_player
 
-    def get_mastery_champion(self, puuid):
-        try:
-            mastery_champions = self.watcher.champion_mastery.by_puuid(
-                self.region, puuid
-            )
-
-            grade_mapping = {
-                "S+": 12,
-                "S": 11,
-                "S-": 10,
-                "A+": 9,
-                "A": 8,
-                "A-": 7,
-                "B+": 6,
-                "B": 5,
-                "B-": 4,
-                "C+": 3,
-                "C": 2,
-                "C-": 1,
-                "D": 0,
-            }
+    def get_mastery_champion(self, puuid, champion_ids=None):
+        """Obtém a maestria de campeões de um jogador.
 
-            mastery_list = []
-            for champion in mastery_champions:
-
-                reverse_mapping = {v: k for k, v in grade_mapping.items()}
-                grades = champion.get("milestoneGrades", "Missing")
-
-                if grades != "Missing":
-                    numeric_grades = [
-                        grade_mapping.get(grade)
-                        for grade in grades
-                        if grade in grade_mapping
-                    ]
-                    if not numeric_grades:
-                        grades = "Missing"
-                    else:
-                        num_average = sum(numeric_grades) / len(numeric_grades)
-                        grades = reverse_mapping[round(num_average)]
-
-                mastery_data = {
-                    "puuid": champion["puuid"],
-                    "championId": champion["championId"],
-                    "championLevel": champion["championLevel"],
-                    "championPoints": champion["championPoints"],
-                    "lastPlayTime": champion["lastPlayTime"] / 1000,
-                    "averageGrade": grades,
-                }
+        Args:
+            puuid (str): Id do jogador.
+            champion_ids (Iterable[int], optional): Campeões desejados. Com até
+                MASTERY_BY_CHAMPION_MAX campeões é feita uma chamada por campeão, que
+                retorna só a entrada pedida; acima disso a lista completa é obtida
+                numa única chamada e filtrada.
 
-                mastery_list.append(mastery_data)
-            df_mastery_champion = pd.DataFrame(mastery_list)
+        Returns:
+            DataFrame: Maestria por campeão ou None em caso de erro.
+        """
+        try:
+            if (
+                champion_ids is not None
+                and len(champion_ids) <= MASTERY_BY_CHAMPION_MAX
+            ):
+                mastery_champions = []
+                for champion_id in champion_ids:
+                    try:
+                        mastery_champions.append(
+                            self.request(
+                                "champion_mastery.by_puuid_by_champion",
+                                self.region,
+                                puuid,
+                                int(champion_id),
+                            )
+                        )
+                    except ApiError as err:
+                        # Campeão sem maestria registrada
+                        if err.response.status_code != 404:
+                            raise
+            else:
+                mastery_champions = self.request(
+                    "champion_mastery.by_puuid", self.region, puuid
+                )
+
+            df_mastery_champion = build_mastery_frame(mastery_champions)
+            if champion_ids is not None:
+                df_mastery_champion = df_mastery_champion[
+                    df_mastery_champion["championId"].isin(
+                        [int(champion_id) for champion_id in champion_ids]
+                    )
+                ].reset_index(drop=True)
             return df_mastery_champion
 
         except ApiError as err:
@@ -465,42 +637,77 @@ class LeagueOfLegends:
                 print(f"Ocorreu um erro: {err}")
 
     def get_player_rank(self, summonerId):
-        try:
-            all_rank = self.watcher.league.by_summoner(self.region, summonerId)
+        """Obtém o rank de soloq de um jogador, reutilizando o cache da execução.
+
+        Args:
+            summonerId (str): Id do invocador.
+
+        Returns:
+            DataFrame: Rank do jogador ou None se não houver rank de soloq.
+        """
+        rank_dict = self.__cached_player_rank(summonerId)
 
-            if len(all_rank) == 0:
-                return None
+        if rank_dict is None:
+            return None
 
-            player_rank = None
+        return pd.DataFrame([rank_dict])
 
-            for index, rank in enumerate(all_rank):
-                index += 1
-                if rank["queueType"] == "RANKED_SOLO_5x5":
-                    player_rank = rank
-                    break
+    def load_rank_snapshot(self, tiers=RANK_SNAPSHOT_TIERS, max_workers=MAX_WORKERS):
+        """Monta o índice de ranks a partir das listas paginadas da League API.
 
-                if index == len(all_rank):
-                    return None
-
-            rank_dict = {
-                "leagueId": player_rank["leagueId"],
-                "queueType": player_rank["queueType"],
-                "tier": player_rank["tier"],
-                "rank": player_rank["rank"],
-                "leaguePoints": player_rank["leaguePoints"],
-                "wins": player_rank["wins"],
-                "losses": player_rank["losses"],
-                "veteran": player_rank["veteran"],
-                "inactive": player_rank["inactive"],
-                "freshBlood": player_rank["freshBlood"],
-                "hotStreak": player_rank["hotStreak"],
-            }
+        Args:
+            tiers (Iterable[str], optional): Tiers paginados a incluir além de mestre+.
+            max_workers (int, optional): Número de páginas obtidas em paralelo.
+        """
+        self.rank_snapshot = RankSnapshot().build(
+            self.request, self.region, tiers=tiers, max_workers=max_workers
+        )
+        return self.rank_snapshot
+
+    def resolve_player_rank(self, summonerId, puuid=None):
+        """Obtém o rank pelo índice de ranks e, se ausente, pela chamada individual.
 
-            df_rank = pd.DataFrame([rank_dict])
+        Args:
+            summonerId (str): Id do invocador.
+            puuid (str, optional): PUUID do jogador.
+
+        Returns:
+            dict: Rank de soloq do jogador ou None.
+        """
+        if self.rank_snapshot is not None:
+            rank_dict = self.rank_snapshot.lookup(summonerId, puuid)
+            if rank_dict is not None:
+                return rank_dict
 
-            return df_rank
+        return self.__cached_player_rank(summonerId)
+
+    def __cached_player_rank(self, summonerId):
+        try:
+            return self.rank_cache.get_or_fetch(summonerId, self.__fetch_player_rank)
         except Exception as e:
             print(e)
+            return None
+
+    def __fetch_player_rank(self, summonerId):
+        all_rank = self.request("league.by_summoner", self.region, summonerId)
+
+        for rank in all_rank:
+            if rank["queueType"] == "RANKED_SOLO_5x5":
+                return {
+                    "leagueId": rank["leagueId"],
+                    "queueType": rank["queueType"],
+                    "tier": rank["tier"],
+                    "rank": rank["rank"],
+                    "leaguePoints": rank["leaguePoints"],
+                    "wins": rank["wins"],
+                    "losses": rank["losses"],
+                    "veteran": rank["veteran"],
+                    "inactive": rank["inactive"],
+                    "freshBlood": rank["freshBlood"],
+                    "hotStreak": rank["hotStreak"],
+                }
+
+        return None
 
     def get_data_dragon_json(
         self, version: str = "latest", data_type: str = "champion"
@@ -0,0 +1,386 @@
+import threading
+import time
+
+import pandas as pd
+
+from libs.sql_lib.sql import build_where_clause
+from libs.sql_lib.storage import StorageBackend
+from settings import DUCKDB_PATH
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - dependência opcional
+    duckdb = None
+
+
+def quote(name: str) -> str:
+    """Delimita o nome de uma tabela ou coluna no padrão do DuckDB."""
+    return '"{}"'.format(str(name).replace('"', '""'))
+
+
+# Tipos DuckDB usados para cada tipo de coluna do DataFrame
+DTYPE_MAPPING = {
+    "int64": "BIGINT",
+    "int32": "INTEGER",
+    "float64": "DOUBLE",
+    "object": "VARCHAR",
+    "datetime64[ns]": "TIMESTAMP",
+    "bool": "BOOLEAN",
+}
+
+
+def column_definitions(df: pd.DataFrame, columns) -> list:
+    """Retorna '"coluna" TIPO' para as colunas informadas do DataFrame."""
+    return [
+        f"{quote(column)} {DTYPE_MAPPING.get(str(df[column].dtype), 'VARCHAR')}"
+        for column in columns
+    ]
+
+
+class DuckDBClient(StorageBackend):
+    """Armazenamento embarcado e colunar em um único arquivo DuckDB.
+
+    Oferece a mesma interface do ``SQLClient`` sem depender de um servidor. As
+    inserções usam o ``append`` nativo do DuckDB, que lê o DataFrame diretamente
+    sem converter linha a linha, e as atualizações usam o DataFrame registrado
+    como tabela num único UPDATE ... FROM.
+    """
+
+    def __init__(self, database=DUCKDB_PATH):
+        """
+        Args:
+            database (str, optional): Arquivo do banco. ":memory:" para usar só a memória.
+        """
+        if duckdb is None:
+            raise ImportError("O pacote duckdb é necessário para usar o DuckDBClient.")
+
+        self.database = database
+        self.conn = duckdb.connect(database)
+        self._lock = threading.Lock()
+
+    def cursor(self):
+        """Retorna uma conexão própria para a thread atual sobre o mesmo banco."""
+        with self._lock:
+            return self.conn.cursor()
+
+    def insert_dataframe(
+        self, df: pd.DataFrame, table_name: str, primary_key: str = None, **kwargs
+    ):
+        """
+        Insere os dados de um DataFrame em uma tabela DuckDB.
+        Se a tabela não existir, cria a tabela antes da inserção.
+
+        Args:
+            df (pd.Dataframe): DataFrame com os dados a serem inseridos.
+            table_name (str): Nome da tabela a ter os dados inseridos.
+            primary_key (str): Nome da coluna definida como chave primária (opcional).
+
+        Return:
+            dict: Quantidade de linhas, duração e linhas por segundo da inserção.
+        """
+        if not self.table_exists(table_name):
+            self.create_table(df, table_name, primary_key)
+
+        start = time.perf_counter()
+        try:
+            cursor = self.cursor()
+            try:
+                cursor.append(table_name, df, by_name=True)
+            finally:
+                cursor.close()
+        except Exception as e:
+            print(f"Erro ao inserir dados: {e}")
+
+        seconds = time.perf_counter() - start
+        return {
+            "mode": "append",
+            "rows": len(df),
+            "seconds": round(seconds, 4),
+            "rows_per_second": round(len(df) / seconds, 1) if seconds else None,
+        }
+
+    def insert_dataframes(self, frames: list):
+        """
+        Insere vários DataFrames numa única transação, criando as tabelas ausentes.
+        Diferente de ``insert_dataframe``, erros são propagados e nada é gravado.
+
+        Args:
+            frames (list): Tuplas (df, table_name, primary_key).
+        """
+        for df, table_name, primary_key in frames:
+            if not self.table_exists(table_name):
+                self.create_table(df, table_name, primary_key)
+
+        cursor = self.cursor()
+        try:
+            cursor.begin()
+            try:
+                for df, table_name, _ in frames:
+                    cursor.append(table_name, df, by_name=True)
+                cursor.commit()
+            except Exception:
+                cursor.rollback()
+                raise
+        finally:
+            cursor.close()
+
+    def get_data(
+        self,
+        table_name: str,
+        columns="*",
+        where=None,
+        params=None,
+        chunksize: int = None,
+        dtypes: dict = None,
+    ):
+        """
+        Retorna os dados de uma tabela DuckDB.
+
+        Args:
+            table_name (str): Nome da tabela a ser obtida.
+            columns (str | list): Nome das colunas a serem obtidas.
+            where (str | dict): Filtro das linhas, como em ``SQLClient.get_data``.
+            params (list): Valores dos parâmetros quando ``where`` é um texto.
+            chunksize (int): Se informado, retorna um iterador de DataFrames.
+            dtypes (dict): Tipos das colunas do resultado.
+
+        Return
+            pd.Dataframe: Dataframe da tabela e colunas informadas (ou um iterador de
+            DataFrames quando ``chunksize`` é informado).
+        """
+        if isinstance(columns, (list, tuple)):
+            columns = ", ".join([quote(col) for col in columns])
+
+        query_params = list(params or [])
+        if isinstance(where, dict):
+            where, query_params = build_where_clause(where, quote='"{}"')
+
+        sql_query = f"SELECT {columns} FROM {quote(table_name)}"
+        if where:
+            sql_query += f" WHERE {where}"
+
+        if chunksize:
+            return self.__iter_data(sql_query, query_params, chunksize, dtypes)
+
+        cursor = self.cursor()
+        try:
+            df = cursor.execute(sql_query, query_params).df()
+        finally:
+            cursor.close()
+        return df.astype(dtypes) if dtypes else df
+
+    def __iter_data(self, sql_query: str, query_params: list, chunksize: int, dtypes):
+        """Lê o resultado da consulta em blocos de ``chunksize`` linhas."""
+        cursor = self.cursor()
+        try:
+            cursor.execute(sql_query, query_params)
+            columns = [column[0] for column in cursor.description]
+
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+
+                df = pd.DataFrame(rows, columns=columns)
+                yield df.astype(dtypes) if dtypes else df
+        finally:
+            cursor.close()
+
+    def create_table(self, df: pd.DataFrame, table_name: str, primary_key: str = None):
+        """
+        Cria uma tabela DuckDB com base nas colunas e tipos de dados do DataFrame.
+
+        Args:
+            df (pd.Dataframe): DataFrame cujas colunas e tipos serão usados na tabela.
+            table_name (str): Nome da tabela a ser criada.
+            primary_key (str | list): Coluna(s) da chave primária (opcional).
+        """
+        columns_with_types = column_definitions(df, df.columns)
+
+        if primary_key:
+            keys = primary_key if isinstance(primary_key, list) else [primary_key]
+            columns_with_types.append(
+                f"PRIMARY KEY ({', '.join([quote(key) for key in keys])})"
+            )
+
+        sql_query = (
+            f"CREATE TABLE IF NOT EXISTS {quote(table_name)} "
+            f"({', '.join(columns_with_types)})"
+        )
+
+        try:
+            self.__execute(sql_query)
+        except Exception as e:
+            print(f"Erro ao criar a tabela {table_name}: {e}")
+
+    def drop_table(self, table_name: str):
+        """
+        Exclui uma tabela do banco DuckDB, se existir.
+
+        Args:
+            table_name (str): Nome da tabela a ser excluída.
+        """
+        try:
+            self.__execute(f"DROP TABLE IF EXISTS {quote(table_name)}")
+        except Exception as e:
+            print(f"Erro ao excluir a tabela {table_name}: {e}")
+
+    def update_data(
+        self, df: pd.DataFrame, table_name: str, match_columns: list, **kwargs
+    ):
+        """
+        Atualiza a tabela com os valores do DataFrame num único UPDATE ... FROM.
+
+        Args:
+            df (pd.Dataframe): DataFrame contendo os dados a serem atualizados.
+            table_name (str): Nome da tabela onde os dados serão atualizados.
+            match_columns (list): Colunas usadas para identificar as linhas.
+        """
+        update_clause = ", ".join(
+            [
+                f"{quote(col)} = source.{quote(col)}"
+                for col in df.columns
+                if col not in match_columns
+            ]
+        )
+        match_condition = " AND ".join(
+            [f"target.{quote(col)} = source.{quote(col)}" for col in match_columns]
+        )
+        sql_query = (
+            f"UPDATE {quote(table_name)} AS target SET {update_clause} "
+            f"FROM df_source AS source WHERE {match_condition}"
+        )
+
+        try:
+            self.__execute_with_frame(df, sql_query)
+        except Exception as e:
+            print(f"Erro ao atualizar dados na tabela {table_name}: {e}")
+
+    def upsert_data(
+        self, df: pd.DataFrame, table_name: str, match_columns: list, **kwargs
+    ):
+        """
+        Substitui as linhas existentes e insere as novas numa única transação.
+        Se a tabela não existir, cria a tabela usando as colunas de match como chave primária.
+
+        Args:
+            df (pd.Dataframe): DataFrame contendo os dados a serem gravados.
+            table_name (str): Nome da tabela de destino.
+            match_columns (list): Lista de colunas usadas para identificar a linha.
+        """
+        self.prepare_upsert(df, table_name, match_columns)
+
+        match_condition = " AND ".join(
+            [f"target.{quote(col)} = source.{quote(col)}" for col in match_columns]
+        )
+        columns = ", ".join([quote(col) for col in df.columns])
+
+        try:
+            self.__execute_with_frame(
+                df,
+                f"DELETE FROM {quote(table_name)} AS target "
+                f"USING df_source AS source WHERE {match_condition}",
+                f"INSERT INTO {quote(table_name)} ({columns}) "
+                f"SELECT {columns} FROM df_source",
+            )
+        except Exception as e:
+            print(f"Erro ao atualizar dados na tabela {table_name}: {e}")
+
+    def table_columns(self, table_name: str) -> list:
+        """
+        Retorna os nomes das colunas de uma tabela do banco DuckDB.
+
+        Args:
+            table_name (str): Nome da tabela.
+        """
+        cursor = self.cursor()
+        try:
+            rows = cursor.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = ?",
+                [table_name],
+            ).fetchall()
+        finally:
+            cursor.close()
+        return [row[0] for row in rows]
+
+    def add_columns(self, df: pd.DataFrame, table_name: str, columns: list):
+        """
+        Acrescenta colunas à tabela com os tipos das colunas do DataFrame.
+
+        Args:
+            df (pd.Dataframe): DataFrame com as colunas a acrescentar.
+            table_name (str): Nome da tabela.
+            columns (list): Colunas do DataFrame ausentes na tabela.
+        """
+        # O DuckDB acrescenta uma coluna por comando
+        try:
+            for definition in column_definitions(df, columns):
+                self.__execute(
+                    f"ALTER TABLE {quote(table_name)} ADD COLUMN {definition}"
+                )
+        except Exception as e:
+            print(f"Erro ao acrescentar colunas na tabela {table_name}: {e}")
+
+    def table_exists(self, table_name: str) -> bool:
+        """
+        Verifica se uma tabela existe no banco DuckDB.
+
+        Args:
+            table_name (str): Nome da tabela a ser verificada.
+
+        Return:
+            True se a tabela existir, False caso contrário.
+        """
+        cursor = self.cursor()
+        try:
+            result = cursor.execute(
+                "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+                [table_name],
+            ).fetchone()[0]
+        finally:
+            cursor.close()
+        return result > 0
+
+    def __execute(self, sql_query: str):
+        cursor = self.cursor()
+        try:
+            cursor.execute(sql_query)
+        finally:
+            cursor.close()
+
+    def __execute_with_frame(self, df: pd.DataFrame, *sql_queries: str):
+        """Executa as consultas numa transação com o DataFrame visível como df_source."""
+        cursor = self.cursor()
+        try:
+            cursor.register("df_source", df)
+            cursor.begin()
+            try:
+                for sql_query in sql_queries:
+                    cursor.execute(sql_query)
+                cursor.commit()
+            except Exception:
+                cursor.rollback()
+                raise
+        finally:
+            cursor.close()
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    df_bench = pd.DataFrame(
+        {
+            "id": range(100000),
+            "name": ["Alice", "Bob", "Charlie", "Diana"] * 25000,
+            "age": [25, 30, 35, 40] * 25000,
+            "active": [True, False] * 50000,
+        }
+    )
+
+    storage = DuckDBClient(":memory:")
+    print(storage.insert_dataframe(df_bench, "TesteInsercao", "id"))
+
+    df_bench["age"] = df_bench["age"] + 1
+    storage.update_data(df_bench[["id", "age"]], "TesteInsercao", ["id"])
+    print(storage.get_data("TesteInsercao", ["age"], where={"id": [0, 1]}))
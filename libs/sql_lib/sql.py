@@ -1,34 +1,121 @@
+import csv
 import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
 
 import pandas as pd
-import pyodbc
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine
 from sqlalchemy.engine.url import URL
 
+from libs.sql_lib.storage import StorageBackend
 from settings import (
+    BULK_INSERT_PATH,
     DATABASE,
     DRIVER,
+    INSERT_CHUNK_SIZE,
     PASSWORD_SQL,
     SERVER,
+    SQL_MAX_OVERFLOW,
+    SQL_POOL_RECYCLE,
+    SQL_POOL_SIZE,
     TRUSTED_CONNECTION,
     USER_SQL,
     queries_path,
 )
 
 
-class SQLClient:
+@lru_cache(maxsize=None)
+def read_query(file_name: str) -> str:
+    """Lê (uma única vez) um arquivo de consulta da pasta de queries."""
+    sql_file = os.path.join(queries_path, file_name)
+    with open(sql_file, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def dataframe_to_rows(df: pd.DataFrame) -> list:
+    """Converte um DataFrame em linhas com tipos nativos do Python.
+
+    Valores ausentes viram None e datas viram ``datetime``, sem montar uma tupla
+    por linha com ``iterrows``.
+    """
+    df = df.copy()
+    for column in df.select_dtypes(include=["datetime64[ns]"]).columns:
+        df[column] = pd.Series(
+            df[column].dt.to_pydatetime(), index=df.index, dtype=object
+        )
+    return df.astype(object).where(df.notna(), None).to_numpy().tolist()
+
+
+# Tipos SQL Server usados para cada tipo de coluna do DataFrame
+DTYPE_MAPPING = {
+    "int64": "INTEGER",
+    "float64": "FLOAT",
+    "object": "NVARCHAR(255)",
+    "datetime64[ns]": "DATETIME",
+    "bool": "BIT",
+}
+
+
+def column_definitions(df: pd.DataFrame, columns) -> list:
+    """Retorna "[coluna] TIPO" para as colunas informadas do DataFrame."""
+    return [
+        f"[{column}] {DTYPE_MAPPING.get(str(df[column].dtype), 'NVARCHAR(255)')}"
+        for column in columns
+    ]
+
+
+def build_where_clause(conditions: dict, quote: str = "[{}]"):
+    """Monta um predicado WHERE parametrizado a partir de {coluna: valor}.
+
+    Args:
+        conditions (dict): Valores por coluna. None vira IS NULL e listas viram IN.
+        quote (str): Formato usado para delimitar o nome das colunas.
+
+    Returns:
+        tuple: Predicado com "?" e a lista de valores dos parâmetros.
+    """
+    clauses, params = [], []
+    for column, value in conditions.items():
+        if value is None:
+            clauses.append(f"{quote.format(column)} IS NULL")
+        elif isinstance(value, (list, tuple, set)):
+            values = list(value)
+            placeholders = ", ".join(["?"] * len(values))
+            clauses.append(f"{quote.format(column)} IN ({placeholders})")
+            params.extend(values)
+        else:
+            clauses.append(f"{quote.format(column)} = ?")
+            params.append(value)
+    return " AND ".join(clauses), params
+
+
+class SQLClient(StorageBackend):
     def __init__(
-        self, use_sqlalchemy=True, driver=DRIVER, server=SERVER, database=DATABASE
+        self,
+        use_sqlalchemy=True,
+        driver=DRIVER,
+        server=SERVER,
+        database=DATABASE,
+        pool_size=SQL_POOL_SIZE,
+        max_overflow=SQL_MAX_OVERFLOW,
     ):
         self.use_sqlalchemy = use_sqlalchemy
         self.driver = driver
         self.server = server
         self.database = database
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
         self.engine = self.__database_connect()
 
     def __database_connect(self):
         """
-        Cria uma conexão com o banco de dados SQL Server usando autenticação do Windows.
+        Cria o pool de conexões com o banco de dados SQL Server.
+
+        As conexões são reaproveitadas entre chamadas e threads, validadas antes
+        do uso (pre-ping) e recicladas após SQL_POOL_RECYCLE segundos.
         """
 
         if TRUSTED_CONNECTION == "yes":
@@ -42,16 +129,53 @@ class SQLClient:
                 f"UID={USER_SQL};PWD={PASSWORD_SQL}"
             )
 
-        if self.use_sqlalchemy:
-            conn_url = URL.create(
-                "mssql+pyodbc", query={"odbc_connect": connection_string}
-            )
-            return create_engine(conn_url)
-        else:
-            return pyodbc.connect(connection_string)
+        conn_url = URL.create("mssql+pyodbc", query={"odbc_connect": connection_string})
+        return create_engine(
+            conn_url,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=SQL_POOL_RECYCLE,
+            fast_executemany=True,
+        )
+
+    @contextmanager
+    def connection(self):
+        """Empresta uma conexão do pool e a devolve ao final do bloco."""
+        conn = self.engine.raw_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self, commit=True):
+        """Abre um cursor numa conexão do pool dentro de uma transação.
+
+        Confirma a transação ao final do bloco ou desfaz em caso de erro.
+
+        Args:
+            commit (bool, optional): Se deve confirmar a transação. Padrão é True.
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                if commit:
+                    conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
 
     def insert_dataframe(
-        self, df: pd.DataFrame, table_name: str, primary_key: str = None
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        primary_key: str = None,
+        mode: str = "executemany",
+        chunk_size: int = INSERT_CHUNK_SIZE,
     ):
         """
         Insere os dados de um DataFrame em uma tabela SQL Server.
@@ -61,64 +185,169 @@ class SQLClient:
             df (pd.Dataframe): DataFrame cujas colunas e tipos de dados serão usados para inserir na tabela.
             table_name (str): Nome da tabela a ter os dados inseridos.
             primary_key (str): Nome da coluna definida como chave primária (opcional).
+            mode (str): Forma de inserção: "executemany" (lotes com fast_executemany),
+                "bulk" (BULK INSERT a partir de um CSV em BULK_INSERT_PATH) ou "row"
+                (uma instrução por linha).
+            chunk_size (int): Quantidade de linhas enviadas por lote no modo "executemany".
+
+        Return:
+            dict: Quantidade de linhas, duração e linhas por segundo da inserção.
         """
 
         if not self.table_exists(table_name):
             self.create_table(df, table_name, primary_key)
 
+        start = time.perf_counter()
         try:
-            conn = self.engine
-            if self.use_sqlalchemy:
-                cursor = conn.raw_connection().cursor()
-            else:
-                cursor = conn.cursor()
+            with self.transaction() as cursor:
+                self._insert_rows(cursor, df, table_name, mode, chunk_size)
+        except Exception as e:
+            print(f"Erro ao inserir dados: {e}")
+
+        seconds = time.perf_counter() - start
+        return {
+            "mode": mode,
+            "rows": len(df),
+            "seconds": round(seconds, 4),
+            "rows_per_second": round(len(df) / seconds, 1) if seconds else None,
+        }
 
-            columns = ", ".join([f"[{col}]" for col in df.columns])
-            values_placeholders = ", ".join(["?"] * len(df.columns))
+    def insert_dataframes(self, frames: list, mode: str = "executemany"):
+        """
+        Insere vários DataFrames numa única transação, criando as tabelas ausentes.
+        Diferente de ``insert_dataframe``, erros são propagados e nada é gravado.
 
-            sql_file = os.path.join(queries_path, "insert_data.sql")
-            with open(sql_file, "r", encoding="utf-8") as file:
-                sql_query = file.read()
+        Args:
+            frames (list): Tuplas (df, table_name, primary_key).
+            mode (str): Forma de inserção, como em ``insert_dataframe``.
+        """
+        for df, table_name, primary_key in frames:
+            if not self.table_exists(table_name):
+                self.create_table(df, table_name, primary_key)
+
+        with self.transaction() as cursor:
+            for df, table_name, _ in frames:
+                self._insert_rows(cursor, df, table_name, mode)
+
+    def _insert_rows(
+        self,
+        cursor,
+        df: pd.DataFrame,
+        table_name: str,
+        mode: str = "executemany",
+        chunk_size: int = INSERT_CHUNK_SIZE,
+    ):
+        """Insere as linhas do DataFrame usando o cursor (e a transação) informado."""
+        if mode == "bulk":
+            self.__bulk_insert(cursor, df, table_name)
+            return
+
+        columns = ", ".join([f"[{col}]" for col in df.columns])
+        values_placeholders = ", ".join(["?"] * len(df.columns))
+        sql_query = read_query("insert_data.sql").format(
+            table_name, columns, values_placeholders
+        )
+        rows = dataframe_to_rows(df)
 
-            for _, row in df.iterrows():
-                cursor.execute(
-                    sql_query.format(table_name, columns, values_placeholders),
-                    tuple(row),
-                )
+        if mode == "row":
+            for row in rows:
+                cursor.execute(sql_query, row)
+        else:
+            cursor.fast_executemany = True
+            for index in range(0, len(rows), chunk_size):
+                cursor.executemany(sql_query, rows[index : index + chunk_size])
 
-            conn.commit()
+    def __bulk_insert(self, cursor, df: pd.DataFrame, table_name: str):
+        """Grava o DataFrame em CSV numa pasta compartilhada e executa BULK INSERT.
 
-        except Exception as e:
-            print(f"Erro ao inserir dados: {e}")
-        finally:
-            cursor.close()
+        A pasta de BULK_INSERT_PATH precisa estar acessível pelo servidor SQL.
+        """
+        directory = BULK_INSERT_PATH or tempfile.gettempdir()
+        file_path = os.path.join(directory, f"{table_name}_{uuid.uuid4().hex}.csv")
 
-    def get_data(self, table_name: str, columns: str):
+        try:
+            bool_columns = df.select_dtypes(include=["bool"]).columns
+            df = df.astype({column: "int64" for column in bool_columns})
+            df.to_csv(
+                file_path,
+                index=False,
+                encoding="utf-8",
+                quoting=csv.QUOTE_MINIMAL,
+                lineterminator="\n",
+            )
+            cursor.execute(read_query("bulk_insert.sql").format(table_name, file_path))
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def get_data(
+        self,
+        table_name: str,
+        columns="*",
+        where=None,
+        params=None,
+        chunksize: int = None,
+        dtypes: dict = None,
+    ):
         """
         Retorna os dados de uma tabela SQL Server.
 
         Args:
             table_name (str): Nome da tabela a ser obtida.
-            columns (str): Nome das colunas a serem obtidas.
+            columns (str | list): Nome das colunas a serem obtidas.
+            where (str | dict): Filtro das linhas. Um dicionário {coluna: valor} gera
+                "[coluna] = ?" (None vira IS NULL e listas viram IN). Um texto é usado
+                como predicado, com os valores de ``params`` nos "?".
+            params (list): Valores dos parâmetros quando ``where`` é um texto.
+            chunksize (int): Se informado, retorna um iterador de DataFrames com até
+                ``chunksize`` linhas cada, lidos com fetchmany.
+            dtypes (dict): Tipos das colunas do resultado, aplicados em cada bloco.
 
         Return
-            pd.Dataframe: Dataframe da tabela e colunas informadas.
+            pd.Dataframe: Dataframe da tabela e colunas informadas (ou um iterador de
+            DataFrames quando ``chunksize`` é informado).
         """
-        sql_file = os.path.join(queries_path, "get_data.sql")
-        with open(sql_file, "r", encoding="utf-8") as file:
-            sql_query = file.read()
+        if isinstance(columns, (list, tuple)):
+            columns = ", ".join([f"[{col}]" for col in columns])
 
-        if self.use_sqlalchemy:
-            df = pd.read_sql(sql_query.format(columns, table_name), self.engine)
-        else:
-            conn = self.engine
-            cursor = conn.cursor()
-            cursor.execute(sql_query.format(columns, table_name))
-            df = pd.DataFrame(
-                cursor.fetchall(), columns=[column[0] for column in cursor.description]
+        query_params = list(params or [])
+        if isinstance(where, dict):
+            where, query_params = build_where_clause(where)
+
+        if where:
+            sql_query = read_query("get_data_where.sql").format(
+                columns, table_name, where
             )
-            cursor.close()
-        return df
+        else:
+            sql_query = read_query("get_data.sql").format(columns, table_name)
+
+        if chunksize:
+            return self.__iter_data(sql_query, query_params, chunksize, dtypes)
+
+        if self.use_sqlalchemy and not query_params:
+            df = pd.read_sql(sql_query, self.engine)
+        else:
+            with self.transaction(commit=False) as cursor:
+                cursor.execute(sql_query, query_params)
+                df = pd.DataFrame(
+                    [tuple(row) for row in cursor.fetchall()],
+                    columns=[column[0] for column in cursor.description],
+                )
+        return df.astype(dtypes) if dtypes else df
+
+    def __iter_data(self, sql_query: str, query_params: list, chunksize: int, dtypes):
+        """Lê o resultado da consulta em blocos de ``chunksize`` linhas."""
+        with self.transaction(commit=False) as cursor:
+            cursor.execute(sql_query, query_params)
+            columns = [column[0] for column in cursor.description]
+
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+
+                df = pd.DataFrame([tuple(row) for row in rows], columns=columns)
+                yield df.astype(dtypes) if dtypes else df
 
     def create_table(self, df: pd.DataFrame, table_name: str, primary_key: str = None):
         """
@@ -131,22 +360,8 @@ class SQLClient:
             primary_key (str): Nome da coluna a ser definida como chave primária (opcional).
         """
 
-        if self.use_sqlalchemy:
-            print("Não é possível criar uma tabela com o SQLAlchemy")
-
         # Definindo os tipos de dados SQL com base no DataFrame
-        dtype_mapping = {
-            "int64": "INTEGER",
-            "float64": "FLOAT",
-            "object": "NVARCHAR(255)",
-            "datetime64[ns]": "DATETIME",
-            "bool": "BIT",
-        }
-
-        columns_with_types = []
-        for column, dtype in zip(df.columns, df.dtypes):
-            sql_type = dtype_mapping.get(str(dtype), "NVARCHAR(255)")
-            columns_with_types.append(f"[{column}] {sql_type}")
+        columns_with_types = column_definitions(df, df.columns)
 
         columns_with_types_str = ", ".join(columns_with_types)
 
@@ -158,16 +373,12 @@ class SQLClient:
             columns_with_types_str += f", PRIMARY KEY ({primary_key_str})"
 
         # Construindo a consulta SQL para criar a tabela
-        sql_file = os.path.join(queries_path, "create_table.sql")
-        with open(sql_file, "r", encoding="utf-8") as file:
-            sql_query = file.read()
+        sql_query = read_query("create_table.sql")
 
         try:
             # Conectando ao banco de dados e executando a consulta
-            with self.engine as conn:
-                cursor = conn.cursor()
+            with self.transaction() as cursor:
                 cursor.execute(sql_query.format(table_name, columns_with_types_str))
-                conn.commit()
         except Exception as e:
             print(f"Erro ao criar a tabela {table_name}: {e}")
 
@@ -178,68 +389,168 @@ class SQLClient:
         Args:
             table_name (str): Nome da tabela a ser excluída.
         """
-        sql_file = os.path.join(queries_path, "drop_table.sql")
-        with open(sql_file, "r", encoding="utf-8") as file:
-            sql_query = file.read()
+        sql_query = read_query("drop_table.sql")
 
         try:
-            conn = self.engine
-            if self.use_sqlalchemy:
-                cursor = conn.raw_connection().cursor()
-            else:
-                cursor = conn.cursor()
-
-            cursor.execute(sql_query.format(table_name))
-            conn.commit()
-
+            with self.transaction() as cursor:
+                cursor.execute(sql_query.format(table_name))
         except Exception as e:
             print(f"Erro ao excluir a tabela {table_name}: {e}")
-        finally:
-            cursor.close()
 
-    def update_data(self, df: pd.DataFrame, table_name: str, match_columns: list):
+    def update_data(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        match_columns: list,
+        mode: str = "merge",
+        chunk_size: int = INSERT_CHUNK_SIZE,
+    ):
         """
         Atualiza os dados de uma tabela SQL Server com base nos valores do DataFrame e colunas de match.
 
+        No modo "merge" os dados são carregados em lote numa tabela temporária e
+        aplicados com um único MERGE, em vez de um UPDATE por linha.
+
         Args:
             df (pd.Dataframe): DataFrame contendo os dados a serem atualizados.
             table_name (str): Nome da tabela onde os dados serão atualizados.
             match_columns (list): Lista de colunas usadas para verificar duplicidade (condição de match).
+            mode (str): "merge" (tabela temporária + MERGE) ou "row" (um UPDATE por linha).
+            chunk_size (int): Quantidade de linhas enviadas por lote para a tabela temporária.
         """
+        if mode == "merge":
+            self.__merge_dataframe(
+                df, table_name, match_columns, "merge_update.sql", chunk_size
+            )
+            return
+
         # Monta a query de atualização
         update_clause = ", ".join(
             [f"[{col}] = ?" for col in df.columns if col not in match_columns]
         )
         match_condition = " AND ".join([f"[{col}] = ?" for col in match_columns])
 
-        sql_file = os.path.join(queries_path, "update_data.sql")
-        with open(sql_file, "r", encoding="utf-8") as file:
-            sql_query = file.read()
+        sql_query = read_query("update_data.sql")
 
         try:
-            conn = self.engine
-            if self.use_sqlalchemy:
-                cursor = conn.raw_connection().cursor()
-            else:
-                cursor = conn.cursor()
-
-            # Executa o update para cada linha do DataFrame
-            for _, row in df.iterrows():
-                update_values = [
-                    row[col] for col in df.columns if col not in match_columns
-                ]
-                match_values = [row[col] for col in match_columns]
+            with self.transaction() as cursor:
+                # Executa o update para cada linha do DataFrame
+                for _, row in df.iterrows():
+                    update_values = [
+                        row[col] for col in df.columns if col not in match_columns
+                    ]
+                    match_values = [row[col] for col in match_columns]
+                    cursor.execute(
+                        sql_query.format(table_name, update_clause, match_condition),
+                        tuple(update_values + match_values),
+                    )
+        except Exception as e:
+            print(f"Erro ao atualizar dados na tabela {table_name}: {e}")
+
+    def upsert_data(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        match_columns: list,
+        chunk_size: int = INSERT_CHUNK_SIZE,
+    ):
+        """
+        Atualiza as linhas existentes e insere as novas com um único MERGE.
+        Se a tabela não existir, cria a tabela usando as colunas de match como chave primária.
+
+        Args:
+            df (pd.Dataframe): DataFrame contendo os dados a serem gravados.
+            table_name (str): Nome da tabela de destino.
+            match_columns (list): Lista de colunas usadas para identificar a linha.
+            chunk_size (int): Quantidade de linhas enviadas por lote para a tabela temporária.
+        """
+        self.prepare_upsert(df, table_name, match_columns)
+
+        self.__merge_dataframe(
+            df, table_name, match_columns, "upsert_data.sql", chunk_size
+        )
+
+    def __merge_dataframe(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        match_columns: list,
+        query_file: str,
+        chunk_size: int,
+    ):
+        """Carrega o DataFrame numa tabela temporária e aplica o MERGE informado."""
+        staging_table = f"#{table_name}_staging"
+        columns = [f"[{col}]" for col in df.columns]
+        update_columns = [col for col in df.columns if col not in match_columns]
+
+        on_clause = " AND ".join(
+            [f"TARGET.[{col}] = SOURCE.[{col}]" for col in match_columns]
+        )
+        update_clause = ", ".join(
+            [f"TARGET.[{col}] = SOURCE.[{col}]" for col in update_columns]
+        )
+        insert_values = ", ".join([f"SOURCE.[{col}]" for col in df.columns])
+
+        try:
+            with self.transaction() as cursor:
+                # Tabela temporária com os mesmos tipos das colunas de destino
+                cursor.execute(read_query("drop_table.sql").format(staging_table))
                 cursor.execute(
-                    sql_query.format(table_name, update_clause, match_condition),
-                    tuple(update_values + match_values),
+                    read_query("create_staging_table.sql").format(
+                        ", ".join(columns), staging_table, table_name
+                    )
+                )
+                self._insert_rows(
+                    cursor, df, f"[{staging_table}]", chunk_size=chunk_size
                 )
 
-            conn.commit()
-
+                cursor.execute(
+                    read_query(query_file).format(
+                        table_name,
+                        f"* FROM [{staging_table}]",
+                        on_clause,
+                        update_clause,
+                        ", ".join(columns),
+                        insert_values,
+                    )
+                )
+                cursor.execute(read_query("drop_table.sql").format(staging_table))
         except Exception as e:
             print(f"Erro ao atualizar dados na tabela {table_name}: {e}")
-        finally:
-            cursor.close()
+
+    def table_columns(self, table_name: str) -> list:
+        """
+        Retorna os nomes das colunas de uma tabela do banco de dados.
+
+        Args:
+            table_name (str): Nome da tabela.
+        """
+        sql_query = read_query("table_columns.sql")
+
+        with self.transaction(commit=False) as cursor:
+            cursor.execute(sql_query.format(repr(table_name)))
+            return [row[0] for row in cursor.fetchall()]
+
+    def add_columns(self, df: pd.DataFrame, table_name: str, columns: list):
+        """
+        Acrescenta colunas à tabela com os tipos das colunas do DataFrame.
+
+        Args:
+            df (pd.Dataframe): DataFrame com as colunas a acrescentar.
+            table_name (str): Nome da tabela.
+            columns (list): Colunas do DataFrame ausentes na tabela.
+        """
+        sql_query = read_query("add_columns.sql")
+
+        try:
+            with self.transaction() as cursor:
+                cursor.execute(
+                    sql_query.format(
+                        table_name, ", ".join(column_definitions(df, columns))
+                    )
+                )
+        except Exception as e:
+            print(f"Erro ao acrescentar colunas na tabela {table_name}: {e}")
 
     def table_exists(self, table_name: str) -> bool:
         """
@@ -252,18 +563,11 @@ class SQLClient:
             True se a tabela existir, False caso contrário.
         """
 
-        sql_file = os.path.join(queries_path, "table_information.sql")
-        with open(sql_file, "r", encoding="utf-8") as file:
-            sql_query = file.read()
+        sql_query = read_query("table_information.sql")
 
-        if self.use_sqlalchemy:
-            with self.engine.connect() as conn:
-                result = conn.execute(text(sql_query.format(repr(table_name)))).scalar()
-        else:
-            with self.engine as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql_query.format(repr(table_name)))
-                result = cursor.fetchone()[0]
+        with self.transaction(commit=False) as cursor:
+            cursor.execute(sql_query.format(repr(table_name)))
+            result = cursor.fetchone()[0]
         return result > 0
 
 
@@ -284,3 +588,10 @@ if __name__ == "__main__":
 
     sql = SQLClient(use_sqlalchemy=False)
     sql.create_table(df_test, "Teste", "id")
+
+    # Comparação das formas de inserção
+    df_bench = pd.concat([df_test] * 10000, ignore_index=True)
+    df_bench["id"] = df_bench.index
+    for mode in ["row", "executemany", "bulk"]:
+        sql.drop_table("TesteInsercao")
+        print(sql.insert_dataframe(df_bench, "TesteInsercao", "id", mode=mode))
@@ -0,0 +1,119 @@
+from abc import ABC, abstractmethod
+
+from settings import STORAGE_BACKEND
+
+# Valores por filtro IN; o SQL Server aceita até 2100 parâmetros por consulta
+MAX_IN_VALUES = 1000
+
+
+class StorageBackend(ABC):
+    """Interface comum dos armazenamentos de tabelas do projeto.
+
+    Os gerenciadores de ``project/`` dependem apenas destes métodos, de modo que
+    o SQL Server pode ser trocado por um banco embarcado (DuckDB) em análises
+    locais e em medições de desempenho.
+    """
+
+    @abstractmethod
+    def insert_dataframe(self, df, table_name, primary_key=None, **kwargs):
+        """Insere o DataFrame na tabela, criando-a se necessário."""
+
+    @abstractmethod
+    def insert_dataframes(self, frames):
+        """Insere vários DataFrames numa única transação.
+
+        Args:
+            frames (list): Tuplas (df, table_name, primary_key).
+        """
+
+    @abstractmethod
+    def get_data(
+        self,
+        table_name,
+        columns="*",
+        where=None,
+        params=None,
+        chunksize=None,
+        dtypes=None,
+    ):
+        """Retorna os dados da tabela (ou um iterador de blocos com ``chunksize``)."""
+
+    @abstractmethod
+    def update_data(self, df, table_name, match_columns, **kwargs):
+        """Atualiza as linhas da tabela que casam com ``match_columns``."""
+
+    @abstractmethod
+    def upsert_data(self, df, table_name, match_columns, **kwargs):
+        """Atualiza as linhas existentes e insere as novas."""
+
+    @abstractmethod
+    def create_table(self, df, table_name, primary_key=None):
+        """Cria a tabela com as colunas e tipos do DataFrame."""
+
+    @abstractmethod
+    def table_exists(self, table_name):
+        """Verifica se a tabela existe."""
+
+    @abstractmethod
+    def drop_table(self, table_name):
+        """Exclui a tabela, se existir."""
+
+    @abstractmethod
+    def table_columns(self, table_name):
+        """Retorna os nomes das colunas da tabela."""
+
+    @abstractmethod
+    def add_columns(self, df, table_name, columns):
+        """Acrescenta à tabela as colunas informadas, com os tipos do DataFrame."""
+
+    def prepare_upsert(self, df, table_name, match_columns):
+        """Deixa a tabela pronta para receber o upsert do DataFrame.
+
+        Cria a tabela se ela não existir e acrescenta as colunas do DataFrame que
+        ela ainda não tem (ex.: uma runa nova nas tabelas largas de runas, com uma
+        coluna por runa).
+
+        Migração: uma tabela sem alguma das colunas de match é de um formato
+        anterior e é recriada. É o caso das tabelas de estatísticas gravadas antes
+        da coluna ``patch``, que eram excluídas e recriadas a cada execução.
+        """
+        if self.table_exists(table_name):
+            existing = {str(column) for column in self.table_columns(table_name)}
+            if all(str(column) in existing for column in match_columns):
+                missing = [
+                    column for column in df.columns if str(column) not in existing
+                ]
+                if missing:
+                    self.add_columns(df, table_name, missing)
+                return
+
+            print(
+                f"Tabela {table_name} sem as colunas {match_columns}; "
+                "recriando no formato atual."
+            )
+            self.drop_table(table_name)
+
+        self.create_table(df, table_name, match_columns)
+
+
+def get_storage(backend=STORAGE_BACKEND, **kwargs):
+    """Cria o armazenamento configurado.
+
+    Args:
+        backend (str, optional): "sqlserver" ou "duckdb". Padrão é STORAGE_BACKEND.
+        **kwargs: Argumentos repassados ao construtor do armazenamento.
+
+    Returns:
+        StorageBackend: Instância do armazenamento escolhido.
+    """
+    if backend == "sqlserver":
+        from libs.sql_lib.sql import SQLClient
+
+        return SQLClient(**kwargs)
+
+    if backend == "duckdb":
+        from libs.sql_lib.duckdb_client import DuckDBClient
+
+        return DuckDBClient(**kwargs)
+
+    raise ValueError(f"Armazenamento '{backend}' não suportado.")
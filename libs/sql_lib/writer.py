@@ -0,0 +1,165 @@
+import queue
+import threading
+import time
+
+from settings import WRITE_BATCH_SIZE, WRITE_FLUSH_INTERVAL, WRITE_QUEUE_SIZE
+
+_STOP = object()
+
+
+class BatchWriter:
+    """Fila limitada com uma thread que grava os itens em lotes.
+
+    Os produtores (ex.: threads que buscam partidas na Riot API) chamam ``put`` e
+    seguem trabalhando; a thread de gravação agrupa os itens e chama
+    ``write_batch(itens)`` a cada ``batch_size`` itens ou ``flush_interval``
+    segundos, o que vier primeiro. Quando o banco fica para trás a fila enche e
+    ``put`` bloqueia, freando os produtores em vez de acumular memória.
+
+    Uso:
+        with BatchWriter(gravar_lote) as writer:
+            writer.put(item)
+    """
+
+    def __init__(
+        self,
+        write_batch,
+        batch_size=WRITE_BATCH_SIZE,
+        flush_interval=WRITE_FLUSH_INTERVAL,
+        max_queue=WRITE_QUEUE_SIZE,
+        on_flush=None,
+    ):
+        """
+        Args:
+            write_batch (callable): Função que grava uma lista de itens.
+            batch_size (int, optional): Itens por lote.
+            flush_interval (float, optional): Segundos máximos de espera de um lote incompleto.
+            max_queue (int, optional): Itens aguardando gravação antes de ``put`` bloquear.
+            on_flush (callable, optional): Chamada com os itens gravados com sucesso em cada lote.
+        """
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.items = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.max_depth = 0
+        self.flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+    def start(self):
+        """Inicia a thread de gravação."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="BatchWriter", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def put(self, item):
+        """Adiciona um item à fila, bloqueando enquanto ela estiver cheia."""
+        start = time.perf_counter()
+        self._queue.put(item)
+        waited = time.perf_counter() - start
+
+        with self._lock:
+            self.blocked_seconds += waited
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def close(self):
+        """Grava os itens pendentes e encerra a thread de gravação."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        batch = []
+        deadline = None
+
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(batch)
+                return
+
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if batch and (
+                len(batch) >= self.batch_size or time.monotonic() >= deadline
+            ):
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch):
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        try:
+            self.write_batch(batch)
+            written = batch
+        except Exception as e:
+            print(f"Erro ao gravar lote de {len(batch)} itens: {e}")
+            with self._lock:
+                self.failed_batches += 1
+            written = self._write_items(batch) if len(batch) > 1 else []
+
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self.items += len(written)
+            self.batches += 1
+            self.flush_seconds += seconds
+            self.max_flush_seconds = max(self.max_flush_seconds, seconds)
+
+        if written and self.on_flush is not None:
+            try:
+                self.on_flush(written)
+            except Exception as e:
+                # Um erro no retorno não pode parar a thread e travar os produtores
+                print(f"Erro ao finalizar lote de {len(written)} itens: {e}")
+
+    def _write_items(self, batch):
+        """Regrava um lote com erro item a item, para não descartar os itens válidos."""
+        written = []
+        for item in batch:
+            try:
+                self.write_batch([item])
+                written.append(item)
+            except Exception as e:
+                print(f"Erro ao gravar item: {e}")
+        return written
+
+    def stats(self):
+        """Retorna os contadores da fila e das gravações."""
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "avg_flush_seconds": (
+                round(self.flush_seconds / self.batches, 4) if self.batches else None
+            ),
+            "max_flush_seconds": round(self.max_flush_seconds, 4),
+            "blocked_seconds": round(self.blocked_seconds, 2),
+        }
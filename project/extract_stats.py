@@ -1,18 +1,44 @@
 import json
+from functools import partial
 
 import pandas as pd
-from tqdm import tqdm
 
-from libs.extract_lib.stats import StatsFetcher
+from libs.extract_lib.scraper import Scraper
+from libs.extract_lib.snapshot import SnapshotStore, parse_with_page
+from libs.extract_lib.stats import (
+    StatsFetcher,
+    champion_page_url,
+    load_champion_index,
+    normalize_champion_name,
+    parse_champion_page,
+    parse_rune_page,
+    parse_tier_list_page,
+    rune_page_url,
+    tier_list_url,
+)
 from libs.riot_lib.riot import LeagueOfLegends
-from libs.sql_lib.sql import SQLClient
-from settings import champion_stats_table, docs_path, rune_pick_table, rune_win_table
+from libs.sql_lib.storage import get_storage
+from settings import (
+    CHAMPION_STATS_SOURCE,
+    GAME_VERSION,
+    champion_stats_table,
+    docs_path,
+    rune_pick_table,
+    rune_win_table,
+)
 
 
 class LeagueStatsExtract:
-    def __init__(self):
+    def __init__(self, patch=GAME_VERSION):
+        """
+        Args:
+            patch (str, optional): Patch a que as estatísticas coletadas se referem.
+        """
         self.lol = LeagueOfLegends()
-        self.sql = SQLClient(use_sqlalchemy=False)
+        self.sql = get_storage()
+        self.scraper = Scraper()
+        self.snapshots = SnapshotStore()
+        self.patch = patch
         self.docs_path = docs_path
 
     def get_json_files(self):
@@ -60,21 +86,35 @@ class LeagueStatsExtract:
         win_rate_stats = {}
         pick_rate_stats = {}
 
-        for champion_id in tqdm(champion_ids, desc="Processando runas dos campeões"):
-            stats = StatsFetcher(champion_id)
+        # Uma única leitura da página de cada campeão; só as vencidas são baixadas
+        all_stats = self._collect(
+            "leagueofitems",
+            {
+                (champion_id, None): rune_page_url(champion_id)
+                for champion_id in champion_ids
+            },
+            parse_rune_page,
+            desc="Processando runas dos campeões",
+        )
 
+        for champion_id in champion_ids:
             win_rate_stats[champion_id] = {}
             pick_rate_stats[champion_id] = {}
 
+            # As chaves voltam como texto do snapshot em JSON
+            all_rune_stats = {
+                group: {str(rune_id): stats for rune_id, stats in runes.items()}
+                for group, runes in (
+                    all_stats[(champion_id, None)] or {"primary": {}, "secondary": {}}
+                ).items()
+            }
+
             for rune_id in primary_rune_ids + secondary_rune_ids:
+                group = "primary" if rune_id in primary_rune_ids else "secondary"
                 try:
                     win_rate, pick_rate = map(
                         lambda value: float(value.replace("%", "")),
-                        (
-                            stats.get_rune_stats(rune_id)
-                            if rune_id in primary_rune_ids
-                            else stats.get_secundary_rune_stats(rune_id)
-                        ).values(),
+                        all_rune_stats[group][str(rune_id)].values(),
                     )
                 except:
                     win_rate, pick_rate = -1.0, -1.0
@@ -85,20 +125,52 @@ class LeagueStatsExtract:
         self._save_to_sql(win_rate_stats, rune_win_table)
         self._save_to_sql(pick_rate_stats, rune_pick_table)
 
-    def get_champion_stats(self):
+    def get_champion_stats(self, source=CHAMPION_STATS_SOURCE):
+        """
+        Args:
+            source (str, optional): "tier_list" lê uma lista por lane com todos os
+                campeões; "build" lê a página de cada campeão em cada lane. No modo
+                "tier_list" a página de cada campeão ainda é usada nas lanes cuja
+                lista falhou e para os campeões ausentes de todas as listas.
+        """
         champion_ids = self.get_champion_ids()
         lanes = ["top", "jungle", "mid", "adc", "support"]
 
         champion_stats = []
 
-        for champion_id in tqdm(champion_ids, desc="Processando status dos campeões"):
-            stats = StatsFetcher(champion_id)
+        all_stats = {}
+        if source == "tier_list":
+            all_stats = self._get_tier_list_stats(champion_ids, lanes)
+
+        pending = [
+            (champion_id, lane)
+            for champion_id in champion_ids
+            for lane in lanes
+            if (champion_id, lane) not in all_stats
+        ]
+        if pending:
+            names = {
+                champion_id: StatsFetcher(champion_id).champion_name
+                for champion_id in {champion_id for champion_id, _ in pending}
+            }
+            all_stats.update(
+                self._collect(
+                    "opgg",
+                    {
+                        (champion_id, lane): champion_page_url(names[champion_id], lane)
+                        for champion_id, lane in pending
+                    },
+                    parse_champion_page,
+                    desc="Processando status dos campeões",
+                )
+            )
 
+        for champion_id in champion_ids:
             for lane in lanes:
                 try:
                     win_rate, pick_rate = map(
                         lambda value: float(value.replace("%", "")),
-                        stats.get_champion_stats(lane).values(),
+                        all_stats[(champion_id, lane)].values(),
                     )
                 except:
                     win_rate, pick_rate = -1.0, -1.0
@@ -108,28 +180,114 @@ class LeagueStatsExtract:
                         "lane": lane,
                         "winRate": win_rate,
                         "pickRate": pick_rate,
+                        "patch": self.patch,
                     }
                 )
 
+        # Uma linha por patch: os patches anteriores ficam como histórico
         df_champion_stats = pd.DataFrame(champion_stats)
-        self.sql.insert_dataframe(
-            df_champion_stats, champion_stats_table, ["championId", "lane"]
+        self.sql.upsert_data(
+            df_champion_stats, champion_stats_table, ["championId", "lane", "patch"]
+        )
+
+    def _get_tier_list_stats(self, champion_ids, lanes):
+        """Lê o win rate e o pick rate de todos os campeões na lista de cada lane.
+
+        Returns:
+            dict: {(championId, lane): estatísticas}. Um campeão listado em alguma
+            lane, mas não nesta, recebe None (não é jogado nela). Lanes cuja lista
+            falhou e campeões ausentes de todas as listas ficam de fora.
+        """
+        tier_lists = self._collect(
+            "opgg_tier_list",
+            {("all", lane): tier_list_url(lane) for lane in lanes},
+            parse_tier_list_page,
+            desc="Processando listas de campeões",
+        )
+        champion_index = load_champion_index()
+
+        all_stats = {}
+        listed = set()
+        for (_, lane), tier_list in tier_lists.items():
+            if tier_list is None:
+                continue
+
+            lane_stats = {
+                champion_index.get(normalize_champion_name(name)): stats
+                for name, stats in tier_list.items()
+            }
+            listed.update(lane_stats)
+            for champion_id in champion_ids:
+                all_stats[(champion_id, lane)] = lane_stats.get(champion_id)
+
+        return {key: stats for key, stats in all_stats.items() if key[0] in listed}
+
+    def _collect(self, source, urls, parse, desc):
+        """Obtém as estatísticas dos snapshots e baixa apenas as ausentes ou vencidas.
+
+        Args:
+            source (str): Site de origem, usado na chave do snapshot.
+            urls (dict): {(championId, lane): url}.
+            parse (callable): Função de módulo que interpreta a página.
+            desc (str): Descrição da barra de progresso.
+
+        Returns:
+            dict: {(championId, lane): estatísticas}, com None quando não houver dados.
+        """
+        all_stats = {}
+        stale = {}
+        for (champion_id, lane), url in urls.items():
+            entry = self.snapshots.get(source, self.patch, champion_id, lane)
+            if entry is not None:
+                all_stats[(champion_id, lane)] = entry["stats"]
+            else:
+                stale[(champion_id, lane)] = url
+
+        pages = (
+            self.scraper.fetch_many(
+                stale.values(), partial(parse_with_page, parse), desc=desc
+            )
+            if stale
+            else {}
         )
 
+        for (champion_id, lane), url in stale.items():
+            result = pages[url]
+            if isinstance(result, Exception):
+                print(f"Erro ao obter {url}: {result}")
+                # Um snapshot vencido ainda é melhor que nenhum dado
+                entry = self.snapshots.get(
+                    source, self.patch, champion_id, lane, fresh=False
+                )
+                all_stats[(champion_id, lane)] = entry["stats"] if entry else None
+                continue
+
+            self.snapshots.put(
+                source,
+                self.patch,
+                champion_id,
+                result["stats"],
+                url=url,
+                lane=lane,
+                page=result["page"],
+            )
+            all_stats[(champion_id, lane)] = result["stats"]
+
+        return all_stats
+
     def _save_to_sql(self, stats_dict, table_name):
         df_stats = pd.DataFrame.from_dict(stats_dict, orient="index").reset_index()
         df_stats.rename(columns={"index": "championId"}, inplace=True)
-        self.sql.insert_dataframe(df_stats, table_name, "championId")
+        df_stats["patch"] = self.patch
+        self.sql.upsert_data(df_stats, table_name, ["championId", "patch"])
 
 
 if __name__ == "__main__":
     extract = LeagueStatsExtract()
     extract.get_json_files()
 
-    # Excluir tabelas se existirem
-    extract.sql.drop_table(rune_win_table)
-    extract.sql.drop_table(rune_pick_table)
-    extract.sql.drop_table(champion_stats_table)
-
     extract.get_rune_stats()
     extract.get_champion_stats()
+    extract.scraper.close()
+    print(f"Scraper: {extract.scraper.stats()}")
+    print(f"Snapshots: {extract.snapshots.stats()}")
@@ -1,12 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
+import pandas as pd
 from tqdm import tqdm
 
+from libs.crawl_lib.frontier import Frontier
+from libs.crawl_lib.journal import CrawlJournal, fingerprint
+from libs.crawl_lib.seen import SeenMatchIndex
+from libs.lake_lib.lake import ParquetLake, match_partition
+from libs.riot_lib.patches import patch_window
 from libs.riot_lib.riot import LeagueOfLegends
-from libs.sql_lib.sql import SQLClient
+from libs.sql_lib.storage import MAX_IN_VALUES, get_storage
+from libs.sql_lib.writer import BatchWriter
 from settings import (
     AMOUNT,
+    CRAWL_API_BUDGET,
+    CRAWL_MATCHES_PER_PLAYER,
+    CRAWL_PLAYER_CHUNK,
+    CRAWL_TARGET_MATCHES,
+    DATA_SINK,
     GAME_VERSION,
+    MAX_WORKERS,
+    PROCESSING_CHUNK_SIZE,
     champion_mastery_table,
     match_table,
     player_match_table,
@@ -14,6 +29,10 @@ from settings import (
     team_table,
 )
 
+# As etapas de maestria leem e atualizam a tabela PlayerMatch do banco, então as
+# partidas sempre são gravadas nele; o conjunto Parquet é uma cópia adicional.
+DATA_SINKS = ("sql", "both")
+
 
 class LeagueDataManager:
     def __init__(
@@ -22,90 +41,478 @@ class LeagueDataManager:
         queue="RANKED_SOLO_5x5",
         game_version=GAME_VERSION,
         amount=AMOUNT,
+        max_workers=MAX_WORKERS,
+        data_sink=DATA_SINK,
+        player_chunk=CRAWL_PLAYER_CHUNK,
     ):
         self.region = region
         self.queue = queue
         self.game_version = game_version
         self.amount = int(amount)
+        self.max_workers = max_workers
         self.lol = LeagueOfLegends(region=self.region, queue=self.queue)
-        self.sql = SQLClient(use_sqlalchemy=False)
+        self.sql = get_storage()
+        if data_sink not in DATA_SINKS:
+            raise ValueError(
+                f"Destino '{data_sink}' não suportado. Use {list(DATA_SINKS)}."
+            )
+        self.data_sink = data_sink
+        self.lake = ParquetLake() if data_sink == "both" else None
+        self.seen = SeenMatchIndex()
+        self.journal = CrawlJournal()
+        self.player_chunk = player_chunk
 
-    def get_existing_matches(self, table_name):
-        """Obtém os Ids das partidas já inseridas no banco."""
+    def iter_existing_matches(self, table_name):
+        """Lê em blocos os Ids das partidas já inseridas no banco."""
         if self.sql.table_exists(table_name):
-            matches = self.sql.get_data(table_name, "matchId")["matchId"].to_list()
-            return matches
-        return []
+            for chunk in self.sql.get_data(
+                table_name, ["matchId"], chunksize=PROCESSING_CHUNK_SIZE
+            ):
+                yield chunk["matchId"].to_list()
+
+    def load_seen_matches(self):
+        """Carrega o índice de partidas gravadas, consultando a tabela só na primeira vez."""
+        if not self.seen.loaded:
+            self.seen.load(lambda: self.iter_existing_matches(match_table))
 
     def insert_player_data(self, player_table):
         """Busca informações dos jogadores na API e insere no banco."""
         df_players = self.lol.get_league(self.amount)
         self.sql.insert_dataframe(df_players, player_table)
+        print(f"Mapa de identidades: {self.lol.identity.stats()}")
 
-    def insert_mastery_champions(self):
-        """Busca informações de maestria dos campeões e insere no banco."""
-        df_player_match_table = self.sql.get_data(
-            player_match_table, "puuid, championLevel"
+    def get_needed_mastery(self):
+        """Calcula os pares (puuid, championId) cuja maestria precisa ser obtida.
+
+        São os campeões usados nas partidas ainda sem maestria, exceto os pares já
+        gravados com ``lastPlayTime`` igual ou posterior à partida mais recente do
+        par, pois a maestria salva já reflete essa partida.
+
+        Returns:
+            DataFrame: Colunas puuid e championId.
+        """
+        df_pairs = self.sql.get_data(
+            player_match_table,
+            ["puuid", "championId", "matchId"],
+            where={"championLevel": None},
         )
-        puuid_list = list(
-            set(
-                df_player_match_table[df_player_match_table["championLevel"].isnull()][
-                    "puuid"
-                ].to_list()
+        df_match_start = self.sql.get_data(
+            match_table, ["matchId", "gameStartTimestamp"]
+        )
+        df_pairs = (
+            df_pairs.merge(df_match_start, on="matchId", how="left")
+            .groupby(["puuid", "championId"], as_index=False)["gameStartTimestamp"]
+            .max()
+        )
+
+        if self.sql.table_exists(champion_mastery_table):
+            df_stored = self.sql.get_data(
+                champion_mastery_table,
+                ["puuid", "championId", "lastPlayTime"],
+                dtypes={"championId": "int64"},
             )
+            df_pairs = df_pairs.merge(df_stored, on=["puuid", "championId"], how="left")
+            df_pairs = df_pairs[
+                ~(df_pairs["lastPlayTime"] >= df_pairs["gameStartTimestamp"])
+            ]
+
+        return df_pairs[["puuid", "championId"]].reset_index(drop=True)
+
+    def insert_mastery_champions(self):
+        """Busca a maestria dos campeões usados nas partidas e grava no banco.
+
+        Apenas os pares (puuid, championId) desatualizados são consultados, em
+        blocos de jogadores obtidos em paralelo e gravados com upsert. Como os
+        pares gravados deixam de ser desatualizados, uma execução interrompida
+        continua naturalmente de onde parou.
+        """
+        df_needed = self.get_needed_mastery()
+        champions_by_player = df_needed.groupby("puuid")["championId"].apply(list)
+        players = list(champions_by_player.items())
+        print(
+            f"Maestrias necessárias: {len(df_needed)} pares de {len(players)} jogadores."
         )
 
-        for puuid in tqdm(puuid_list, desc="Obtendo Maestria dos Campeões"):
+        def fetch_mastery(player):
+            puuid, champion_ids = player
             try:
-                mastery_champions = self.lol.get_mastery_champion(puuid)
-                self.sql.insert_dataframe(
-                    mastery_champions, champion_mastery_table, ["puuid", "championId"]
-                )
+                return self.lol.get_mastery_champion(puuid, champion_ids)
             except Exception as e:
                 print(f"Erro ao obter maestria para {puuid}: {e}")
 
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for offset in tqdm(
+                range(0, len(players), self.player_chunk),
+                desc="Obtendo Maestria dos Campeões",
+            ):
+                frames = [
+                    frame
+                    for frame in executor.map(
+                        fetch_mastery, players[offset : offset + self.player_chunk]
+                    )
+                    if frame is not None and not frame.empty
+                ]
+                if frames:
+                    self.sql.upsert_data(
+                        pd.concat(frames, ignore_index=True),
+                        champion_mastery_table,
+                        ["puuid", "championId"],
+                    )
+
+    def is_valid_match(self, df_match, check_age=True):
+        """Verifica se a partida pertence ao patch configurado e aos últimos sete dias.
+
+        Args:
+            df_match (DataFrame): Dados da partida retornados por ``get_match``.
+            check_age (bool, optional): Se deve descartar partidas com mais de sete dias.
+        """
+        version = df_match["gameVersion"][0][:5]
+        start_timestamp = df_match["gameStartTimestamp"][0]
+        match_date = datetime.fromtimestamp(start_timestamp)
+        past_seven_days = datetime.now() - timedelta(days=7)
+
+        if check_age and match_date < past_seven_days:
+            return False
+        return version == self.game_version
+
     def insert_match_data(self):
-        """Busca informações de partidas dos jogadores e insere no banco."""
-        puuid_list = self.sql.get_data(player_table, "puuid")["puuid"].tolist()
-        existing_matches = self.get_existing_matches(match_table)
+        """Busca informações de partidas dos jogadores e insere no banco.
+
+        Os históricos e as partidas são obtidos em paralelo por um conjunto de
+        threads que compartilham o limitador de requisições da Riot API. As
+        inserções no banco são feitas em lotes por uma thread de gravação. Os ranks
+        dos participantes vêm do índice de ranks montado no início da coleta.
+        """
+        puuid_list = sorted(self.sql.get_data(player_table, "puuid")["puuid"].tolist())
+        self.load_seen_matches()
+
+        # Apenas partidas do patch e dos últimos sete dias são listadas
+        start_time, end_time = patch_window(self.game_version)
+        if start_time and end_time and start_time >= end_time:
+            print(f"O patch {self.game_version} não tem partidas recentes.")
+            return
+
+        # Ranking paginado usado no lugar das chamadas individuais de rank
+        if self.lol.rank_snapshot is None:
+            self.lol.load_rank_snapshot()
+
+        # Retoma do bloco de jogadores em que uma execução anterior parou
+        state = self.journal.task("matches", fingerprint(self.game_version, puuid_list))
+        if state["cursor"]:
+            print(f"Retomando a coleta a partir do jogador {state['cursor']}.")
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor, self._match_writer() as writer:
+            # Partidas do bloco interrompido que ainda não foram gravadas
+            pending = [match for match in state["pending"] if self.seen.claim(match)]
+            self._process_matches(executor, writer, pending)
+
+            for offset in tqdm(
+                range(state["cursor"], len(puuid_list), self.player_chunk),
+                desc="Interação sobre os jogadores",
+            ):
+                players = puuid_list[offset : offset + self.player_chunk]
+                match_lists = executor.map(
+                    lambda puuid: self.lol.get_matchlist(
+                        puuid, count=2, start_time=start_time, end_time=end_time
+                    ),
+                    players,
+                )
+
+                # Remove partidas repetidas entre jogadores e já inseridas no banco
+                match_list = [
+                    match
+                    for match_ids in match_lists
+                    for match in match_ids or []
+                    if self.seen.claim(match)
+                ]
+
+                self.journal.advance("matches", offset + len(players), match_list)
+                self._process_matches(executor, writer, match_list)
+
+        self.journal.finish("matches")
+        self._report(writer)
+
+    def crawl_matches(
+        self,
+        target_matches=CRAWL_TARGET_MATCHES,
+        api_budget=CRAWL_API_BUDGET,
+        matches_per_player=CRAWL_MATCHES_PER_PLAYER,
+    ):
+        """Coleta partidas por descoberta, a partir dos participantes das partidas.
+
+        Os jogadores da tabela de jogadores iniciam a fila; cada partida válida
+        coletada adiciona seus dez participantes, priorizados por elo e pela data
+        da partida. A coleta termina ao atingir ``target_matches`` partidas
+        válidas, ao esgotar ``api_budget`` requisições ou ao esvaziar a fila.
+
+        Args:
+            target_matches (int, optional): Quantidade de partidas válidas desejada.
+            api_budget (int, optional): Máximo de requisições à Riot API. O lote em
+                andamento é concluído, então o total pode passar um pouco do limite.
+            matches_per_player (int, optional): Partidas listadas por jogador.
+        """
+        df_players = self.sql.get_data(player_table, ["puuid", "tier"])
+        self.load_seen_matches()
+
+        start_time, end_time = patch_window(self.game_version)
+        if start_time and end_time and start_time >= end_time:
+            print(f"O patch {self.game_version} não tem partidas recentes.")
+            return
+
+        if self.lol.rank_snapshot is None:
+            self.lol.load_rank_snapshot()
+
+        frontier = Frontier()
+        for puuid, tier in zip(df_players["puuid"], df_players["tier"]):
+            frontier.push(puuid, f"{tier} I")
+
+        def add_participants(df_match, df_playermatches):
+            last_played = df_match["gameStartTimestamp"].iloc[0]
+            for puuid, tier_rank in zip(
+                df_playermatches["puuid"], df_playermatches["tierRank"]
+            ):
+                frontier.push(puuid, tier_rank, last_played)
+
+        first_request = self.lol.rate_limiter.requests
+        valid_matches = 0
+        progress = tqdm(total=target_matches, desc="Coleta por descoberta")
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor, self._match_writer() as writer:
+            while valid_matches < target_matches and len(frontier):
+                if self.lol.rate_limiter.requests - first_request >= api_budget:
+                    print("Orçamento de requisições à Riot API esgotado.")
+                    break
+
+                players = frontier.pop(self.max_workers)
+                match_lists = executor.map(
+                    lambda puuid: self.lol.get_matchlist(
+                        puuid,
+                        count=matches_per_player,
+                        start_time=start_time,
+                        end_time=end_time,
+                    ),
+                    players,
+                )
+                match_list = [
+                    match
+                    for match_ids in match_lists
+                    for match in match_ids or []
+                    if self.seen.claim(match)
+                ]
 
-        for puuid in tqdm(puuid_list, desc="Interação sobre os jogadores"):
-            match_list = self.lol.get_matchlist(puuid, count=2)
-            if not match_list:
+                found = self._process_matches(
+                    executor, writer, match_list, on_match=add_participants
+                )
+                valid_matches += found
+                progress.update(found)
+
+        progress.close()
+        requests = self.lol.rate_limiter.requests - first_request
+        print(f"Fila de jogadores: {frontier.stats()}")
+        print(
+            f"Partidas válidas: {valid_matches}, requisições: {requests}, "
+            f"requisições por partida: {requests / max(valid_matches, 1):.2f}"
+        )
+        self._report(writer)
+
+    def replay_match_data(self):
+        """Reprocessa as partidas do armazenamento de respostas sem chamar a Riot API.
+
+        Útil quando o tratamento de ``get_match`` muda: todo o caminho de
+        processamento é executado sobre as respostas brutas já armazenadas.
+        """
+        if self.lol.response_store.mode == "off":
+            print("Armazenamento de respostas desativado.")
+            return
+
+        self.lol.response_store.mode = "replay"
+        self.load_seen_matches()
+        match_list = [
+            match for match in self.lol.stored_match_ids() if self.seen.claim(match)
+        ]
+
+        if self.lol.rank_snapshot is None:
+            self.lol.load_rank_snapshot()
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor, self._match_writer() as writer:
+            self._process_matches(executor, writer, match_list, check_age=False)
+
+        self._report(writer)
+
+    def _match_writer(self):
+        """Cria a fila de gravação das partidas.
+
+        A cada lote gravado, as partidas são marcadas no índice e removidas das
+        pendências do diário da coleta.
+        """
+        return BatchWriter(self.write_matches, on_flush=self._commit_matches)
+
+    def _process_matches(
+        self, executor, writer, match_list, check_age=True, on_match=None
+    ):
+        """Obtém as partidas em paralelo e envia as válidas para a fila de gravação.
+
+        As threads de busca colocam as partidas numa fila limitada e seguem para a
+        próxima; uma thread de gravação insere as três tabelas em lotes, numa
+        transação por lote. Se o banco ficar para trás, a fila enche e as buscas
+        aguardam.
+
+        Args:
+            on_match (callable, optional): Chamada na thread principal com
+                (df_match, df_playermatches) de cada partida válida.
+
+        Returns:
+            int: Quantidade de partidas válidas enviadas para gravação.
+        """
+        valid_matches = 0
+        futures = {
+            executor.submit(self._fetch_match, writer, match, check_age): match
+            for match in match_list
+        }
+        for future in tqdm(
+            as_completed(futures),
+            total=len(futures),
+            desc="Interação das partidas",
+            leave=False,
+        ):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Erro ao processar partida {futures[future]}: {e}")
                 continue
 
-            match_list = [
-                match for match in match_list if match not in existing_matches
+            if result is not None:
+                valid_matches += 1
+                if on_match is not None:
+                    on_match(*result)
+
+        return valid_matches
+
+    def _fetch_match(self, writer, match, check_age=True):
+        """Obtém uma partida e, se ela for válida, a envia para a fila de gravação.
+
+        Partidas fora do patch continuam reservadas no índice até o fim da coleta,
+        para não serem buscadas de novo a partir de outro jogador. Partidas que não
+        serão gravadas saem das pendências do diário, para não serem buscadas de
+        novo a cada retomada.
+
+        Returns:
+            tuple: (df_match, df_playermatches) se a partida for válida, senão None.
+        """
+        try:
+            df_match, df_team, df_playermatches = self.lol.get_match(match)
+        except Exception:
+            self.seen.release(match)
+            self.journal.discard("matches", [match])
+            raise
+
+        if df_match is False:
+            self.seen.release(match)
+            self.journal.discard("matches", [match])
+            return None
+
+        # Filtrar partidas pela versão e data
+        if not self.is_valid_match(df_match, check_age):
+            self.journal.discard("matches", [match])
+            return None
+
+        writer.put((df_match, df_team, df_playermatches))
+        return df_match, df_playermatches
+
+    def _commit_matches(self, batch):
+        """Marca no índice e no diário as partidas gravadas com sucesso."""
+        match_ids = [df_match["matchId"].iloc[0] for df_match, _, _ in batch]
+        self.seen.commit(match_ids)
+        self.journal.complete("matches", match_ids)
+
+    def stored_matches(self, match_ids):
+        """Retorna os Ids da lista que já estão na tabela de partidas."""
+        if not match_ids or not self.sql.table_exists(match_table):
+            return set()
+
+        stored = set()
+        for offset in range(0, len(match_ids), MAX_IN_VALUES):
+            df = self.sql.get_data(
+                match_table,
+                ["matchId"],
+                where={"matchId": match_ids[offset : offset + MAX_IN_VALUES]},
+            )
+            stored.update(df["matchId"])
+        return stored
+
+    def write_matches(self, batch):
+        """Grava um lote de partidas no banco e, com ``data_sink="both"``, no conjunto Parquet.
+
+        A gravação pode ser repetida: partidas que já estão no banco (gravadas
+        antes de uma queda que impediu marcá-las no índice e no diário) são
+        ignoradas e contam como gravadas, de modo que a nova tentativa as marca
+        em vez de falhar na chave primária. Como o banco é a referência, um erro
+        no conjunto Parquet é exibido e não desfaz a gravação do lote.
+
+        Args:
+            batch (list): Tuplas (df_match, df_team, df_playermatches).
+        """
+        stored = self.stored_matches(
+            [df_match["matchId"].iloc[0] for df_match, _, _ in batch]
+        )
+        if stored:
+            print(f"{len(stored)} partidas do lote já estavam no banco.")
+            batch = [item for item in batch if item[0]["matchId"].iloc[0] not in stored]
+        if not batch:
+            return
+
+        df_match, df_team, df_playermatches = (
+            pd.concat(frames, ignore_index=True) for frames in zip(*batch)
+        )
+        self.sql.insert_dataframes(
+            [
+                (df_match, match_table, None),
+                (df_team, team_table, None),
+                (df_playermatches, player_match_table, ["puuid", "matchId"]),
             ]
-            for match in tqdm(match_list, desc="Interação das partidas"):
-                try:
-                    df_match, df_team, df_playermatches = self.lol.get_match(match)
-                    if not df_match:
-                        continue
-
-                    # Filtrar partidas pela versão e data
-                    version = df_match["gameVersion"][0][:5]
-                    start_timestamp = df_match["gameStartTimestamp"][0]
-                    match_date = datetime.fromtimestamp(start_timestamp)
-                    past_seven_days = datetime.now() - timedelta(days=7)
-
-                    if version == self.game_version and match_date >= past_seven_days:
-                        self.sql.insert_dataframe(df_match, match_table)
-                        self.sql.insert_dataframe(df_team, team_table)
-                        self.sql.insert_dataframe(
-                            df_playermatches, player_match_table, ["puuid", "matchId"]
-                        )
-                        existing_matches.append(match)
-                except Exception as e:
-                    print(f"Erro ao processar partida {match}: {e}")
+        )
+
+        if self.lake is not None:
+            try:
+                for df_match, df_team, df_playermatches in batch:
+                    patch, game_date = match_partition(df_match)
+                    self.lake.append(df_match, match_table, patch, game_date)
+                    self.lake.append(df_team, team_table, patch, game_date)
+                    self.lake.append(
+                        df_playermatches, player_match_table, patch, game_date
+                    )
+
+                # Grava já o lote, pois as partidas passam a constar como concluídas
+                self.lake.flush()
+            except Exception as e:
+                print(f"Erro ao gravar {len(batch)} partidas no conjunto Parquet: {e}")
+
+    def _report(self, writer):
+        """Salva o cache de ranks e o mapa de identidades e exibe os contadores da coleta."""
+        self.lol.rank_cache.save()
+        self.lol.identity.save()
+        print(f"Gravação das partidas: {writer.stats()}")
+        print(f"Requisições à Riot API: {self.lol.rate_limiter.stats()}")
+        print(f"Armazenamento de respostas: {self.lol.response_store.stats()}")
+        print(f"Cache de ranks: {self.lol.rank_cache.stats()}")
+        print(f"Índice de ranks: {self.lol.rank_snapshot.stats()}")
+        print(f"Índice de partidas: {self.seen.stats()}")
+        print(f"Mapa de identidades: {self.lol.identity.stats()}")
+        if self.lake is not None:
+            print(f"Conjunto Parquet: {self.lake.stats()}")
 
 
 if __name__ == "__main__":
     manager = LeagueDataManager()
 
-    # Excluir tabelas se existirem
+    # Excluir tabela de jogadores se existir (a de maestria é atualizada incrementalmente)
     manager.sql.drop_table(player_table)
-    manager.sql.drop_table(champion_mastery_table)
 
     # Inserir dados de jogadores
     manager.insert_player_data()
@@ -4,8 +4,12 @@ import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-from libs.sql_lib.sql import SQLClient
+from libs.lake_lib.lake import ParquetLake
+from libs.sql_lib.storage import MAX_IN_VALUES, get_storage
 from settings import (
+    DATA_SINK,
+    GAME_VERSION,
+    PROCESSING_CHUNK_SIZE,
     champion_mastery_table,
     champion_stats_table,
     docs_path,
@@ -19,22 +23,51 @@ from settings import (
 
 class LeagueDataProcessing:
     def __init__(self):
-        self.sql = SQLClient()
-
-    def update_mastery_champions(self):
-        df_player_match = self.sql.get_data(player_match_table, "*")
-        df_player_champion_mastery = self.sql.get_data(champion_mastery_table, "*")
-        df_rune_win_rate = self.sql.get_data(rune_win_table, "*")
-        df_rune_pick_rate = self.sql.get_data(rune_pick_table, "*")
-        df_champion_stats = self.sql.get_data(champion_stats_table, "*")
-
-        rows_to_update = df_player_match[df_player_match["championLevel"].isnull()]
+        self.sql = get_storage()
+
+    def update_mastery_champions(self, chunksize=PROCESSING_CHUNK_SIZE):
+        # Apenas as linhas e colunas necessárias são lidas, em blocos
+        player_match_chunks = self.sql.get_data(
+            player_match_table,
+            [
+                "puuid",
+                "matchId",
+                "championId",
+                "individualPosition",
+                "perkKeystone",
+                "perkPrimaryRow1",
+                "perkPrimaryRow2",
+                "perkPrimaryRow3",
+                "perkSecondaryRow1",
+                "perkSecondaryRow2",
+            ],
+            where={"championLevel": None},
+            chunksize=chunksize,
+        )
+        df_player_champion_mastery = self.sql.get_data(
+            champion_mastery_table,
+            ["puuid", "championId", "championLevel", "championPoints"],
+            dtypes={"championId": "int64"},
+        )
+        # As tabelas de estatísticas guardam um histórico por patch
+        df_rune_win_rate = self.sql.get_data(
+            rune_win_table, "*", where={"patch": GAME_VERSION}
+        )
+        df_rune_pick_rate = self.sql.get_data(
+            rune_pick_table, "*", where={"patch": GAME_VERSION}
+        )
+        df_champion_stats = self.sql.get_data(
+            champion_stats_table,
+            ["championId", "lane", "winRate", "pickRate"],
+            where={"patch": GAME_VERSION},
+        )
 
         data_to_update = []
 
-        for _, row in tqdm(
-            rows_to_update.iterrows(), desc="Analise das maestrias dos campeões"
-        ):
+        rows_to_update = (
+            row for chunk in player_match_chunks for _, row in chunk.iterrows()
+        )
+        for row in tqdm(rows_to_update, desc="Analise das maestrias dos campeões"):
 
             puuid = row["puuid"]
             championId = row["championId"]
@@ -134,11 +167,100 @@ class LeagueDataProcessing:
 
         self.sql.update_data(df_updates, player_match_table, match_columns)
 
-    def create_database(self):
+    def read_lake_tables(self, patch=None):
+        """Lê as tabelas de partidas do conjunto Parquet.
+
+        As colunas de maestria e de taxas são calculadas depois da coleta e só
+        existem no banco, então são trazidas de lá e unidas às linhas do Parquet.
+        Por isso o conjunto Parquet é gravado apenas com ``DATA_SINK="both"``. Com
+        um patch, o banco é consultado só para as partidas lidas desse patch.
+
+        Args:
+            patch (str, optional): Patch a ler; os demais são ignorados na leitura.
+        """
+        lake = ParquetLake()
+        where = {"patch": patch} if patch else None
+
+        matches_data = lake.read(match_table, where=where)
+        teams_data = lake.read(
+            team_table,
+            [
+                "matchId",
+                "teamId",
+                "win",
+                "baronKills",
+                "dragonKills",
+                "riftHeraldKills",
+            ],
+            where=where,
+        )
+        players_matches_data = lake.read(player_match_table, where=where)
+
+        mastery_columns = [
+            "championLevel",
+            "championPoints",
+            "runeWinRate",
+            "runePickRate",
+            "championWinRate",
+            "championPickRate",
+        ]
+        columns = ["puuid", "matchId"] + mastery_columns
+        if where:
+            match_ids = matches_data["matchId"].unique().tolist()
+            frames = [
+                self.sql.get_data(
+                    player_match_table,
+                    columns,
+                    where={"matchId": match_ids[i : i + MAX_IN_VALUES]},
+                )
+                for i in range(0, len(match_ids), MAX_IN_VALUES)
+            ]
+            df_mastery = (
+                pd.concat(frames, ignore_index=True)
+                if frames
+                else pd.DataFrame(columns=columns)
+            )
+        else:
+            df_mastery = self.sql.get_data(player_match_table, columns)
+        players_matches_data = players_matches_data.drop(
+            columns=mastery_columns, errors="ignore"
+        ).merge(df_mastery, on=["puuid", "matchId"], how="left")
+
+        partition_columns = ["patch", "gameDate"]
+        return (
+            matches_data.drop(columns=partition_columns),
+            teams_data,
+            players_matches_data.drop(columns=partition_columns),
+        )
+
+    def create_database(self, source=DATA_SINK, patch=None):
+        """Monta a tabela de análise das partidas em ``docs_path``/data.csv.
+
+        Args:
+            source (str, optional): "lake" ou "both" para ler as partidas do
+                conjunto Parquet (gravado com ``DATA_SINK="both"``), com as colunas
+                de maestria do banco; "sql" lê do banco. Padrão é DATA_SINK.
+            patch (str, optional): Patch a considerar na leitura do conjunto Parquet.
+        """
         # Obter dados das tabelas
-        matches_data = self.sql.get_data(match_table, "*")
-        teams_data = self.sql.get_data(team_table, "*")
-        players_matches_data = self.sql.get_data(player_match_table, "*")
+        if source in ("lake", "both"):
+            matches_data, teams_data, players_matches_data = self.read_lake_tables(
+                patch
+            )
+        else:
+            matches_data = self.sql.get_data(match_table, "*")
+            teams_data = self.sql.get_data(
+                team_table,
+                [
+                    "matchId",
+                    "teamId",
+                    "win",
+                    "baronKills",
+                    "dragonKills",
+                    "riftHeraldKills",
+                ],
+            )
+            players_matches_data = self.sql.get_data(player_match_table, "*")
 
         tier_rank_map = {
             "EMERALD IV": 1, "EMERALD III": 2, "EMERALD II": 3, "EMERALD I": 4,
@@ -0,0 +1 @@
+ALTER TABLE [{}] ADD {};
\ No newline at end of file
@@ -0,0 +1,3 @@
+BULK INSERT [{}]
+FROM '{}'
+WITH (FORMAT = 'CSV', FIRSTROW = 2, FIELDTERMINATOR = ',', ROWTERMINATOR = '0x0a', CODEPAGE = '65001', TABLOCK);
@@ -0,0 +1,3 @@
+SELECT TOP 0 {}
+INTO [{}]
+FROM [{}];
@@ -0,0 +1,2 @@
+SELECT {} FROM {}
+WHERE {}
@@ -0,0 +1,5 @@
+MERGE INTO [{}] AS TARGET
+USING (SELECT {}) AS SOURCE
+ON {}
+WHEN MATCHED THEN
+    UPDATE SET {};
@@ -11,12 +11,84 @@ logs_path = os.getenv("LOGS_PATH")
 
 # Riot API
 API_KEY = os.getenv("API_KEY")
+RIOT_APP_RATE_LIMIT = os.getenv("RIOT_APP_RATE_LIMIT", "20:1,100:120")
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", 8))
+
+# Maestria: até quantos campeões por jogador usar a consulta por campeão
+MASTERY_BY_CHAMPION_MAX = int(os.getenv("MASTERY_BY_CHAMPION_MAX", 2))
+
+# Mapa summonerId/puuid/riot id dos jogadores
+IDENTITY_STORE_FILE = os.getenv("IDENTITY_STORE_FILE")
+
+# Cache de ranks dos jogadores
+RANK_CACHE_TTL = int(os.getenv("RANK_CACHE_TTL", 86400))
+RANK_CACHE_FILE = os.getenv("RANK_CACHE_FILE")
+RANK_SNAPSHOT_TIERS = [
+    tier
+    for tier in os.getenv("RANK_SNAPSHOT_TIERS", "DIAMOND,EMERALD").split(",")
+    if tier
+]
+
+# Armazenamento das respostas da Riot API ("off", "read_through" ou "replay")
+RESPONSE_STORE_PATH = os.getenv("RESPONSE_STORE_PATH")
+RESPONSE_STORE_MODE = os.getenv("RESPONSE_STORE_MODE", "read_through")
+RESPONSE_STORE_MAX_AGE = int(os.getenv("RESPONSE_STORE_MAX_AGE", 86400))
+
+# Índice das partidas já gravadas (um Id por linha)
+SEEN_INDEX_FILE = os.getenv("SEEN_INDEX_FILE")
+
+# Diário da coleta, usado para retomar execuções interrompidas
+CRAWL_JOURNAL_FILE = os.getenv("CRAWL_JOURNAL_FILE")
+CRAWL_PLAYER_CHUNK = int(os.getenv("CRAWL_PLAYER_CHUNK", 200))
+
+# Coleta por descoberta (participantes das partidas entram na fila de jogadores)
+CRAWL_TARGET_MATCHES = int(os.getenv("CRAWL_TARGET_MATCHES", 10000))
+CRAWL_API_BUDGET = int(os.getenv("CRAWL_API_BUDGET", 50000))
+CRAWL_MATCHES_PER_PLAYER = int(os.getenv("CRAWL_MATCHES_PER_PLAYER", 5))
 
 # Parâmetros LOL
 GAME_VERSION = "14.20"
 REGION = "BR1"
 QUEUE = "Ranked"  # Não há outras opções
 
+# Armazenamento das tabelas ("sqlserver" ou "duckdb")
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlserver")
+DUCKDB_PATH = os.getenv("DUCKDB_PATH", "lol.duckdb")
+
+# Destino das partidas coletadas ("sql" ou "both": banco e cópia em Parquet)
+DATA_SINK = os.getenv("DATA_SINK", "sql")
+LAKE_PATH = os.getenv("LAKE_PATH", "lake")
+LAKE_FLUSH_ROWS = int(os.getenv("LAKE_FLUSH_ROWS", 50000))
+
+# Coleta das estatísticas nos sites (host:simultâneas:requisições por segundo)
+SCRAPER_MAX_WORKERS = int(os.getenv("SCRAPER_MAX_WORKERS", 8))
+SCRAPER_PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", 2))
+SCRAPER_HOST_LIMITS = os.getenv(
+    "SCRAPER_HOST_LIMITS", "op.gg:4:2,leagueofitems.com:4:4"
+)
+SCRAPER_RETRIES = int(os.getenv("SCRAPER_RETRIES", 3))
+SCRAPER_BACKOFF = float(os.getenv("SCRAPER_BACKOFF", 1.0))
+SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", 30))
+HTML_PARSER = os.getenv("HTML_PARSER", "lxml")  # "bs4", "lxml" ou "selectolax"
+CHAMPION_STATS_SOURCE = os.getenv("CHAMPION_STATS_SOURCE", "tier_list")
+
+# Analisador de composições do LoL Theory (navegador persistente)
+COMP_ANALYZER_PAGES = int(os.getenv("COMP_ANALYZER_PAGES", 4))
+COMP_ANALYZER_TIMEOUT = float(os.getenv("COMP_ANALYZER_TIMEOUT", 30))
+DRAFT_CACHE_FILE = os.getenv("DRAFT_CACHE_FILE", "cache/drafts.sqlite")
+DRAFT_CACHE_SIZE = int(os.getenv("DRAFT_CACHE_SIZE", 100000))
+DRAFT_CACHE_SYMMETRIC = os.getenv("DRAFT_CACHE_SYMMETRIC", "no") == "yes"
+
+# Estimador local de composições (sinergias e counters das partidas gravadas)
+SYNERGY_FILE = os.getenv("SYNERGY_FILE", "cache/synergy.npz")
+SYNERGY_PRIOR = float(os.getenv("SYNERGY_PRIOR", 20))
+SYNERGY_MIN_GAMES = int(os.getenv("SYNERGY_MIN_GAMES", 10))
+
+# Snapshots das estatísticas coletadas nos sites, por patch
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "cache/snapshots")
+SNAPSHOT_TTL = int(os.getenv("SNAPSHOT_TTL", 172800))
+SNAPSHOT_KEEP_PAGES = os.getenv("SNAPSHOT_KEEP_PAGES", "yes") == "yes"
+
 # Configuração SQL
 TRUSTED_CONNECTION = os.getenv("TRUSTED_CONNECTION")
 USER_SQL = os.getenv("USER_SQL")
@@ -24,6 +96,15 @@ PASSWORD_SQL = os.getenv("PASSWORD_SQL")
 DRIVER = os.getenv("DRIVER")
 SERVER = os.getenv("SERVER")
 DATABASE = os.getenv("DATABASE")
+INSERT_CHUNK_SIZE = int(os.getenv("INSERT_CHUNK_SIZE", 1000))
+BULK_INSERT_PATH = os.getenv("BULK_INSERT_PATH")
+SQL_POOL_SIZE = int(os.getenv("SQL_POOL_SIZE", 5))
+SQL_MAX_OVERFLOW = int(os.getenv("SQL_MAX_OVERFLOW", 10))
+SQL_POOL_RECYCLE = int(os.getenv("SQL_POOL_RECYCLE", 1800))
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", 50))
+WRITE_FLUSH_INTERVAL = float(os.getenv("WRITE_FLUSH_INTERVAL", 5))
+WRITE_QUEUE_SIZE = int(os.getenv("WRITE_QUEUE_SIZE", 200))
+PROCESSING_CHUNK_SIZE = int(os.getenv("PROCESSING_CHUNK_SIZE", 10000))
 
 # Nome das Tabelas
 match_table = os.getenv("MATCH_TABLE")
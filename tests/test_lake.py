@@ -0,0 +1,50 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from libs.lake_lib.lake import ParquetLake
+
+
+def write_run(path, rows, game_date, patch="14.1"):
+    """Grava as linhas com uma nova instância, como numa nova execução."""
+    lake = ParquetLake(path)
+    lake.append(pd.DataFrame(rows), "PlayerMatch", patch, game_date)
+    lake.flush()
+
+
+def test_read_null_column_then_values_across_runs(tmp_path):
+    write_run(tmp_path, {"matchId": ["BR1_1"], "x": [None]}, "2024-01-01")
+    write_run(tmp_path, {"matchId": ["BR1_2"], "x": [1.5]}, "2024-01-02")
+
+    df = ParquetLake(tmp_path).read("PlayerMatch").sort_values("matchId")
+
+    assert df["matchId"].tolist() == ["BR1_1", "BR1_2"]
+    assert pd.isna(df["x"].iloc[0])
+    assert df["x"].iloc[1] == 1.5
+
+
+def test_null_column_takes_type_already_on_disk(tmp_path):
+    write_run(tmp_path, {"matchId": ["BR1_1"], "x": [1.5]}, "2024-01-01")
+    write_run(tmp_path, {"matchId": ["BR1_2"], "x": [None]}, "2024-01-02")
+
+    for file in (tmp_path / "PlayerMatch").rglob("*.parquet"):
+        assert not pa.types.is_null(pq.read_schema(file).field("x").type)
+
+    df = ParquetLake(tmp_path).read("PlayerMatch", ["matchId", "x"])
+    assert df["x"].dtype == "float64"
+
+
+def test_read_files_written_with_null_type(tmp_path):
+    # Arquivo no formato antigo, com a coluna gravada como "null"
+    folder = tmp_path / "PlayerMatch" / "patch=14.1" / "gameDate=2024-01-01"
+    folder.mkdir(parents=True)
+    pq.write_table(
+        pa.table({"matchId": ["BR1_1"], "x": pa.nulls(1)}), folder / "old.parquet"
+    )
+    write_run(tmp_path, {"matchId": ["BR1_2"], "x": [1.5]}, "2024-01-02")
+
+    df = ParquetLake(tmp_path).read("PlayerMatch", where={"patch": "14.1"})
+
+    assert sorted(df["matchId"]) == ["BR1_1", "BR1_2"]
+    assert df["x"].max() == pytest.approx(1.5)